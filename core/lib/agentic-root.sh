@@ -180,6 +180,18 @@ _release_lock() {
   rmdir "$lockdir" 2>/dev/null || true
 }
 
+# Milliseconds since epoch (EPOCHREALTIME on bash 5+, whole seconds otherwise)
+# Usage: _now_ms
+_now_ms() {
+  if [[ -n "${EPOCHREALTIME:-}" ]]; then
+    local sec="${EPOCHREALTIME%[.,]*}"
+    local frac="${EPOCHREALTIME#*[.,]}000"
+    echo $(( sec * 1000 + 10#${frac:0:3} ))
+  else
+    echo $(( $(date +%s) * 1000 ))
+  fi
+}
+
 # Compare two semantic versions (pure bash, cross-platform)
 # Usage: compare_versions <v1> <v2>
 # Returns: 0 if v1 == v2, 1 if v1 > v2, 2 if v1 < v2
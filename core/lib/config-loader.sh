@@ -67,48 +67,50 @@ _config_parse_yaml_value() {
   return 1
 }
 
-# Load configuration with priority: ENV > .env > .agentic-config.conf.yml
-# Sets variables: EXT_SPECS_REPO_URL, EXT_SPECS_LOCAL_PATH
-# Usage: load_agentic_config
-#
-# NOTE: Uses get_project_root() to find config files in the PROJECT directory,
-# not get_agentic_root() which returns the GLOBAL installation path
-load_agentic_config() {
-  local project_root
-  project_root="$(get_project_root)" || {
-    echo "ERROR: Could not find project root (no .agentic-config.json, CLAUDE.md, or .git found)" >&2
-    return 1
-  }
-  local env_file="$project_root/.env"
-  local yaml_file="$project_root/.agentic-config.conf.yml"
-
-  # Track original ENV values (highest priority)
-  local env_repo_url="${EXT_SPECS_REPO_URL:-}"
-  local env_local_path="${EXT_SPECS_LOCAL_PATH:-}"
+# Keys loaded by load_agentic_config: "<yaml key>|<ENV variable>"
+# The ENV names double as the .env allow-list (only these are exported)
+AGENTIC_CONFIG_KEYS=(
+  "ext_specs_repo_url|EXT_SPECS_REPO_URL"
+  "ext_specs_local_path|EXT_SPECS_LOCAL_PATH"
+  "spec_commit_window|SPEC_COMMIT_WINDOW"
+)
 
-  # Clear config vars to prevent state leaks across multi-project sessions
-  unset EXT_SPECS_REPO_URL EXT_SPECS_LOCAL_PATH
+# Parse .agentic-config.conf.yml and .env in one pass each, merging .env over YAML
+# Usage: _config_parse_sources <yaml_file> <env_file>
+# Sets: _CONFIG_VALUES (one value per AGENTIC_CONFIG_KEYS entry, "" if unset)
+_config_parse_sources() {
+  local yaml_file="$1" env_file="$2"
+  local line key value i entry
+  _CONFIG_VALUES=()
+  for entry in "${AGENTIC_CONFIG_KEYS[@]}"; do
+    _CONFIG_VALUES+=("")
+  done
 
-  # Load from .agentic-config.conf.yml (lowest priority)
+  # YAML (lowest priority): first non-empty "key: value" per known key
   if [[ -f "$yaml_file" ]]; then
-    local yaml_repo_url yaml_local_path
-    yaml_repo_url=$(_config_parse_yaml_value "$yaml_file" "ext_specs_repo_url") || true
-    yaml_local_path=$(_config_parse_yaml_value "$yaml_file" "ext_specs_local_path") || true
-
-    # Set from YAML if not already set
-    [[ -z "${EXT_SPECS_REPO_URL:-}" ]] && [[ -n "$yaml_repo_url" ]] && export EXT_SPECS_REPO_URL="$yaml_repo_url"
-    [[ -z "${EXT_SPECS_LOCAL_PATH:-}" ]] && [[ -n "$yaml_local_path" ]] && export EXT_SPECS_LOCAL_PATH="$yaml_local_path"
+    while IFS= read -r line || [[ -n "$line" ]]; do
+      [[ "$line" =~ ^[[:space:]]*([A-Za-z0-9_]+):([[:space:]]|$) ]] || continue
+      key="${BASH_REMATCH[1]}"
+      for ((i = 0; i < ${#AGENTIC_CONFIG_KEYS[@]}; i++)); do
+        [[ "$key" == "${AGENTIC_CONFIG_KEYS[$i]%%|*}" ]] || continue
+        [[ -z "${_CONFIG_VALUES[$i]}" ]] || break
+        # Extract value after "key:", trim leading whitespace
+        value="${line#*:}"
+        value="${value#"${value%%[![:space:]]*}"}"
+        # Remove surrounding quotes only when balanced
+        if [[ "$value" == \"*\" || "$value" == \'*\' ]]; then
+          value="${value:1:${#value}-2}"
+        fi
+        _CONFIG_VALUES[$i]="$value"
+        break
+      done
+    done < "$yaml_file"
   fi
 
-  # Load from .env (medium priority, overrides YAML)
+  # .env (medium priority, overrides YAML)
   if [[ -f "$env_file" ]]; then
     # Safe .env parsing: validate KEY=VALUE patterns only
-    # Only export known safe keys (scoped list)
-    # CRITICAL: This prevents arbitrary environment pollution
-    local -a KNOWN_SAFE_KEYS=(
-      "EXT_SPECS_REPO_URL" "EXT_SPECS_LOCAL_PATH"
-    )
-    local line key value
+    # Only known safe keys are used (CRITICAL: prevents arbitrary environment pollution)
     while IFS= read -r line || [[ -n "$line" ]]; do
       # Skip comments and empty lines
       [[ "$line" =~ ^[[:space:]]*# ]] && continue
@@ -118,33 +120,85 @@ load_agentic_config() {
       if [[ "$line" =~ ^[a-zA-Z_][a-zA-Z0-9_]*= ]]; then
         key="${line%%=*}"
         value="${line#*=}"
-
-        # Only export if key is in known safe list
-        local is_safe=false
-        for safe_key in "${KNOWN_SAFE_KEYS[@]}"; do
-          if [[ "$key" == "$safe_key" ]]; then
-            is_safe=true
-            break
-          fi
-        done
-
-        if [[ "$is_safe" == true ]]; then
+        for ((i = 0; i < ${#AGENTIC_CONFIG_KEYS[@]}; i++)); do
+          [[ "$key" == "${AGENTIC_CONFIG_KEYS[$i]#*|}" ]] || continue
           # Remove surrounding quotes if present (handle "value" or 'value')
           if [[ "$value" == "\""*"\"" ]] || [[ "$value" == "'"*"'" ]]; then
             value="${value:1:${#value}-2}"
           fi
-          export "$key=$value"
-        fi
+          _CONFIG_VALUES[$i]="$value"
+          break
+        done
       else
         # Log warning for invalid lines (fail-open: continue processing)
         echo "WARNING: Skipping invalid .env line: ${line:0:50}..." >&2
       fi
     done < "$env_file"
   fi
+}
+
+# Parsed config for a project, cached for the rest of the shell session
+# The cache is keyed by the project root and the raw contents of both sources
+# (one read per source, no forks), so any edit re-parses on the next load.
+# Usage: _config_load_sources <project_root>
+# Sets: _CONFIG_VALUES
+_config_load_sources() {
+  local project_root="$1"
+  local yaml_file="$project_root/.agentic-config.conf.yml" env_file="$project_root/.env"
+  local yaml_raw="" env_raw=""
+  [[ -f "$yaml_file" ]] && { IFS= read -r -d '' yaml_raw < "$yaml_file" || true; }
+  [[ -f "$env_file" ]] && { IFS= read -r -d '' env_raw < "$env_file" || true; }
+
+  if [[ "${_AGENTIC_CONFIG_CACHE_ROOT-}" == "$project_root" && \
+        "${_AGENTIC_CONFIG_CACHE_YAML-}" == "$yaml_raw" && \
+        "${_AGENTIC_CONFIG_CACHE_ENV-}" == "$env_raw" ]]; then
+    _CONFIG_VALUES=("${_AGENTIC_CONFIG_CACHE_VALUES[@]}")
+    return 0
+  fi
+
+  _config_parse_sources "$yaml_file" "$env_file"
+  _AGENTIC_CONFIG_CACHE_ROOT="$project_root"
+  _AGENTIC_CONFIG_CACHE_YAML="$yaml_raw"
+  _AGENTIC_CONFIG_CACHE_ENV="$env_raw"
+  _AGENTIC_CONFIG_CACHE_VALUES=("${_CONFIG_VALUES[@]}")
+  return 0
+}
 
-  # Restore original ENV values (highest priority)
-  [[ -n "$env_repo_url" ]] && export EXT_SPECS_REPO_URL="$env_repo_url"
-  [[ -n "$env_local_path" ]] && export EXT_SPECS_LOCAL_PATH="$env_local_path"
+# Load configuration with priority: ENV > .env > .agentic-config.conf.yml
+# Sets variables: EXT_SPECS_REPO_URL, EXT_SPECS_LOCAL_PATH, SPEC_COMMIT_WINDOW
+# Usage: load_agentic_config
+#
+# NOTE: Uses get_project_root() to find config files in the PROJECT directory,
+# not get_agentic_root() which returns the GLOBAL installation path
+load_agentic_config() {
+  local project_root
+  project_root="$(get_project_root)" || {
+    echo "ERROR: Could not find project root (no .agentic-config.json, CLAUDE.md, or .git found)" >&2
+    return 1
+  }
+
+  _config_load_sources "$project_root"
+
+  # ENV wins, except values a previous load exported from another project's
+  # files (prevents state leaks across multi-project sessions)
+  local i var env_value
+  for ((i = 0; i < ${#AGENTIC_CONFIG_KEYS[@]}; i++)); do
+    var="${AGENTIC_CONFIG_KEYS[$i]#*|}"
+    env_value="${!var:-}"
+    if [[ -n "$env_value" && "$env_value" == "${_AGENTIC_CONFIG_APPLIED[$i]:-}" ]]; then
+      env_value=""
+    fi
+    unset "$var"
+    if [[ -n "$env_value" ]]; then
+      export "$var=$env_value"
+      _AGENTIC_CONFIG_APPLIED[$i]=""
+    elif [[ -n "${_CONFIG_VALUES[$i]}" ]]; then
+      export "$var=${_CONFIG_VALUES[$i]}"
+      _AGENTIC_CONFIG_APPLIED[$i]="${_CONFIG_VALUES[$i]}"
+    else
+      _AGENTIC_CONFIG_APPLIED[$i]=""
+    fi
+  done
 
   return 0
 }
@@ -167,6 +221,7 @@ get_agentic_config() {
   case "$key" in
     ext_specs_repo_url) env_var="EXT_SPECS_REPO_URL" ;;
     ext_specs_local_path) env_var="EXT_SPECS_LOCAL_PATH" ;;
+    spec_commit_window) env_var="SPEC_COMMIT_WINDOW" ;;
     *) env_var="${key^^}" ;; # Uppercase fallback
   esac
 
@@ -0,0 +1,560 @@
+#!/usr/bin/env bash
+# Spec Index
+# Persistent catalog of spec files (local specs/ or external .specs/specs/) so
+# lookups by slug, stage or date do not walk and grep the tree every time.
+#
+# Index file: $AGENTIC_SPEC_INDEX (default: ${XDG_CACHE_HOME:-~/.cache}/agentic/spec-index/<specs dir>.tsv)
+#   Line 1: "# spec-index v1<TAB><specs dir><TAB><indexed commit or -><TAB><rows>"
+#   Line 2: "# dirty[<TAB><path>...]" (rows parsed from uncommitted content)
+#   Rows (sorted by path, C collation), one per spec, "-" for empty fields:
+#     relpath YYYY-MM type slug nnn stage title frontmatter(k=v;...)
+#
+# Updates are incremental. Inside a git work tree only paths reported by
+# `git diff` since the indexed commit, untracked files and previously dirty rows
+# are re-parsed; otherwise files newer than the index file are re-parsed.
+#
+# NOTE: Uses pure bash (plus git) for compatibility with restricted shell
+# environments (e.g., Claude Code)
+
+# Bootstrap: find agentic root (script location when executed, else persistence)
+if [[ -z "${_AGENTIC_ROOT:-}" && "${BASH_SOURCE[0]}" == "$0" && "$0" == *core/lib/spec-index.sh ]]; then
+  _src="$0"
+  [[ "$_src" != /* ]] && _src="$PWD/$_src"
+  _AGENTIC_ROOT="${_src%/core/lib/spec-index.sh}"
+  unset _src
+fi
+if [[ -z "${_AGENTIC_ROOT:-}" ]]; then
+  _agp=""
+  [[ -f ~/.agents/.path ]] && _agp=$(<~/.agents/.path) 2>/dev/null || _agp=""
+  AGENTIC_GLOBAL="${AGENTIC_CONFIG_PATH:-${_agp:-$HOME/.agents/agentic-config}}"
+  unset _agp
+  if [[ -d "$AGENTIC_GLOBAL" ]] && [[ -f "$AGENTIC_GLOBAL/VERSION" ]]; then
+    _AGENTIC_ROOT="$AGENTIC_GLOBAL"
+  else
+    echo "ERROR: Cannot locate agentic-config installation" >&2
+    return 1 2>/dev/null || exit 1
+  fi
+fi
+
+if ! declare -f resolve_specs_dir >/dev/null 2>&1; then
+  source "$_AGENTIC_ROOT/core/lib/spec-resolver.sh"
+fi
+
+SPEC_INDEX_VERSION="v1"
+
+# AI Section headings and the stage that fills them ("heading|STAGE")
+SPEC_INDEX_STAGES=(
+  "Research|RESEARCH"
+  "Plan|PLAN"
+  "Plan Review|PLAN_REVIEW"
+  "Implement|IMPLEMENT"
+  "Test Evidence & Outputs|TEST"
+  "Updated Doc|DOCUMENT"
+  "Post-Implement Review|REVIEW"
+)
+
+# Check whether section text has content beyond HTML comments and whitespace
+# Usage: _spec_index_filled <text>
+_spec_index_filled() {
+  local text="$1" head inner
+  while [[ "$text" == *"<!--"* ]]; do
+    head="${text%%"<!--"*}"
+    [[ "$head" == *[![:space:]]* ]] && return 0
+    text="${text:${#head}+4}"
+    [[ "$text" == *"-->"* ]] || return 1
+    inner="${text%%"-->"*}"
+    text="${text:${#inner}+3}"
+  done
+  [[ "$text" == *[![:space:]]* ]]
+}
+
+# Parse one spec file into an index row
+# Usage: _spec_index_parse <specs_dir> <relpath>
+# Sets: _SPEC_INDEX_ROW
+_spec_index_parse() {
+  local dir="$1" rel="$2"
+  local content="" name="${rel##*/}" sub ym type slug nnn title stage="" meta=""
+  IFS= read -r -d '' content < "$dir/$rel" || true
+
+  # Path fields: YYYY/MM/<type>/<slug>/NNN-title.md or YYYY/MM/<slug>/NNN-title.md
+  ym="${rel:0:4}-${rel:5:2}"
+  sub="${rel:8}"
+  sub="${sub%/*}"
+  if [[ "$sub" == */* ]]; then
+    type="${sub%%/*}"
+    slug="${sub#*/}"
+  else
+    type="-"
+    slug="$sub"
+  fi
+
+  name="${name%.md}"
+  if [[ "$name" =~ ^([0-9]+)-(.+)$ ]] || [[ "$name" =~ ^bundle-([0-9]+)-(.+)$ ]]; then
+    nnn="${BASH_REMATCH[1]}"
+    title="${BASH_REMATCH[2]}"
+  else
+    nnn="-"
+    title="$name"
+  fi
+
+  # Optional YAML frontmatter (flat key: value pairs); title/stage override
+  if [[ "$content" == $'---\n'* || "$content" == $'---\r\n'* ]]; then
+    local fm="${content#*$'\n'}" line key value
+    if [[ $'\n'"$fm" == *$'\n---'* ]]; then
+      fm=$'\n'"$fm"
+      fm="${fm%%$'\n---'*}"
+      while IFS= read -r line; do
+        line="${line%$'\r'}"
+        [[ "$line" =~ ^([A-Za-z0-9_-]+):[[:space:]]*(.*)$ ]] || continue
+        key="${BASH_REMATCH[1]}"
+        value="${BASH_REMATCH[2]}"
+        value="${value%"${value##*[![:space:]]}"}"
+        if [[ "$value" == \"*\" || "$value" == \'*\' ]]; then
+          value="${value:1:${#value}-2}"
+        fi
+        value="${value//[$'\t;']/ }"
+        case "$key" in
+          title) [[ -n "$value" ]] && title="$value" ;;
+          stage) [[ -n "$value" ]] && stage="$value" ;;
+        esac
+        meta+="$key=$value;"
+      done <<< "$fm"
+    fi
+  fi
+
+  # Stage: hop back from EOF heading by heading to the last AI Section with
+  # real content (template sections hold only HTML comments)
+  if [[ -z "$stage" ]]; then
+    local rest="$content" prev section heading entry
+    [[ "$rest" == "## "* ]] && rest=$'\n'"$rest"
+    while :; do
+      prev="${rest%$'\n## '*}"
+      [[ ${#prev} -eq ${#rest} ]] && break
+      section="${rest:${#prev}+4}"
+      rest="$prev"
+      heading="${section%%$'\n'*}"
+      heading="${heading%$'\r'}"
+      for entry in "${SPEC_INDEX_STAGES[@]}"; do
+        [[ "$heading" == "${entry%|*}" ]] || continue
+        _spec_index_filled "${section#*$'\n'}" && stage="${entry#*|}"
+        break
+      done
+      [[ -n "$stage" ]] && break
+      # Human Section reached: no AI Section heading has content
+      [[ "$section" == *$'\n# AI Section'* ]] && break
+    done
+  fi
+
+  printf -v _SPEC_INDEX_ROW '%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s' \
+    "$rel" "$ym" "${type:--}" "${slug:--}" "$nnn" "${stage:-CREATE}" \
+    "${title:--}" "${meta:--}"
+}
+
+# Check whether a relative path has the spec layout (YYYY/MM/<dir>[/<dir>]/<file>.md)
+# Usage: _spec_index_is_spec <relpath>
+_spec_index_is_spec() {
+  local rel="$1" slashes
+  [[ "$rel" == [0-9][0-9][0-9][0-9]/[0-9][0-9]/*/*.md ]] || return 1
+  slashes="${rel//[!\/]/}"
+  [[ ${#slashes} -le 4 ]]
+}
+
+# List spec files under a specs directory, sorted (C collation)
+# Usage: _spec_index_list <specs_dir>
+# Sets: _SPEC_INDEX_FILES (relative paths)
+_spec_index_list() {
+  local dir="$1" LC_ALL=C i=0 j=0
+  local shallow=("$dir"/[0-9][0-9][0-9][0-9]/[0-9][0-9]/*/*.md)
+  local deep=("$dir"/[0-9][0-9][0-9][0-9]/[0-9][0-9]/*/*/*.md)
+  [[ -e "${shallow[0]}" ]] || shallow=()
+  [[ -e "${deep[0]}" ]] || deep=()
+  shallow=(${shallow[@]+"${shallow[@]#"$dir/"}"})
+  deep=(${deep[@]+"${deep[@]#"$dir/"}"})
+
+  # Merge the two sorted glob results (most trees use a single layout)
+  if [[ ${#shallow[@]} -eq 0 || ${#deep[@]} -eq 0 ]]; then
+    _SPEC_INDEX_FILES=(${shallow[@]+"${shallow[@]}"} ${deep[@]+"${deep[@]}"})
+    return 0
+  fi
+  _SPEC_INDEX_FILES=()
+  while [[ $i -lt ${#shallow[@]} && $j -lt ${#deep[@]} ]]; do
+    if [[ "${shallow[$i]}" < "${deep[$j]}" ]]; then
+      _SPEC_INDEX_FILES+=("${shallow[$i]}")
+      ((i++)) || true
+    else
+      _SPEC_INDEX_FILES+=("${deep[$j]}")
+      ((j++)) || true
+    fi
+  done
+  _SPEC_INDEX_FILES+=("${shallow[@]:$i}" "${deep[@]:$j}")
+}
+
+# Sort and dedupe relative paths (insertion sort; used for small change sets)
+# Usage: _spec_index_sort <path>...
+# Sets: _SPEC_INDEX_SORTED
+_spec_index_sort() {
+  local LC_ALL=C p k
+  _SPEC_INDEX_SORTED=()
+  for p in "$@"; do
+    k=${#_SPEC_INDEX_SORTED[@]}
+    while [[ $k -gt 0 && "$p" < "${_SPEC_INDEX_SORTED[$k-1]}" ]]; do
+      ((k--)) || true
+    done
+    [[ $k -gt 0 && "$p" == "${_SPEC_INDEX_SORTED[$k-1]}" ]] && continue
+    _SPEC_INDEX_SORTED=("${_SPEC_INDEX_SORTED[@]:0:$k}" "$p" "${_SPEC_INDEX_SORTED[@]:$k}")
+  done
+}
+
+# Resolve specs dir and index file for an optional --dir argument
+# Usage: _spec_index_paths [dir]
+# Sets: _SPEC_INDEX_DIR, _SPEC_INDEX_FILE
+_spec_index_paths() {
+  local dir="${1:-}"
+  if [[ -z "$dir" ]]; then
+    dir="$(resolve_specs_dir)" || return 1
+  fi
+  [[ "$dir" != /* ]] && dir="$PWD/$dir"
+  [[ "$dir" != "/" ]] && dir="${dir%/}"
+  _SPEC_INDEX_DIR="$dir"
+  _SPEC_INDEX_FILE="${AGENTIC_SPEC_INDEX:-${XDG_CACHE_HOME:-${HOME:-/tmp}/.cache}/agentic/spec-index/${dir//\//%}.tsv}"
+}
+
+# Load index rows (header lines dropped)
+# Usage: _spec_index_load
+# Sets: _SPEC_INDEX_ROWS
+_spec_index_load() {
+  _SPEC_INDEX_ROWS=()
+  [[ -f "$_SPEC_INDEX_FILE" ]] || return 0
+  IFS=$'\n' read -r -d '' -a _SPEC_INDEX_ROWS < "$_SPEC_INDEX_FILE" || true
+  _SPEC_INDEX_ROWS=(${_SPEC_INDEX_ROWS[@]+"${_SPEC_INDEX_ROWS[@]:2}"})
+}
+
+# Binary search for the first row sorting at or after a key (caller sets LC_ALL=C)
+# Usage: _spec_index_lower_bound <key> <lo>
+# Sets: _SPEC_INDEX_POS
+_spec_index_lower_bound() {
+  local key="$1" lo="$2" hi=${#_SPEC_INDEX_ROWS[@]} mid
+  while [[ $lo -lt $hi ]]; do
+    mid=$(( (lo + hi) / 2 ))
+    if [[ "${_SPEC_INDEX_ROWS[$mid]}" < "$key" ]]; then
+      lo=$((mid + 1))
+    else
+      hi=$mid
+    fi
+  done
+  _SPEC_INDEX_POS=$lo
+}
+
+# Build or incrementally refresh the spec index
+# Usage: spec_index_update [--dir <specs_dir>] [--rebuild]
+# Sets: SPEC_INDEX_COUNT (specs indexed), SPEC_INDEX_CHANGES (rows added/updated/removed)
+spec_index_update() {
+  local dir="" rebuild=false
+  while [[ $# -gt 0 ]]; do
+    case "$1" in
+      --dir) dir="${2:-}"; shift 2 || break ;;
+      --rebuild) rebuild=true; shift ;;
+      *) echo "ERROR: Unknown option: $1" >&2; return 1 ;;
+    esac
+  done
+  _spec_index_paths "$dir" || return 1
+  dir="$_SPEC_INDEX_DIR"
+  local file="$_SPEC_INDEX_FILE"
+  SPEC_INDEX_COUNT=0
+  SPEC_INDEX_CHANGES=0
+
+  # Header lines only; rows are loaded once we know something changed
+  local loaded=false header="" dirty_line="" h_magic="" h_dir="" h_commit="" h_count=0
+  if [[ "$rebuild" != true && -f "$file" ]]; then
+    { IFS= read -r header; IFS= read -r dirty_line; } < "$file" || true
+    IFS=$'\t' read -r h_magic h_dir h_commit h_count <<< "$header"
+    if [[ "$h_magic" == "# spec-index $SPEC_INDEX_VERSION" && "$h_dir" == "$dir" && "$dirty_line" == "# dirty"* ]]; then
+      loaded=true
+    fi
+  fi
+
+  # Git mode when the specs dir is tracked in a work tree with at least one commit
+  local head="" mode="mtime"
+  if [[ -d "$dir" ]]; then
+    head=$(git -C "$dir" rev-parse -q --verify HEAD 2>/dev/null) || head=""
+  fi
+  if [[ -n "$head" ]]; then
+    if [[ "$loaded" == true ]]; then
+      [[ "$h_commit" != "-" ]] && mode="git"
+    elif ! git -C "$dir" check-ignore -q . 2>/dev/null; then
+      mode="git"
+    fi
+  fi
+
+  local cand=() dirty=() rel full_listing=true
+  if [[ "$mode" == "git" ]]; then
+    # Working tree changes (tracked edits and untracked files) relative to HEAD
+    while IFS= read -r rel; do
+      _spec_index_is_spec "$rel" && dirty+=("$rel")
+    done < <(git -C "$dir" -c core.quotepath=off diff --name-only --relative HEAD -- . 2>/dev/null
+             git -C "$dir" -c core.quotepath=off ls-files --others --exclude-standard -- . 2>/dev/null)
+
+    if [[ "$loaded" == true ]]; then
+      full_listing=false
+      # Previously dirty rows may have been reverted since
+      local prev_dirty=()
+      IFS=$'\t' read -r -a prev_dirty <<< "${dirty_line#\# dirty}"
+      cand=(${dirty[@]+"${dirty[@]}"} ${prev_dirty[@]+"${prev_dirty[@]}"})
+      if [[ "$h_commit" != "$head" ]]; then
+        local committed
+        if committed=$(git -C "$dir" -c core.quotepath=off diff --name-only --relative "$h_commit" "$head" -- . 2>/dev/null); then
+          while IFS= read -r rel; do
+            [[ -n "$rel" ]] && _spec_index_is_spec "$rel" && cand+=("$rel")
+          done <<< "$committed"
+        else
+          # Indexed commit no longer reachable (rebase, re-clone): rebuild
+          loaded=false
+          full_listing=true
+        fi
+      fi
+      # Fast path: clean tree at the indexed commit
+      if [[ "$loaded" == true && ${#cand[@]} -eq 0 && "$h_commit" == "$head" ]]; then
+        _SPEC_INDEX_ROWS=()
+        SPEC_INDEX_COUNT="$h_count"
+        return 0
+      fi
+    fi
+  fi
+
+  _SPEC_INDEX_ROWS=()
+  [[ "$loaded" == true ]] && _spec_index_load
+  if [[ "$full_listing" == true ]]; then
+    cand=()
+    if [[ -d "$dir" ]]; then
+      _spec_index_list "$dir"
+      cand=(${_SPEC_INDEX_FILES[@]+"${_SPEC_INDEX_FILES[@]}"})
+    fi
+    # Same set of paths as indexed: only files modified since need re-parsing
+    if [[ "$loaded" == true && ${#cand[@]} -gt 0 && ${#cand[@]} -eq ${#_SPEC_INDEX_ROWS[@]} ]]; then
+      local indexed=("${_SPEC_INDEX_ROWS[@]%%$'\t'*}")
+      if [[ "${indexed[*]}" == "${cand[*]}" ]]; then
+        indexed=()
+        for rel in "${cand[@]}"; do
+          [[ "$dir/$rel" -nt "$file" ]] && indexed+=("$rel")
+        done
+        cand=(${indexed[@]+"${indexed[@]}"})
+        full_listing=false
+      fi
+    fi
+  else
+    _spec_index_sort ${cand[@]+"${cand[@]}"}
+    cand=(${_SPEC_INDEX_SORTED[@]+"${_SPEC_INDEX_SORTED[@]}"})
+  fi
+
+  # Merge sorted rows with sorted candidates; unchanged runs are copied as slices
+  local LC_ALL=C out=() i=0 nr=${#_SPEC_INDEX_ROWS[@]} old
+  for rel in ${cand[@]+"${cand[@]}"}; do
+    # Find the first row at or after rel (usually the next one)
+    _SPEC_INDEX_POS=$i
+    if [[ $i -lt $nr && "${_SPEC_INDEX_ROWS[$i]}" != "$rel"$'\t'* ]]; then
+      _spec_index_lower_bound "$rel"$'\t' "$i"
+    fi
+    if [[ $_SPEC_INDEX_POS -gt $i ]]; then
+      if [[ "$full_listing" == true ]]; then
+        SPEC_INDEX_CHANGES=$((SPEC_INDEX_CHANGES + _SPEC_INDEX_POS - i))
+      else
+        out+=("${_SPEC_INDEX_ROWS[@]:$i:$_SPEC_INDEX_POS-$i}")
+      fi
+      i=$_SPEC_INDEX_POS
+    fi
+
+    old=""
+    if [[ $i -lt $nr && "${_SPEC_INDEX_ROWS[$i]}" == "$rel"$'\t'* ]]; then
+      old="${_SPEC_INDEX_ROWS[$i]}"
+      ((i++)) || true
+    fi
+    if [[ ! -f "$dir/$rel" ]]; then
+      [[ -n "$old" ]] && { ((SPEC_INDEX_CHANGES++)) || true; }
+      continue
+    fi
+    if [[ -n "$old" && "$mode" != "git" && ! "$dir/$rel" -nt "$file" ]]; then
+      out+=("$old")
+      continue
+    fi
+
+    _spec_index_parse "$dir" "$rel"
+    [[ "$_SPEC_INDEX_ROW" != "$old" ]] && { ((SPEC_INDEX_CHANGES++)) || true; }
+    out+=("$_SPEC_INDEX_ROW")
+  done
+  if [[ $i -lt $nr ]]; then
+    if [[ "$full_listing" == true ]]; then
+      SPEC_INDEX_CHANGES=$((SPEC_INDEX_CHANGES + nr - i))
+    else
+      out+=("${_SPEC_INDEX_ROWS[@]:$i}")
+    fi
+  fi
+  _SPEC_INDEX_ROWS=(${out[@]+"${out[@]}"})
+  SPEC_INDEX_COUNT=${#out[@]}
+
+  # Dirty paths that still exist are re-checked on the next update
+  local commit="-" dirty_out="# dirty"
+  if [[ "$mode" == "git" ]]; then
+    commit="$head"
+    for rel in ${dirty[@]+"${dirty[@]}"}; do
+      [[ -f "$dir/$rel" ]] && dirty_out+=$'\t'"$rel"
+    done
+  fi
+
+  # Write atomically when rows, the indexed commit or dirty paths changed
+  if [[ "$loaded" != true || $SPEC_INDEX_CHANGES -gt 0 || "$commit" != "$h_commit" || "$dirty_out" != "$dirty_line" ]]; then
+    [[ -d "${file%/*}" ]] || mkdir -p "${file%/*}" || return 1
+    {
+      printf '# spec-index %s\t%s\t%s\t%s\n%s\n' "$SPEC_INDEX_VERSION" "$dir" "$commit" "$SPEC_INDEX_COUNT" "$dirty_out"
+      [[ $SPEC_INDEX_COUNT -gt 0 ]] && printf '%s\n' "${out[@]}"
+    } > "$file.tmp.$$" && mv -f "$file.tmp.$$" "$file" || {
+      rm -f "$file.tmp.$$"
+      echo "ERROR: Failed to write spec index: $file" >&2
+      return 1
+    }
+  fi
+  return 0
+}
+
+# Select index rows matching filters (refreshes the index first)
+# Usage: _spec_index_select [--dir D] [--slug GLOB] [--type T] [--stage STAGE]
+#                           [--since YYYY-MM] [--until YYYY-MM] [--meta key=value] [--no-update]
+# Sets: _SPEC_INDEX_MATCHES (raw rows, in path order)
+_spec_index_select() {
+  local dir="" slug="" type="" stage="" since="" until="" meta="" update=true
+  while [[ $# -gt 0 ]]; do
+    case "$1" in
+      --dir) dir="${2:-}"; shift 2 || break ;;
+      --slug) slug="${2:-}"; shift 2 || break ;;
+      --type) type="${2:-}"; shift 2 || break ;;
+      --stage) stage="${2:-}"; shift 2 || break ;;
+      --since) since="${2:-}"; shift 2 || break ;;
+      --until) until="${2:-}"; shift 2 || break ;;
+      --meta) meta="${2:-}"; shift 2 || break ;;
+      --no-update) update=false; shift ;;
+      *) echo "ERROR: Unknown option: $1" >&2; return 1 ;;
+    esac
+  done
+
+  _SPEC_INDEX_MATCHES=()
+  if [[ "$update" == true ]]; then
+    spec_index_update ${dir:+--dir "$dir"} || return 1
+  else
+    _spec_index_paths "$dir" || return 1
+    _SPEC_INDEX_ROWS=()
+  fi
+  # Rows are still in memory unless the update took its no-change fast path
+  [[ ${#_SPEC_INDEX_ROWS[@]} -eq 0 ]] && _spec_index_load
+
+  # Date range maps to a contiguous run of rows ("YYYY/MM/" path prefix)
+  local LC_ALL=C lo=0 hi=${#_SPEC_INDEX_ROWS[@]}
+  if [[ -n "$since" ]]; then
+    _spec_index_lower_bound "${since//-//}" 0
+    lo=$_SPEC_INDEX_POS
+  fi
+  if [[ -n "$until" ]]; then
+    until="${until//-//}"
+    [[ ${#until} -eq 4 ]] && until="$until/12"
+    _spec_index_lower_bound "$until/~" "$lo"
+    hi=$_SPEC_INDEX_POS
+  fi
+  [[ $hi -gt $lo ]] || return 0
+  if [[ -z "$slug$type$stage$meta" ]]; then
+    _SPEC_INDEX_MATCHES=("${_SPEC_INDEX_ROWS[@]:$lo:$hi-$lo}")
+    return 0
+  fi
+
+  # Cheap whole-row prefilter for literal fields; exact field checks on survivors,
+  # split on tabs (fields are never empty) with globbing off
+  local prefilter="*" IFS=$'\t' row f=() noglob=false
+  [[ -n "$stage" ]] && prefilter="*"$'\t'"$stage"$'\t'"*"
+  [[ -n "$slug" && "$slug" != *[*?[]* ]] && prefilter="*"$'\t'"$slug"$'\t'"*"
+  [[ $- == *f* ]] && noglob=true
+  set -f
+  for row in "${_SPEC_INDEX_ROWS[@]:$lo:$hi-$lo}"; do
+    [[ "$row" == $prefilter ]] || continue
+    f=($row)
+    [[ -n "$slug" && "${f[3]}" != $slug ]] && continue
+    [[ -n "$type" && "${f[2]}" != "$type" ]] && continue
+    [[ -n "$stage" && "${f[5]}" != "$stage" ]] && continue
+    [[ -n "$meta" && ";${f[7]}" != *";$meta;"* ]] && continue
+    _SPEC_INDEX_MATCHES+=("$row")
+  done
+  [[ "$noglob" == true ]] || set +f
+  return 0
+}
+
+# Query the spec index
+# Usage: spec_index_query [--latest] [filters...]   (filters: see _spec_index_select)
+# Output: "<absolute path><TAB><stage><TAB><title>" per match, in path order
+#         --latest prints only the newest match (highest YYYY-MM, then NNN)
+# Returns: 1 if nothing matched
+spec_index_query() {
+  local latest=false args=() arg
+  for arg in "$@"; do
+    if [[ "$arg" == "--latest" ]]; then
+      latest=true
+    else
+      args+=("$arg")
+    fi
+  done
+  _spec_index_select ${args[@]+"${args[@]}"} || return 1
+  [[ ${#_SPEC_INDEX_MATCHES[@]} -gt 0 ]] || return 1
+
+  local IFS=$'\t' row f=() n k best=() best_n=-1 noglob=false
+  [[ $- == *f* ]] && noglob=true
+  set -f
+  if [[ "$latest" == true ]]; then
+    # Matches are in path order: scan back through the newest month only
+    for ((k = ${#_SPEC_INDEX_MATCHES[@]} - 1; k >= 0; k--)); do
+      f=(${_SPEC_INDEX_MATCHES[$k]})
+      [[ ${#best[@]} -gt 0 && "${f[1]}" != "${best[1]}" ]] && break
+      n=-1
+      [[ "${f[4]}" =~ ^[0-9]+$ ]] && n=$((10#${f[4]}))
+      if [[ $n -gt $best_n || ${#best[@]} -eq 0 ]]; then
+        best=("${f[@]}")
+        best_n=$n
+      fi
+    done
+    printf '%s\t%s\t%s\n' "$_SPEC_INDEX_DIR/${best[0]}" "${best[5]}" "${best[6]}"
+  else
+    for row in "${_SPEC_INDEX_MATCHES[@]}"; do
+      f=($row)
+      printf '%s\t%s\t%s\n' "$_SPEC_INDEX_DIR/${f[0]}" "${f[5]}" "${f[6]}"
+    done
+  fi
+  [[ "$noglob" == true ]] || set +f
+  return 0
+}
+
+# Next free spec number (zero-padded), optionally scoped by filters
+# Usage: spec_index_next_nnn [filters...]   (filters: see _spec_index_select)
+spec_index_next_nnn() {
+  _spec_index_select "$@" || return 1
+
+  # Strip the four leading fields across all rows at once, then keep NNN
+  local nnns=() nnn max=0
+  nnns=(${_SPEC_INDEX_MATCHES[@]+"${_SPEC_INDEX_MATCHES[@]#*$'\t'*$'\t'*$'\t'*$'\t'}"})
+  nnns=(${nnns[@]+"${nnns[@]%%$'\t'*}"})
+  for nnn in ${nnns[@]+"${nnns[@]}"}; do
+    [[ "$nnn" == [0-9]* ]] || continue
+    [[ $((10#$nnn)) -gt $max ]] && max=$((10#$nnn))
+  done
+  printf '%03d\n' $((max + 1))
+}
+
+# CLI entry point when executed directly
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  case "${1:-}" in
+    update)
+      shift
+      spec_index_update "$@" || exit 1
+      echo "Indexed $SPEC_INDEX_COUNT spec(s) in $_SPEC_INDEX_DIR ($SPEC_INDEX_CHANGES changed)"
+      ;;
+    query) shift; spec_index_query "$@" || exit 1 ;;
+    next-nnn) shift; spec_index_next_nnn "$@" || exit 1 ;;
+    *)
+      echo "Usage: spec-index.sh {update|query|next-nnn} [options]" >&2
+      exit 1
+      ;;
+  esac
+fi
@@ -132,9 +132,241 @@ resolve_spec_path() {
   return 0
 }
 
+# Resolve the specs base directory without cloning or pulling
+# Usage: resolve_specs_dir
+# Returns: <project_root>/<ext_specs_local_path>/specs if EXT_SPECS_REPO_URL set,
+#          otherwise <project_root>/specs
+resolve_specs_dir() {
+  _source_config_loader || return 1
+  load_agentic_config
+
+  local project_root
+  project_root="$(get_project_root)" || {
+    echo "ERROR: Could not find project root (no .agentic-config.json, CLAUDE.md, or .git found)" >&2
+    return 1
+  }
+
+  if [[ -n "${EXT_SPECS_REPO_URL:-}" ]]; then
+    echo "$project_root/${EXT_SPECS_LOCAL_PATH:-.specs}/specs"
+  else
+    echo "$project_root/specs"
+  fi
+  return 0
+}
+
+# Spec commit queue
+# With SPEC_COMMIT_WINDOW (seconds) > 0, commit_spec_changes queues stage
+# commits per target repository instead of committing each one. Queued commits
+# are coalesced into a single commit (and a single push for external specs)
+# when the oldest entry is older than the window, on --now, or on
+# flush_spec_commits (run at the end of an orchestrated session).
+#
+# Queue file: <git-dir>/agentic-spec-queue (outside the working tree), one
+# entry per line: <epoch>\t<nnn>\t<stage>\t<title>\t<spec_path>
+
+# Normalize SPEC_COMMIT_WINDOW to a non-negative integer
+# Usage: _spec_commit_window
+# Sets: _SPEC_COMMIT_WINDOW
+_spec_commit_window() {
+  _SPEC_COMMIT_WINDOW="${SPEC_COMMIT_WINDOW:-0}"
+  if [[ ! "$_SPEC_COMMIT_WINDOW" =~ ^[0-9]+$ ]]; then
+    echo "WARNING: Ignoring invalid SPEC_COMMIT_WINDOW: $_SPEC_COMMIT_WINDOW" >&2
+    _SPEC_COMMIT_WINDOW=0
+  fi
+}
+
+# Locate the commit queue of a repository
+# Usage: _spec_queue_file <repo_dir>
+# Sets: _SPEC_QUEUE_FILE
+_spec_queue_file() {
+  local repo="$1" path
+  path="$(git -C "$repo" rev-parse --git-path agentic-spec-queue 2>/dev/null)" || {
+    echo "ERROR: Not a git repository: $repo" >&2
+    return 1
+  }
+  [[ "$path" == /* ]] || path="$repo/$path"
+  _SPEC_QUEUE_FILE="$path"
+}
+
+# Append an entry to a commit queue
+# Usage: _spec_queue_add <queue_file> <nnn> <stage> <title> <spec_path>
+# Sets: _SPEC_QUEUE_COUNT (pending entries), _SPEC_QUEUE_OLDEST (epoch)
+_spec_queue_add() {
+  local queue="$1" nnn="$2" stage="$3" title="$4" spec_path="$5" now
+  now="${EPOCHSECONDS:-}"
+  [[ -n "$now" ]] || now="$(date +%s)"
+
+  _acquire_lock "$queue.lock" 10 || return 1
+  printf '%s\t%s\t%s\t%s\t%s\n' "$now" "$nnn" "$stage" "${title//$'\t'/ }" "$spec_path" >> "$queue" || {
+    _release_lock "$queue.lock"
+    echo "ERROR: Failed to write spec commit queue: $queue" >&2
+    return 1
+  }
+  local -a entries=()
+  IFS=$'\n' read -r -d '' -a entries < "$queue" || true
+  _release_lock "$queue.lock"
+
+  _SPEC_QUEUE_COUNT=${#entries[@]}
+  _SPEC_QUEUE_OLDEST="${entries[0]%%$'\t'*}"
+  [[ "$_SPEC_QUEUE_OLDEST" =~ ^[0-9]+$ ]] || _SPEC_QUEUE_OLDEST=0
+}
+
+# Read a commit queue, removing it unless --peek is given
+# Usage: _spec_queue_take <queue_file> [--peek]
+# Sets: _SPEC_QUEUE_ENTRIES
+_spec_queue_take() {
+  local queue="$1"
+  _SPEC_QUEUE_ENTRIES=()
+  [[ -f "$queue" ]] || return 0
+
+  _acquire_lock "$queue.lock" 10 || return 1
+  IFS=$'\n' read -r -d '' -a _SPEC_QUEUE_ENTRIES < "$queue" || true
+  [[ "${2:-}" == "--peek" ]] || rm -f "$queue"
+  _release_lock "$queue.lock"
+}
+
+# Put entries back at the head of a commit queue (after a failed flush)
+# Usage: _spec_queue_restore <queue_file> <entry>...
+_spec_queue_restore() {
+  local queue="$1"
+  shift
+  _acquire_lock "$queue.lock" 10 || return 1
+  local -a newer=()
+  [[ -f "$queue" ]] && { IFS=$'\n' read -r -d '' -a newer < "$queue" || true; }
+  printf '%s\n' "$@" ${newer[@]+"${newer[@]}"} > "$queue.tmp.$$" && mv "$queue.tmp.$$" "$queue"
+  _release_lock "$queue.lock"
+}
+
+# Build one commit message for a batch of queue entries
+# Single entry keeps the usual "spec(NNN): STAGE - title" form; entries for one
+# spec combine their stages; mixed batches list every stage commit in the body.
+# Usage: _spec_batch_message <entry>...
+# Sets: _SPEC_BATCH_MESSAGE, _SPEC_BATCH_PATHS (unique spec paths)
+_spec_batch_message() {
+  local entry rest nnn stage title path seen key="" first_key="" stages="" body="" mixed=false
+  _SPEC_BATCH_PATHS=()
+  for entry in "$@"; do
+    rest="${entry#*$'\t'}"
+    nnn="${rest%%$'\t'*}"; rest="${rest#*$'\t'}"
+    stage="${rest%%$'\t'*}"; rest="${rest#*$'\t'}"
+    title="${rest%%$'\t'*}"; path="${rest#*$'\t'}"
+
+    key="$nnn"$'\t'"$title"
+    [[ -z "$first_key" ]] && first_key="$key"
+    [[ "$key" == "$first_key" ]] || mixed=true
+    [[ ", $stages, " == *", $stage, "* ]] || stages+="${stages:+, }$stage"
+    body+=$'\n'"- spec($nnn): $stage - $title"
+
+    for seen in ${_SPEC_BATCH_PATHS[@]+"${_SPEC_BATCH_PATHS[@]}"}; do
+      [[ "$seen" == "$path" ]] && continue 2
+    done
+    _SPEC_BATCH_PATHS+=("$path")
+  done
+
+  if [[ "$mixed" == true ]]; then
+    _SPEC_BATCH_MESSAGE="spec: batch of $# stage commits"$'\n'"$body"
+  else
+    _SPEC_BATCH_MESSAGE="spec($nnn): $stages - $title"
+  fi
+}
+
+# Commit everything queued for one repository as a single commit
+# Usage: _spec_flush_repo <repo_dir> <local|external> [--dry-run]
+_spec_flush_repo() {
+  local repo="$1" target="$2" dry_run=false
+  [[ "${3:-}" == "--dry-run" ]] && dry_run=true
+
+  _spec_queue_file "$repo" || return 1
+  local queue="$_SPEC_QUEUE_FILE"
+  if [[ "$dry_run" == true ]]; then
+    _spec_queue_take "$queue" --peek || return 1
+  else
+    _spec_queue_take "$queue" || return 1
+  fi
+  local -a entries=(${_SPEC_QUEUE_ENTRIES[@]+"${_SPEC_QUEUE_ENTRIES[@]}"})
+  [[ ${#entries[@]} -eq 0 ]] && return 0
+
+  _spec_batch_message "${entries[@]}"
+  local commit_message="$_SPEC_BATCH_MESSAGE"
+
+  if [[ "$dry_run" == true ]]; then
+    echo "DRY RUN: flush_spec_commits ($target)"
+    echo "  Repository: $repo"
+    echo "  Pending: ${#entries[@]} stage commit(s)"
+    echo "  Message: ${commit_message%%$'\n'*}"
+    return 0
+  fi
+
+  if [[ "$target" == external ]]; then
+    local ext_specs_script="$_AGENTIC_ROOT/scripts/external-specs.sh"
+    if [[ -f "$ext_specs_script" ]]; then
+      # shellcheck source=../../../scripts/external-specs.sh
+      source "$ext_specs_script"
+    fi
+    if ! declare -f ext_specs_commit >/dev/null 2>&1 || ! ext_specs_commit "$commit_message"; then
+      echo "ERROR: Failed to commit to external specs repository (${#entries[@]} stage commit(s) kept queued)" >&2
+      _spec_queue_restore "$queue" "${entries[@]}"
+      return 1
+    fi
+    echo "Committed to external specs repository: ${commit_message%%$'\n'*}"
+    return 0
+  fi
+
+  local -a paths=()
+  local path
+  for path in "${_SPEC_BATCH_PATHS[@]}"; do
+    [[ -e "$path" ]] && paths+=("$path")
+  done
+  if [[ ${#paths[@]} -eq 0 ]] || ! (cd "$repo" && git add -A -- "${paths[@]}"); then
+    echo "ERROR: Failed to stage queued spec files" >&2
+    _spec_queue_restore "$queue" "${entries[@]}"
+    return 1
+  fi
+  if (cd "$repo" && git diff --cached --quiet -- "${paths[@]}"); then
+    echo "No changes to commit"
+    return 0
+  fi
+  (cd "$repo" && git commit -m "$commit_message" -- "${paths[@]}") || {
+    echo "ERROR: Failed to commit to main repository (${#entries[@]} stage commit(s) kept queued)" >&2
+    (cd "$repo" && git reset -q -- "${paths[@]}" 2>/dev/null)
+    _spec_queue_restore "$queue" "${entries[@]}"
+    return 1
+  }
+  echo "Committed to main repository: ${commit_message%%$'\n'*}"
+  return 0
+}
+
+# Flush queued spec commits for the current project
+# Commits the local and external queues (one commit, one push each).
+# Usage: flush_spec_commits [--dry-run]
+flush_spec_commits() {
+  local dry_run_flag=""
+  [[ "${1:-}" == "--dry-run" ]] && dry_run_flag="--dry-run"
+
+  _source_config_loader || return 1
+  load_agentic_config
+
+  local project_root
+  project_root="$(get_project_root)" || {
+    echo "ERROR: Could not find project root (no .agentic-config.json, CLAUDE.md, or .git found)" >&2
+    return 1
+  }
+
+  local status=0
+  if git -C "$project_root" rev-parse --git-dir >/dev/null 2>&1; then
+    _spec_flush_repo "$project_root" local $dry_run_flag || status=1
+  fi
+  local ext_repo="$project_root/${EXT_SPECS_LOCAL_PATH:-.specs}"
+  if [[ -n "${EXT_SPECS_REPO_URL:-}" && -d "$ext_repo/.git" ]]; then
+    _spec_flush_repo "$ext_repo" external $dry_run_flag || status=1
+  fi
+  return $status
+}
+
 # Commit spec changes to appropriate repository
-# Usage: commit_spec_changes <spec_path> <stage> <nnn> <title> [--dry-run]
+# Usage: commit_spec_changes <spec_path> <stage> <nnn> <title> [--dry-run] [--now]
 #   --dry-run: Show what would be committed without executing
+#   --now: With SPEC_COMMIT_WINDOW set, flush the queue (including this commit) immediately
 #
 # Examples:
 #   commit_spec_changes "/path/.specs/specs/2025/12/feat/x/001-spec.md" "PLAN" "001" "spec-title"
@@ -145,12 +377,17 @@ commit_spec_changes() {
   local stage="$2"
   local nnn="$3"
   local title="$4"
-  local dry_run=false
-  [[ "${5:-}" == "--dry-run" ]] && dry_run=true
+  local dry_run=false now=false opt
+  for opt in "${@:5}"; do
+    case "$opt" in
+      --dry-run) dry_run=true ;;
+      --now) now=true ;;
+    esac
+  done
 
   if [[ -z "$spec_path" ]] || [[ -z "$stage" ]] || [[ -z "$nnn" ]] || [[ -z "$title" ]]; then
     echo "ERROR: All parameters required" >&2
-    echo "Usage: commit_spec_changes <spec_path> <stage> <nnn> <title> [--dry-run]" >&2
+    echo "Usage: commit_spec_changes <spec_path> <stage> <nnn> <title> [--dry-run] [--now]" >&2
     return 1
   fi
 
@@ -165,9 +402,29 @@ commit_spec_changes() {
   }
   local ext_specs_path="${EXT_SPECS_LOCAL_PATH:-.specs}"
   local commit_message="spec($nnn): $stage - $title"
+  local target=local repo="$project_root"
+  if [[ -n "${EXT_SPECS_REPO_URL:-}" && -n "$ext_specs_path" && "$spec_path" == "$project_root/$ext_specs_path/specs/"* ]]; then
+    target=external
+    repo="$project_root/$ext_specs_path"
+  fi
+
+  # Batched mode: queue the stage commit, flush once the window has elapsed
+  _spec_commit_window
+  if [[ "$dry_run" != true && "$_SPEC_COMMIT_WINDOW" -gt 0 ]]; then
+    _spec_queue_file "$repo" || return 1
+    _spec_queue_add "$_SPEC_QUEUE_FILE" "$nnn" "$stage" "$title" "$spec_path" || return 1
+    local now_epoch="${EPOCHSECONDS:-}"
+    [[ -n "$now_epoch" ]] || now_epoch="$(date +%s)"
+    if [[ "$now" == true ]] || (( now_epoch - _SPEC_QUEUE_OLDEST >= _SPEC_COMMIT_WINDOW )); then
+      _spec_flush_repo "$repo" "$target"
+      return
+    fi
+    echo "Queued spec commit: $commit_message ($_SPEC_QUEUE_COUNT pending, run flush_spec_commits to commit now)"
+    return 0
+  fi
 
   # Check if spec is in external repository
-  if [[ -n "${EXT_SPECS_REPO_URL:-}" && -n "$ext_specs_path" && "$spec_path" == "$project_root/$ext_specs_path/specs/"* ]]; then
+  if [[ "$target" == external ]]; then
     # External specs repository - use ext_specs_commit
     if [[ "$dry_run" == true ]]; then
       echo "DRY RUN: commit_spec_changes (external)"
@@ -0,0 +1,290 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = [
+#   "pyyaml",
+#   "typer>=0.9",
+#   "rich>=13.0",
+# ]
+# requires-python = ">=3.11"
+# ///
+"""Benchmark the dry-run-guard Bash classifier in-process (accuracy, throughput, latency by input length)."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+GUARD = REPO_ROOT / "core/hooks/pretooluse/dry-run-guard.py"
+CORPUS = REPO_ROOT / "tests/fixtures/dry_run_guard_corpus.jsonl"
+
+# Upper bounds (bytes) for the latency-by-length report
+LENGTH_BUCKETS = [256, 4_096, 65_536, 1_048_576]
+
+app = typer.Typer(help="Benchmark the dry-run-guard Bash classifier over a labeled command corpus.")
+console = Console(stderr=True)
+
+
+def load_guard() -> object:
+    """Import dry-run-guard.py as a module with dry-run forced on (no status file or ps lookups)."""
+    spec = importlib.util.spec_from_file_location("dry_run_guard", GUARD)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["dry_run_guard"] = module
+    spec.loader.exec_module(module)
+    module.is_dry_run_enabled = lambda: True
+    return module
+
+
+def load_corpus(path: Path) -> list[dict]:
+    """Read a labeled corpus: one JSON object per line with id, command, expect (block|allow)."""
+    entries = []
+    for number, line in enumerate(path.read_text().splitlines(), 1):
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if entry.get("expect") not in ("block", "allow") or "command" not in entry:
+            raise ValueError(f"{path}:{number}: entry needs 'command' and 'expect' (block|allow)")
+        entries.append(entry)
+    return entries
+
+
+def _fill(rng: random.Random, size: int, make_line) -> list[str]:
+    """Repeat make_line(rng, index) until the lines reach size bytes."""
+    lines, total = [], 0
+    while total < size:
+        line = make_line(rng, len(lines))
+        lines.append(line)
+        total += len(line) + 1
+    return lines
+
+
+def _code_line(rng: random.Random, i: int) -> str:
+    name = rng.choice(["total", "count", "width", "score"])
+    return rng.choice([
+        f"    if {name}_{i} > {rng.randint(1, 99)}:",
+        f"    {name}_{i} = len(rows[{i}]) >> 1",
+        f"    print(f\"{{{name}_{i}}} -> row {i}\")",
+        f"    # step {i}: keep rows where {name} >= limit",
+    ])
+
+
+def _doc_line(rng: random.Random, i: int) -> str:
+    return rng.choice([
+        f"- item {i}: see `src/module_{i}.py`",
+        f"## Section {i}",
+        f"Some prose for paragraph {i}, about {rng.choice(['caching', 'parsing', 'locking'])}.",
+    ])
+
+
+def _loop_block(rng: random.Random, i: int) -> str:
+    path = rng.choice(["src", "core/lib", "tests", "docs"])
+    return f"for f in {path}/*_{i}.*; do\n  wc -l \"$f\"\n  grep -c TODO \"$f\" || true\ndone"
+
+
+def _pipeline_stage(rng: random.Random, i: int) -> str:
+    return rng.choice([
+        f"grep -v -e 'chore({i})'",
+        f"grep -E '^[0-9a-f]{{7}} .*(fix|feat)_{i}'",
+        f"awk '{{print $1, $2}}'",
+        "sort",
+        "uniq -c",
+    ])
+
+
+def generate_synthetic(sizes: list[int], seed: int = 0) -> list[dict]:
+    """Generate large labeled commands of roughly each size: heredocs, multi-line scripts, git log pipelines."""
+    rng = random.Random(seed)
+    entries = []
+    for size in sizes:
+        doc = "\n".join(_fill(rng, size, _doc_line))
+        code = "\n".join(_fill(rng, size, _code_line))
+        loops = "\n".join(_fill(rng, size, _loop_block))
+        stages = " | ".join(_fill(rng, size, _pipeline_stage))
+        entries += [
+            {"id": f"heredoc-write-{size}", "command": f"cat > docs/notes.md <<'EOF'\n{doc}\nEOF", "expect": "block"},
+            {"id": f"heredoc-stdout-{size}", "command": f"cat <<'EOF'\n{doc}\nEOF", "expect": "allow"},
+            {"id": f"heredoc-python-{size}", "command": f"python3 - <<'EOF'\nfor rows in []:\n{code}\nEOF", "expect": "allow"},
+            {"id": f"script-read-{size}", "command": loops, "expect": "allow"},
+            {"id": f"script-write-tail-{size}", "command": f"{loops}\nrm -f \"$tmpfile\"", "expect": "block"},
+            {"id": f"git-log-pipeline-{size}", "command": f"git log --all --format='%h %an %s' | {stages} | head -n 50", "expect": "allow"},
+        ]
+    return entries
+
+
+def length_bucket(length: int) -> str:
+    """Label for the smallest LENGTH_BUCKETS bound that fits length."""
+    for bound in LENGTH_BUCKETS:
+        if length <= bound:
+            return f"<={bound // 1024}KB" if bound >= 1024 else f"<={bound}B"
+    return f">{LENGTH_BUCKETS[-1] // 1024}KB"
+
+
+def _bucket_order(label: str) -> int:
+    labels = [length_bucket(bound) for bound in LENGTH_BUCKETS]
+    return labels.index(label) if label in labels else len(labels)
+
+
+def classify(guard: object, entries: list[dict], repeat: int) -> dict:
+    """Run should_block_tool over entries; return accuracy counts and per-entry latency."""
+    results = {"false_allows": [], "false_blocks": [], "correct": 0}
+    latencies: dict[str, list[float]] = {}
+    total_seconds = 0.0
+    for entry in entries:
+        tool_input = {"command": entry["command"]}
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            blocked, _ = guard.should_block_tool("Bash", tool_input)
+            timings.append(time.perf_counter() - start)
+        total_seconds += sum(timings)
+        latencies.setdefault(length_bucket(len(entry["command"])), []).extend(timings)
+
+        decision = "block" if blocked else "allow"
+        if decision == entry["expect"]:
+            results["correct"] += 1
+        else:
+            results["false_allows" if entry["expect"] == "block" else "false_blocks"].append(entry["id"])
+
+    results["total"] = len(entries)
+    results["accuracy"] = round(results["correct"] / len(entries), 4) if entries else None
+    results["commands_per_sec"] = round(len(entries) * repeat / total_seconds, 1) if total_seconds else None
+    results["latency_us"] = {
+        bucket: {
+            "n": len(values),
+            "p50": round(statistics.median(values) * 1e6, 2),
+            "max": round(max(values) * 1e6, 2),
+        }
+        for bucket, values in sorted(latencies.items(), key=lambda item: _bucket_order(item[0]))
+    }
+    return results
+
+
+def git_revision() -> str | None:
+    """Short git SHA of the agentic-config checkout, if available."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(REPO_ROOT), "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=False,
+        )
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_report(name: str, results: dict) -> None:
+    """Print accuracy and latency tables for one corpus."""
+    out = Console()
+    out.print(
+        f"[bold]{name}[/bold]: {results['correct']}/{results['total']} correct | "
+        f"false allows {len(results['false_allows'])} | false blocks {len(results['false_blocks'])} | "
+        f"{results['commands_per_sec']:,.0f} commands/sec"
+    )
+    for label in ("false_allows", "false_blocks"):
+        if results[label]:
+            out.print(f"  {label.replace('_', ' ')}: {', '.join(results[label])}")
+    table = Table(title=f"{name}: latency by input length")
+    for column in ("Length", "Runs", "p50 (us)", "max (us)"):
+        table.add_column(column, justify="left" if column == "Length" else "right")
+    for bucket, stats in results["latency_us"].items():
+        table.add_row(bucket, str(stats["n"]), f"{stats['p50']:.1f}", f"{stats['max']:.1f}")
+    out.print(table)
+
+
+def print_comparison(current: dict, baseline: dict) -> None:
+    """Print accuracy and performance deltas between this run and a previously saved result."""
+    for key in ("sizes", "seed"):
+        if baseline.get(key) != current[key]:
+            console.print(f"[yellow]Warning:[/yellow] baseline {key} {baseline.get(key)} != {current[key]}; synthetic rows are not like-for-like")
+    table = Table(title=f"Comparison vs {baseline.get('version')} ({baseline.get('git_sha')})")
+    table.add_column("Metric")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Delta", justify="right")
+
+    def add(metric: str, old: float | None, new: float | None) -> None:
+        if old is None or new is None:
+            return
+        delta = f"{(new - old) / old * 100:+.1f}%" if old else f"{new - old:+g}"
+        table.add_row(metric, f"{old:g}", f"{new:g}", delta)
+
+    for name, results in current["corpora"].items():
+        old = baseline.get("corpora", {}).get(name)
+        if not old:
+            continue
+        add(f"{name} false allows", len(old["false_allows"]), len(results["false_allows"]))
+        add(f"{name} false blocks", len(old["false_blocks"]), len(results["false_blocks"]))
+        add(f"{name} commands/sec", old["commands_per_sec"], results["commands_per_sec"])
+        for bucket, stats in results["latency_us"].items():
+            if bucket in old["latency_us"]:
+                add(f"{name} max us {bucket}", old["latency_us"][bucket]["max"], stats["max"])
+    Console().print(table)
+
+
+@app.command()
+def main(
+    corpus: Annotated[Path, typer.Option(help="Labeled corpus (JSONL: id, command, expect)")] = CORPUS,
+    sizes: Annotated[str, typer.Option(help="Comma-separated synthetic command sizes in bytes (empty to skip)")] = "1000,16000,256000,1000000",
+    seed: Annotated[int, typer.Option(help="Seed for the synthetic generator")] = 0,
+    repeat: Annotated[int, typer.Option(help="Classifier runs per command")] = 20,
+    write_synthetic: Annotated[Path | None, typer.Option(help="Also save the generated commands as a corpus file")] = None,
+    output: Annotated[Path | None, typer.Option(help="Results file (default: outputs/bench/dry_run_guard-<version>-<timestamp>.json)")] = None,
+    compare: Annotated[Path | None, typer.Option(help="Previous results file to compare against")] = None,
+) -> None:
+    """Classify the labeled and synthetic corpora in-process, then save results."""
+    guard = load_guard()
+    version = (REPO_ROOT / "VERSION").read_text().strip() if (REPO_ROOT / "VERSION").exists() else "unknown"
+    size_list = [int(size) for size in sizes.split(",") if size.strip()]
+
+    corpora = {"corpus": load_corpus(corpus)}
+    if size_list:
+        corpora["synthetic"] = generate_synthetic(size_list, seed)
+        if write_synthetic:
+            write_synthetic.parent.mkdir(parents=True, exist_ok=True)
+            write_synthetic.write_text("".join(json.dumps(entry) + "\n" for entry in corpora["synthetic"]))
+            console.print(f"[green]Saved synthetic corpus:[/green] {write_synthetic}")
+
+    measured = {}
+    for name, entries in corpora.items():
+        console.print(f"[blue]Classifying:[/blue] {len(entries)} {name} commands x {repeat}")
+        measured[name] = classify(guard, entries, repeat)
+        print_report(name, measured[name])
+
+    results = {
+        "tool": "dry_run_guard",
+        "version": version,
+        "git_sha": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": str(corpus),
+        "sizes": size_list,
+        "seed": seed,
+        "repeat": repeat,
+        "corpora": measured,
+    }
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output_path = output or Path("outputs/bench") / f"dry_run_guard-{version}-{stamp}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2) + "\n")
+    console.print(f"[green]Saved:[/green] {output_path}")
+
+    if compare:
+        print_comparison(results, json.loads(compare.read_text()))
+
+
+if __name__ == "__main__":
+    app()
@@ -11,11 +11,23 @@
 """Query videos using Google Gemini API with native video support."""
 from __future__ import annotations
 
+import hashlib
 import json
+import math
 import os
+import random
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
 import time
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Callable, Protocol
 
 # Pricing per 1M tokens (gemini-2.5-flash-lite)
 PRICING = {
@@ -25,10 +37,44 @@ PRICING = {
     "default": {"input": 0.10, "output": 0.40},
 }
 
+# Gemini input token accounting: video at default media resolution, and images
+# (<= 384px on both sides counts as one tile, larger images are cut into 768px tiles)
+VIDEO_TOKENS_PER_SECOND = 263
+IMAGE_TOKENS_PER_TILE = 258
+
+# Usage ledger: one row per successful query, aggregated by `report`
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    day TEXT NOT NULL,
+    model TEXT NOT NULL,
+    video_path TEXT NOT NULL,
+    video_bytes INTEGER,
+    video_seconds REAL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    upload_seconds REAL,
+    elapsed_seconds REAL NOT NULL,
+    mode TEXT NOT NULL DEFAULT 'video'
+);
+CREATE INDEX IF NOT EXISTS idx_runs_model_day ON runs (model, day);
+CREATE INDEX IF NOT EXISTS idx_runs_day ON runs (day);
+"""
+
+# Needs the mode column, so applied after migrating older ledgers. Latency is
+# end to end (upload + generation), the expression `report` sorts by
+LEDGER_MODE_SCHEMA = """
+DROP INDEX IF EXISTS idx_runs_model_latency;
+DROP INDEX IF EXISTS idx_runs_model_mode_latency;
+CREATE INDEX IF NOT EXISTS idx_runs_model_mode_e2e ON runs (model, mode, (COALESCE(upload_seconds, 0) + elapsed_seconds));
+"""
+
 import typer
 from dotenv import load_dotenv
-from google import genai
 from rich.console import Console
+from rich.table import Table
 
 # Load .env file from current directory or parent directories
 load_dotenv()
@@ -53,97 +99,935 @@ def get_mime_type(path: Path) -> str:
     return mime_types.get(ext, "video/mp4")
 
 
-@app.command()
-def main(
-    video_path: Annotated[Path, typer.Argument(help="Path to video file")],
-    query: Annotated[str, typer.Argument(help="Query to ask about the video")],
-    model: Annotated[str, typer.Option(help="Gemini model")] = "gemini-2.5-flash-lite",
-    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
-) -> None:
-    """Query a video using Google Gemini API with native video upload."""
-    # Check API key
+def default_ledger_path() -> Path:
+    """Get ledger path: $VIDEO_QUERY_LEDGER or XDG data dir."""
+    override = os.environ.get("VIDEO_QUERY_LEDGER")
+    if override:
+        return Path(override)
+    data_home = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local/share")
+    return Path(data_home) / "agentic" / "video_query.sqlite"
+
+
+def open_ledger(path: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the usage ledger database."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(LEDGER_SCHEMA)
+        # Ledgers created before frame mode lack the mode column
+        if "mode" not in {row[1] for row in conn.execute("PRAGMA table_info(runs)")}:
+            with conn:
+                conn.execute("ALTER TABLE runs ADD COLUMN mode TEXT NOT NULL DEFAULT 'video'")
+        conn.executescript(LEDGER_MODE_SCHEMA)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def record_usage(path: Path, row: dict) -> None:
+    """Append one run to the ledger. Never fails the query itself."""
+    try:
+        with closing(open_ledger(path)) as conn, conn:
+            conn.execute(
+                "INSERT INTO runs (ts, day, model, video_path, video_bytes, video_seconds,"
+                " input_tokens, output_tokens, cost_usd, upload_seconds, elapsed_seconds, mode)"
+                " VALUES (:ts, :day, :model, :video_path, :video_bytes, :video_seconds,"
+                " :input_tokens, :output_tokens, :cost_usd, :upload_seconds, :elapsed_seconds, :mode)",
+                {"mode": "video", **row},
+            )
+    except (sqlite3.Error, OSError) as e:
+        console.print(f"[yellow]Warning:[/yellow] Could not record usage in {path}: {e}")
+
+
+def get_video_seconds(video_file: object) -> float | None:
+    """Extract video duration from uploaded file metadata, if the API reports it."""
+    metadata = getattr(video_file, "video_metadata", None)
+    if not metadata:
+        return None
+    duration = metadata.get("video_duration") if isinstance(metadata, dict) else getattr(metadata, "video_duration", None)
+    if duration is None:
+        return None
+    try:
+        # Durations are reported as protobuf strings like "12.5s"
+        return float(str(duration).rstrip("s"))
+    except ValueError:
+        return None
+
+
+class VideoQueryError(Exception):
+    """Query failure with a user-facing label (e.g. "Error uploading video")."""
+
+    def __init__(self, label: str, detail: object):
+        super().__init__(f"{label}: {detail}")
+        self.label = label
+        self.detail = detail
+
+
+@dataclass
+class UploadedVideo:
+    """Backend-neutral view of an uploaded video file."""
+    name: str
+    state: str  # "PROCESSING" | "ACTIVE" | "FAILED"
+    video_seconds: float | None = None
+    handle: object = None  # Backend-native file object
+
+
+@dataclass
+class Generation:
+    """Model response text plus usage metadata."""
+    text: str
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass
+class Frame:
+    """One extracted keyframe (JPEG) with its position in the video."""
+    path: Path
+    timestamp: float
+    width: int
+    height: int
+    phash: int
+
+
+class VideoBackend(Protocol):
+    """Upload/processing/generation operations used by run_query."""
+    poll_interval: float
+
+    def upload(self, path: Path) -> UploadedVideo: ...
+
+    def refresh(self, video: UploadedVideo) -> UploadedVideo: ...
+
+    def generate(
+        self, model: str, video: UploadedVideo, query: str, on_chunk: Callable[[str], None] | None = None
+    ) -> Generation: ...
+
+    def generate_frames(
+        self, model: str, frames: list[Frame], query: str, on_chunk: Callable[[str], None] | None = None
+    ) -> Generation: ...
+
+
+class GeminiBackend:
+    """Google Gemini API backend (native video upload)."""
+    poll_interval = 2.0
+
+    def __init__(self, api_key: str):
+        # Imported lazily so the fake backend runs without google-genai installed
+        from google import genai
+
+        self.client = genai.Client(api_key=api_key)
+
+    @staticmethod
+    def _wrap(video_file: object) -> UploadedVideo:
+        return UploadedVideo(
+            name=video_file.name,
+            state=video_file.state.name,
+            video_seconds=get_video_seconds(video_file),
+            handle=video_file,
+        )
+
+    def upload(self, path: Path) -> UploadedVideo:
+        return self._wrap(self.client.files.upload(file=str(path)))
+
+    def refresh(self, video: UploadedVideo) -> UploadedVideo:
+        return self._wrap(self.client.files.get(name=video.name))
+
+    def generate(
+        self, model: str, video: UploadedVideo, query: str, on_chunk: Callable[[str], None] | None = None
+    ) -> Generation:
+        return self._generate(model, [video.handle, query], on_chunk)
+
+    def generate_frames(
+        self, model: str, frames: list[Frame], query: str, on_chunk: Callable[[str], None] | None = None
+    ) -> Generation:
+        from google.genai import types
+
+        contents: list = []
+        for frame in frames:
+            contents.append(f"Frame at {frame.timestamp:.1f}s:")
+            contents.append(types.Part.from_bytes(data=frame.path.read_bytes(), mime_type="image/jpeg"))
+        contents.append(query)
+        return self._generate(model, contents, on_chunk)
+
+    def _generate(self, model: str, contents: list, on_chunk: Callable[[str], None] | None) -> Generation:
+        if on_chunk is None:
+            response = self.client.models.generate_content(model=model, contents=contents)
+            text, usage = response.text, response.usage_metadata
+        else:
+            parts, usage = [], None
+            for chunk in self.client.models.generate_content_stream(model=model, contents=contents):
+                if chunk.text:
+                    parts.append(chunk.text)
+                    on_chunk(chunk.text)
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+            text = "".join(parts)
+        input_tokens = (usage.prompt_token_count or 0) if usage else 0
+        output_tokens = (usage.candidates_token_count or 0) if usage else 0
+        return Generation(text=text, input_tokens=input_tokens, output_tokens=output_tokens)
+
+
+# Fake backend defaults. Latencies accept a number (constant) or a distribution:
+#   {"dist": "uniform", "low": a, "high": b}      {"dist": "normal", "mean": m, "stddev": s}
+#   {"dist": "lognormal", "median": m, "sigma": s} {"dist": "exponential", "mean": m}
+FAKE_DEFAULTS: dict = {
+    "seed": None,
+    "poll_interval": 0.05,
+    "upload_seconds": {"dist": "lognormal", "median": 0.4, "sigma": 0.3},
+    "processing_seconds": {"dist": "lognormal", "median": 1.0, "sigma": 0.4},
+    "ttft_seconds": {"dist": "lognormal", "median": 0.6, "sigma": 0.3},
+    "tokens_per_second": {"dist": "normal", "mean": 150, "stddev": 20},
+    "output_tokens": {"dist": "normal", "mean": 250, "stddev": 60},
+    "chunk_tokens": 25,
+    "video_bytes_per_second": 250_000,
+    "tokens_per_video_second": 263,
+    "failure_rate": 0.0,
+}
+
+
+def sample(spec: object, rng: random.Random) -> float:
+    """Draw a non-negative value from a constant or distribution spec."""
+    if isinstance(spec, (int, float)):
+        return max(0.0, float(spec))
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid distribution spec: {spec!r}")
+    dist = spec.get("dist", "constant")
+    if dist == "constant":
+        value = spec["value"]
+    elif dist == "uniform":
+        value = rng.uniform(spec["low"], spec["high"])
+    elif dist == "normal":
+        value = rng.gauss(spec["mean"], spec["stddev"])
+    elif dist == "lognormal":
+        value = spec["median"] * math.exp(rng.gauss(0, spec["sigma"]))
+    elif dist == "exponential":
+        value = rng.expovariate(1 / spec["mean"]) if spec["mean"] > 0 else 0.0
+    else:
+        raise ValueError(f"Unknown distribution: {dist}")
+    return max(0.0, float(value))
+
+
+def load_fake_config(source: str | None) -> dict:
+    """Merge fake backend overrides (inline JSON or path to a JSON file) onto FAKE_DEFAULTS."""
+    config = dict(FAKE_DEFAULTS)
+    if source:
+        overrides = json.loads(source) if source.lstrip().startswith("{") else json.loads(Path(source).read_text())
+        unknown = set(overrides) - set(FAKE_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown fake backend settings: {', '.join(sorted(unknown))}")
+        config.update(overrides)
+    return config
+
+
+class FakeBackend:
+    """Offline backend simulating upload, processing, streaming generation and usage metadata."""
+
+    def __init__(self, config: dict | None = None):
+        self.config = config or dict(FAKE_DEFAULTS)
+        self.rng = random.Random(self.config.get("seed"))
+        self.poll_interval = float(self.config["poll_interval"])
+        self._ready_at: dict[str, float] = {}
+
+    def upload(self, path: Path) -> UploadedVideo:
+        time.sleep(sample(self.config["upload_seconds"], self.rng))
+        name = f"files/fake-{self.rng.getrandbits(32):08x}"
+        self._ready_at[name] = time.monotonic() + sample(self.config["processing_seconds"], self.rng)
+        video_seconds = path.stat().st_size / self.config["video_bytes_per_second"]
+        return UploadedVideo(name=name, state="PROCESSING", video_seconds=round(video_seconds, 2))
+
+    def refresh(self, video: UploadedVideo) -> UploadedVideo:
+        if time.monotonic() < self._ready_at[video.name]:
+            return video
+        state = "FAILED" if self.rng.random() < self.config["failure_rate"] else "ACTIVE"
+        return UploadedVideo(name=video.name, state=state, video_seconds=video.video_seconds)
+
+    def generate(
+        self, model: str, video: UploadedVideo, query: str, on_chunk: Callable[[str], None] | None = None
+    ) -> Generation:
+        text, output_tokens = self._stream(on_chunk)
+        input_tokens = int((video.video_seconds or 0) * self.config["tokens_per_video_second"]) + len(query.split())
+        return Generation(text=text, input_tokens=input_tokens, output_tokens=output_tokens)
+
+    def generate_frames(
+        self, model: str, frames: list[Frame], query: str, on_chunk: Callable[[str], None] | None = None
+    ) -> Generation:
+        text, output_tokens = self._stream(on_chunk)
+        # Each frame is preceded by a "Frame at N.Ns:" label (3 words)
+        input_tokens = sum(image_tokens(f.width, f.height) + 3 for f in frames) + len(query.split())
+        return Generation(text=text, input_tokens=input_tokens, output_tokens=output_tokens)
+
+    def _stream(self, on_chunk: Callable[[str], None] | None) -> tuple[str, int]:
+        """Simulate time to first token and streamed output. Returns (text, output_tokens)."""
+        output_tokens = int(sample(self.config["output_tokens"], self.rng))
+        tokens_per_second = sample(self.config["tokens_per_second"], self.rng)
+        chunk_tokens = max(1, int(self.config["chunk_tokens"]))
+
+        time.sleep(sample(self.config["ttft_seconds"], self.rng))
+        parts = []
+        for start in range(0, output_tokens, chunk_tokens):
+            count = min(chunk_tokens, output_tokens - start)
+            if tokens_per_second > 0:
+                time.sleep(count / tokens_per_second)
+            part = " ".join(f"tok{start + i}" for i in range(count)) + " "
+            parts.append(part)
+            if on_chunk is not None:
+                on_chunk(part)
+        return "".join(parts).strip(), output_tokens
+
+
+def make_backend(name: str, fake_config: str | None = None) -> VideoBackend:
+    """Instantiate a backend by name ("gemini" or "fake")."""
+    if name == "fake":
+        return FakeBackend(load_fake_config(fake_config))
+    if name != "gemini":
+        raise VideoQueryError("Error", f"Unknown backend: {name}")
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
-        console.print("[red]Error:[/red] GEMINI_API_KEY environment variable not set")
-        raise typer.Exit(1)
+        raise VideoQueryError("Error", "GEMINI_API_KEY environment variable not set")
+    return GeminiBackend(api_key)
 
-    # Validate video exists
-    if not video_path.exists():
-        console.print(f"[red]Error:[/red] Video not found: {video_path}")
-        raise typer.Exit(1)
 
-    # Initialize client
-    client = genai.Client(api_key=api_key)
+def usage_cost(model: str, input_tokens: int, output_tokens: int) -> tuple[float, float]:
+    """Input and output cost in USD for a model."""
+    pricing = PRICING.get(model, PRICING["default"])
+    return (input_tokens / 1_000_000) * pricing["input"], (output_tokens / 1_000_000) * pricing["output"]
+
 
+def run_query(
+    backend: VideoBackend,
+    video_path: Path,
+    query: str,
+    model: str,
+    on_chunk: Callable[[str], None] | None = None,
+) -> dict:
+    """Upload a video, wait for processing and query the model. Returns usage, cost and timing."""
     # Upload video
     console.print(f"[blue]Uploading video:[/blue] {video_path}")
+    upload_start = time.time()
     try:
-        video_file = client.files.upload(file=str(video_path))
+        video = backend.upload(video_path)
     except Exception as e:
-        console.print(f"[red]Error uploading video:[/red] {e}")
-        raise typer.Exit(1)
+        raise VideoQueryError("Error uploading video", e) from e
 
     # Wait for file to be processed
     console.print("[blue]Waiting for video processing...[/blue]")
-    while video_file.state.name == "PROCESSING":
-        time.sleep(2)
-        video_file = client.files.get(name=video_file.name)
+    while video.state == "PROCESSING":
+        time.sleep(backend.poll_interval)
+        video = backend.refresh(video)
+    upload_time = time.time() - upload_start
 
-    if video_file.state.name != "ACTIVE":
-        console.print(f"[red]Error:[/red] Video processing failed: {video_file.state.name}")
-        raise typer.Exit(1)
+    if video.state != "ACTIVE":
+        raise VideoQueryError("Error", f"Video processing failed: {video.state}")
 
     # Query model
     console.print(f"[blue]Querying {model}...[/blue]")
     start_time = time.time()
     try:
-        response = client.models.generate_content(
-            model=model,
-            contents=[video_file, query],
+        generation = backend.generate(model, video, query, on_chunk)
+    except Exception as e:
+        raise VideoQueryError("Error from API", e) from e
+    elapsed_time = time.time() - start_time
+
+    input_cost, output_cost = usage_cost(model, generation.input_tokens, generation.output_tokens)
+
+    return {
+        "response": generation.text,
+        "input_tokens": generation.input_tokens,
+        "output_tokens": generation.output_tokens,
+        "input_cost": input_cost,
+        "output_cost": output_cost,
+        "total_cost": input_cost + output_cost,
+        "video_seconds": video.video_seconds,
+        "upload_time": upload_time,
+        "elapsed_time": elapsed_time,
+    }
+
+
+# Frame mode: sample keyframes locally and send them as images instead of uploading the video
+
+
+@dataclass(frozen=True)
+class FrameSampling:
+    """Keyframe sampling settings. Every field is part of the frame cache key."""
+    method: str = "scene"  # "scene" (scene-change detection) | "interval" (fixed spacing)
+    interval: float = 2.0  # seconds between frames (interval)
+    scene_threshold: float = 0.3  # ffmpeg scene score 0-1 that starts a new frame (scene)
+    max_frames: int = 32  # cap after dedupe; evenly thinned beyond it
+    max_size: int = 768  # longest side in pixels
+    dedupe_distance: int = 6  # drop frames within this phash Hamming distance of the last kept one
+
+    def select_expr(self) -> str:
+        """ffmpeg `select` expression for this sampling method."""
+        if self.method == "scene":
+            return f"eq(n,0)+gt(scene,{self.scene_threshold})"
+        if self.method == "interval":
+            return f"isnan(prev_selected_t)+gte(t-prev_selected_t,{self.interval})"
+        raise VideoQueryError("Error", f"Unknown sampling method: {self.method} (expected scene or interval)")
+
+    def cache_key(self) -> str:
+        return hashlib.sha256(json.dumps(asdict(self), sort_keys=True).encode()).hexdigest()[:12]
+
+
+@dataclass
+class FrameSet:
+    """Keyframes kept for a video plus extraction statistics."""
+    frames: list[Frame]
+    extracted: int
+    video_seconds: float | None
+    cached: bool
+    extract_seconds: float
+
+
+def default_frame_cache_dir() -> Path:
+    """Get frame cache dir: $VIDEO_QUERY_FRAME_CACHE or XDG cache dir."""
+    override = os.environ.get("VIDEO_QUERY_FRAME_CACHE")
+    if override:
+        return Path(override)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "agentic" / "video_query" / "frames"
+
+
+def file_sha256(path: Path) -> str:
+    """Hash file contents in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# DCT-II basis for the 8 lowest frequencies of a 32-sample signal
+_PHASH_SIZE = 32
+_PHASH_BASIS = [
+    [math.cos(math.pi * (2 * n + 1) * k / (2 * _PHASH_SIZE)) for n in range(_PHASH_SIZE)] for k in range(8)
+]
+
+
+def phash(gray: bytes) -> int:
+    """64-bit perceptual hash of a 32x32 8-bit grayscale image (low-frequency DCT vs median)."""
+    size = _PHASH_SIZE
+    rows = [gray[i * size:(i + 1) * size] for i in range(size)]
+    # Separable 2D DCT, keeping the top-left 8x8 coefficients
+    row_coeffs = [[sum(b * p for b, p in zip(basis, row)) for basis in _PHASH_BASIS] for row in rows]
+    coeffs = [
+        sum(_PHASH_BASIS[u][y] * row_coeffs[y][v] for y in range(size))
+        for u in range(8)
+        for v in range(8)
+    ]
+    median = sorted(coeffs[1:])[31]  # exclude the DC term
+    bits = 0
+    for c in coeffs:
+        bits = (bits << 1) | (c > median)
+    return bits
+
+
+def dedupe_frames(frames: list[Frame], max_distance: int) -> list[Frame]:
+    """Drop frames whose phash is within max_distance bits of the last kept frame."""
+    kept: list[Frame] = []
+    for frame in frames:
+        if kept and (frame.phash ^ kept[-1].phash).bit_count() <= max_distance:
+            continue
+        kept.append(frame)
+    return kept
+
+
+def thin_frames(frames: list[Frame], max_frames: int) -> list[Frame]:
+    """Keep at most max_frames, evenly spaced (first and last always kept)."""
+    if max_frames <= 0 or len(frames) <= max_frames:
+        return frames
+    if max_frames == 1:
+        return frames[:1]
+    step = (len(frames) - 1) / (max_frames - 1)
+    return [frames[round(i * step)] for i in range(max_frames)]
+
+
+def image_tokens(width: int, height: int) -> int:
+    """Estimated input tokens for one image."""
+    if width <= 384 and height <= 384:
+        return IMAGE_TOKENS_PER_TILE
+    return math.ceil(width / 768) * math.ceil(height / 768) * IMAGE_TOKENS_PER_TILE
+
+
+_SHOWINFO_RE = re.compile(r"\] n:\s*\d+\s+pts:\s*\S+\s+pts_time:(\S+).*?\ss:(\d+)x(\d+)")
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_FFMPEG_VERSION_RE = re.compile(r"ffmpeg version n?(\d+)\.(\d+)")
+
+
+def ffmpeg_vfr_flag(ffmpeg: str) -> str:
+    """Per-output variable frame rate option: -fps_mode (ffmpeg 5.1+) or the older -vsync."""
+    proc = subprocess.run([ffmpeg, "-hide_banner", "-version"], capture_output=True, text=True)
+    match = _FFMPEG_VERSION_RE.search(proc.stdout)
+    # Git builds ("N-...") and unparsed versions are assumed current
+    if match and (int(match[1]), int(match[2])) < (5, 1):
+        return "-vsync"
+    return "-fps_mode"
+
+
+def _parse_extraction(stderr: str, gray: bytes, work_dir: Path) -> tuple[list[Frame], float | None]:
+    """Frames (timestamp, size, phash) and video length from ffmpeg showinfo output and the raw hash stream."""
+    info = _SHOWINFO_RE.findall(stderr)
+    pixels = _PHASH_SIZE * _PHASH_SIZE
+    if not info or len(gray) != len(info) * pixels:
+        raise VideoQueryError("Error extracting frames", f"ffmpeg produced {len(info)} frames, {len(gray)} hash bytes")
+    duration = _DURATION_RE.search(stderr)
+    video_seconds = (
+        round(int(duration[1]) * 3600 + int(duration[2]) * 60 + float(duration[3]), 2) if duration else None
+    )
+    frames = [
+        Frame(work_dir / f"{i + 1:05d}.jpg", round(float(ts), 2), int(w), int(h), phash(gray[i * pixels:(i + 1) * pixels]))
+        for i, (ts, w, h) in enumerate(info)
+    ]
+    return frames, video_seconds
+
+
+def _load_frame_manifest(cache_dir: Path) -> FrameSet:
+    manifest = json.loads((cache_dir / "frames.json").read_text())
+    frames = [
+        Frame(cache_dir / f["file"], f["timestamp"], f["width"], f["height"], int(f["phash"], 16))
+        for f in manifest["frames"]
+    ]
+    return FrameSet(frames, manifest["extracted"], manifest["video_seconds"], cached=True, extract_seconds=0.0)
+
+
+def extract_frames(video_path: Path, sampling: FrameSampling, cache_root: Path) -> FrameSet:
+    """Sample, dedupe and cache keyframes for a video (one ffmpeg pass).
+
+    Cached by video content hash and sampling settings: a hit skips decoding entirely.
+    """
+    start = time.time()
+    cache_dir = cache_root / f"{file_sha256(video_path)[:16]}-{sampling.cache_key()}"
+    if (cache_dir / "frames.json").exists():
+        frame_set = _load_frame_manifest(cache_dir)
+        frame_set.extract_seconds = time.time() - start
+        return frame_set
+
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise VideoQueryError("Error", "ffmpeg not found on PATH (required for --mode frames)")
+
+    # One decode: selected frames are scaled and written as JPEG, and a 32x32
+    # grayscale copy of each goes to a raw stream for perceptual hashing
+    size = sampling.max_size
+    graph = (
+        f"[0:v]select='{sampling.select_expr()}',"
+        f"scale='min({size},iw)':'min({size},ih)':force_original_aspect_ratio=decrease:force_divisible_by=2,"
+        "showinfo,split=2[frames][small];"
+        "[small]scale=32:32:flags=area,format=gray[hash]"
+    )
+    vfr = ffmpeg_vfr_flag(ffmpeg)
+    cache_root.mkdir(parents=True, exist_ok=True)
+    work_dir = Path(tempfile.mkdtemp(prefix=".extract-", dir=cache_root))
+    try:
+        proc = subprocess.run(
+            [
+                ffmpeg, "-hide_banner", "-nostdin", "-i", str(video_path), "-filter_complex", graph,
+                "-map", "[frames]", vfr, "vfr", "-q:v", "3", str(work_dir / "%05d.jpg"),
+                "-map", "[hash]", vfr, "vfr", "-f", "rawvideo", str(work_dir / "hash.gray"),
+            ],
+            capture_output=True,
+            text=True,
         )
-        response_text = response.text
+        if proc.returncode != 0:
+            raise VideoQueryError(
+                "Error extracting frames", (proc.stderr.strip().splitlines() or [f"ffmpeg exit code {proc.returncode}"])[-1]
+            )
+
+        gray = (work_dir / "hash.gray").read_bytes() if (work_dir / "hash.gray").exists() else b""
+        frames, video_seconds = _parse_extraction(proc.stderr, gray, work_dir)
+        kept = thin_frames(dedupe_frames(frames, sampling.dedupe_distance), sampling.max_frames)
+
+        # Keep only the selected JPEGs, then publish the directory atomically
+        keep_names = {f.path.name for f in kept}
+        for path in work_dir.iterdir():
+            if path.name not in keep_names:
+                path.unlink()
+        (work_dir / "frames.json").write_text(json.dumps({
+            "video_path": str(video_path),
+            "sampling": asdict(sampling),
+            "video_seconds": video_seconds,
+            "extracted": len(frames),
+            "frames": [
+                {"file": f.path.name, "timestamp": f.timestamp, "width": f.width, "height": f.height, "phash": f"{f.phash:016x}"}
+                for f in kept
+            ],
+        }, indent=2))
+        try:
+            work_dir.rename(cache_dir)
+        except OSError:
+            # Another run published the same key first
+            if not (cache_dir / "frames.json").exists():
+                raise
+    finally:
+        if work_dir.exists():
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    frame_set = _load_frame_manifest(cache_dir)
+    frame_set.cached = False
+    frame_set.extract_seconds = time.time() - start
+    return frame_set
+
+
+def run_frames_query(
+    backend: VideoBackend,
+    frame_set: FrameSet,
+    query: str,
+    model: str,
+    on_chunk: Callable[[str], None] | None = None,
+) -> dict:
+    """Query the model with sampled keyframes in one request. Returns usage, cost and timing."""
+    console.print(f"[blue]Querying {model} with {len(frame_set.frames)} frames...[/blue]")
+    start_time = time.time()
+    try:
+        generation = backend.generate_frames(model, frame_set.frames, query, on_chunk)
     except Exception as e:
-        console.print(f"[red]Error from API:[/red] {e}")
-        raise typer.Exit(1)
+        raise VideoQueryError("Error from API", e) from e
     elapsed_time = time.time() - start_time
 
-    # Extract token usage
-    input_tokens = 0
-    output_tokens = 0
-    if response.usage_metadata:
-        input_tokens = response.usage_metadata.prompt_token_count or 0
-        output_tokens = response.usage_metadata.candidates_token_count or 0
+    input_cost, output_cost = usage_cost(model, generation.input_tokens, generation.output_tokens)
+    return {
+        "response": generation.text,
+        "input_tokens": generation.input_tokens,
+        "output_tokens": generation.output_tokens,
+        "input_cost": input_cost,
+        "output_cost": output_cost,
+        "total_cost": input_cost + output_cost,
+        "video_seconds": frame_set.video_seconds,
+        "upload_time": None,
+        "elapsed_time": elapsed_time,
+    }
+
+
+def estimate_video_mode(ledger_path: Path, model: str, video_seconds: float | None, query: str) -> dict:
+    """Estimate video-mode input tokens and end-to-end seconds for a video of this length.
+
+    Tokens follow Gemini's per-second video rate; latency scales this model's recorded
+    video-mode (upload + generation) seconds per video second from the usage ledger.
+    """
+    if not video_seconds:
+        return {"input_tokens": None, "time_seconds": None}
+    seconds = None
+    if ledger_path.exists():
+        try:
+            conn = open_ledger(ledger_path)
+            total, covered = conn.execute(
+                "SELECT SUM(COALESCE(upload_seconds, 0) + elapsed_seconds), SUM(video_seconds) FROM runs"
+                " WHERE model = ? AND mode = 'video' AND video_seconds > 0",
+                (model,),
+            ).fetchone()
+            conn.close()
+            if covered:
+                seconds = total / covered * video_seconds
+        except sqlite3.Error:
+            pass
+    return {
+        "input_tokens": int(video_seconds * VIDEO_TOKENS_PER_SECOND) + len(query.split()),
+        "time_seconds": seconds,
+    }
 
-    # Calculate cost
-    pricing = PRICING.get(model, PRICING["default"])
-    input_cost = (input_tokens / 1_000_000) * pricing["input"]
-    output_cost = (output_tokens / 1_000_000) * pricing["output"]
-    total_cost = input_cost + output_cost
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_ledger(conn: sqlite3.Connection, since: str | None = None, until: str | None = None) -> dict:
+    """Aggregate ledger rows by (model, mode) and by day.
+
+    Latency percentiles are end to end (upload + generation); output throughput is per
+    generation second, so upload time is reported separately as a mean.
+    """
+    where = []
+    params: list[str] = []
+    if since:
+        where.append("day >= ?")
+        params.append(since)
+    if until:
+        where.append("day <= ?")
+        params.append(until)
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+    # Frame and video runs of one model differ in tokens and latency, so never pool them
+    by_model: dict[tuple[str, str], dict] = {}
+    for model, mode, runs, in_tok, out_tok, cost, elapsed, upload, tokens_with_video, video_seconds in conn.execute(
+        "SELECT model, mode, COUNT(*), SUM(input_tokens), SUM(output_tokens), SUM(cost_usd), SUM(elapsed_seconds),"
+        " AVG(upload_seconds),"
+        " SUM(CASE WHEN video_seconds > 0 AND mode = 'video' THEN input_tokens ELSE 0 END),"
+        " SUM(CASE WHEN video_seconds > 0 AND mode = 'video' THEN video_seconds ELSE 0 END)"
+        f" FROM runs {clause} GROUP BY model, mode ORDER BY model, mode",
+        params,
+    ):
+        by_model[(model, mode)] = {
+            "runs": runs,
+            "input_tokens": in_tok,
+            "output_tokens": out_tok,
+            "cost_usd": round(cost, 6),
+            "mean_upload_seconds": round(upload, 2) if upload is not None else None,
+            "output_tokens_per_second": round(out_tok / elapsed, 2) if elapsed else 0.0,
+            "input_tokens_per_video_second": round(tokens_with_video / video_seconds, 2) if video_seconds else None,
+        }
+
+    # End-to-end latency percentiles: stream rows already sorted by the index, one (model, mode) at a time
+    latencies: list[float] = []
+    current = None
+    for model, mode, seconds in conn.execute(
+        "SELECT model, mode, COALESCE(upload_seconds, 0) + elapsed_seconds"
+        f" FROM runs {clause} ORDER BY model, mode, COALESCE(upload_seconds, 0) + elapsed_seconds",
+        params,
+    ):
+        if (model, mode) != current:
+            if current is not None:
+                by_model[current]["p50_seconds"] = round(percentile(latencies, 50), 2)
+                by_model[current]["p95_seconds"] = round(percentile(latencies, 95), 2)
+            current, latencies = (model, mode), []
+        latencies.append(seconds)
+    if current is not None:
+        by_model[current]["p50_seconds"] = round(percentile(latencies, 50), 2)
+        by_model[current]["p95_seconds"] = round(percentile(latencies, 95), 2)
+
+    by_day = [
+        {"day": day, "runs": runs, "cost_usd": round(cost, 6)}
+        for day, runs, cost in conn.execute(
+            f"SELECT day, COUNT(*), SUM(cost_usd) FROM runs {clause} GROUP BY day ORDER BY day", params
+        )
+    ]
+
+    return {"by_model": by_model, "by_day": by_day}
+
+
+@app.command()
+def query(
+    video_path: Annotated[Path, typer.Argument(help="Path to video file")],
+    query: Annotated[str, typer.Argument(help="Query to ask about the video")],
+    model: Annotated[str, typer.Option(help="Gemini model")] = "gemini-2.5-flash-lite",
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+    stream: Annotated[bool, typer.Option(help="Stream response text as it is generated")] = False,
+    backend: Annotated[str, typer.Option(help="Backend: gemini or fake (offline)", envvar="VIDEO_QUERY_BACKEND")] = "gemini",
+    fake_config: Annotated[str | None, typer.Option(help="Fake backend settings: inline JSON or JSON file", envvar="VIDEO_QUERY_FAKE_CONFIG")] = None,
+    ledger: Annotated[Path | None, typer.Option(help="Usage ledger path (default: $VIDEO_QUERY_LEDGER or XDG data dir)")] = None,
+    no_ledger: Annotated[bool, typer.Option("--no-ledger", help="Do not record this run in the usage ledger")] = False,
+    mode: Annotated[str, typer.Option(help="video (upload) or frames (sampled keyframes sent as images)")] = "video",
+    sample_method: Annotated[str, typer.Option("--sample", help="Frame sampling: scene or interval")] = "scene",
+    interval: Annotated[float, typer.Option(help="Seconds between frames (--sample interval)")] = FrameSampling.interval,
+    scene_threshold: Annotated[float, typer.Option(help="Scene-change score 0-1 (--sample scene)")] = FrameSampling.scene_threshold,
+    max_frames: Annotated[int, typer.Option(help="Maximum frames sent after dedupe")] = FrameSampling.max_frames,
+    frame_size: Annotated[int, typer.Option(help="Longest frame side in pixels")] = FrameSampling.max_size,
+    dedupe_distance: Annotated[int, typer.Option(help="Perceptual-hash bits within which consecutive frames are duplicates")] = FrameSampling.dedupe_distance,
+    frame_cache: Annotated[Path | None, typer.Option(help="Frame cache dir (default: $VIDEO_QUERY_FRAME_CACHE or XDG cache dir)")] = None,
+    compare: Annotated[bool, typer.Option(help="Frames mode: also run the query in video mode and report measured deltas")] = False,
+) -> None:
+    """Query a video using Google Gemini API with native video upload or sampled keyframes."""
+    if mode not in ("video", "frames"):
+        console.print(f"[red]Error:[/red] Unknown mode: {mode} (expected video or frames)")
+        raise typer.Exit(1)
+
+    # Initialize backend (checks API key for gemini)
+    try:
+        video_backend = make_backend(backend, fake_config)
+    except (VideoQueryError, ValueError, OSError) as e:
+        label, detail = (e.label, e.detail) if isinstance(e, VideoQueryError) else ("Error", e)
+        console.print(f"[red]{label}:[/red] {detail}")
+        raise typer.Exit(1)
+
+    # Validate video exists
+    if not video_path.exists():
+        console.print(f"[red]Error:[/red] Video not found: {video_path}")
+        raise typer.Exit(1)
+
+    def print_chunk(text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    on_chunk = print_chunk if stream and not json_output else None
+    ledger_path = ledger or default_ledger_path()
+    frame_set = None
+    comparison = None
+    video_result = None
+    try:
+        if mode == "frames":
+            sampling = FrameSampling(
+                method=sample_method,
+                interval=interval,
+                scene_threshold=scene_threshold,
+                max_frames=max_frames,
+                max_size=frame_size,
+                dedupe_distance=dedupe_distance,
+            )
+            console.print(f"[blue]Sampling frames ({sampling.method}):[/blue] {video_path}")
+            frame_set = extract_frames(video_path, sampling, frame_cache or default_frame_cache_dir())
+            result = run_frames_query(video_backend, frame_set, query, model, on_chunk)
+            frames_seconds = frame_set.extract_seconds + result["elapsed_time"]
+            if compare:
+                video_result = run_query(video_backend, video_path, query, model)
+                baseline = {
+                    "input_tokens": video_result["input_tokens"],
+                    "time_seconds": video_result["upload_time"] + video_result["elapsed_time"],
+                }
+            else:
+                baseline = estimate_video_mode(ledger_path, model, frame_set.video_seconds, query)
+            comparison = {
+                "source": "measured" if compare else "estimate",
+                "video_input_tokens": baseline["input_tokens"],
+                "input_tokens_saved": (
+                    baseline["input_tokens"] - result["input_tokens"] if baseline["input_tokens"] is not None else None
+                ),
+                "video_time_seconds": round(baseline["time_seconds"], 2) if baseline["time_seconds"] is not None else None,
+                "frames_time_seconds": round(frames_seconds, 2),
+                "time_saved_seconds": (
+                    round(baseline["time_seconds"] - frames_seconds, 2) if baseline["time_seconds"] is not None else None
+                ),
+            }
+        else:
+            result = run_query(video_backend, video_path, query, model, on_chunk)
+    except (VideoQueryError, OSError) as e:
+        # OSError: unreadable video or unwritable frame cache
+        label, detail = (e.label, e.detail) if isinstance(e, VideoQueryError) else ("Error", e)
+        console.print(f"[red]{label}:[/red] {detail}")
+        raise typer.Exit(1)
+
+    input_tokens = result["input_tokens"]
+    output_tokens = result["output_tokens"]
+    total_cost = result["total_cost"]
+    elapsed_time = result["elapsed_time"]
+
+    # Record usage (a --compare video run too: it feeds later video-mode estimates)
+    if not no_ledger:
+        now = datetime.now(timezone.utc)
+        runs = [(mode, result)] + ([("video", video_result)] if video_result is not None else [])
+        for run_mode, run in runs:
+            record_usage(ledger_path, {
+                "ts": now.isoformat(timespec="seconds"),
+                "day": now.date().isoformat(),
+                "model": model,
+                "video_path": str(video_path),
+                "video_bytes": video_path.stat().st_size,
+                "video_seconds": run["video_seconds"],
+                "input_tokens": run["input_tokens"],
+                "output_tokens": run["output_tokens"],
+                "cost_usd": run["total_cost"],
+                "upload_seconds": run["upload_time"],
+                "elapsed_seconds": run["elapsed_time"],
+                "mode": run_mode,
+            })
 
     # Output result
     if json_output:
-        result = {
+        output = {
             "video_path": str(video_path),
             "query": query,
             "model": model,
-            "response": response_text,
+            "mode": mode,
+            "response": result["response"],
             "usage": {
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
                 "total_tokens": input_tokens + output_tokens,
             },
             "cost": {
-                "input_cost_usd": round(input_cost, 6),
-                "output_cost_usd": round(output_cost, 6),
+                "input_cost_usd": round(result["input_cost"], 6),
+                "output_cost_usd": round(result["output_cost"], 6),
                 "total_cost_usd": round(total_cost, 6),
             },
             "time_seconds": round(elapsed_time, 2),
         }
-        print(json.dumps(result, indent=2))
+        if frame_set is not None:
+            output["frames"] = {
+                "sampling": sample_method,
+                "extracted": frame_set.extracted,
+                "kept": len(frame_set.frames),
+                "cached": frame_set.cached,
+                "extract_seconds": round(frame_set.extract_seconds, 2),
+                "timestamps": [f.timestamp for f in frame_set.frames],
+            }
+            output["comparison"] = comparison
+        print(json.dumps(output, indent=2))
     else:
-        print(response_text)
+        if on_chunk is None:
+            print(result["response"])
+        else:
+            print()
         console.print(f"\n[dim]Tokens: {input_tokens:,} in / {output_tokens:,} out | Cost: ${total_cost:.6f} | Time: {elapsed_time:.2f}s[/dim]")
+        if frame_set is not None:
+            cached = " (cached)" if frame_set.cached else ""
+            line = f"Frames: {len(frame_set.frames)} kept of {frame_set.extracted} sampled{cached}"
+            if comparison["input_tokens_saved"] is not None:
+                line += f" | vs video ({comparison['source']}): {comparison['input_tokens_saved']:,} tokens saved"
+            if comparison["time_saved_seconds"] is not None:
+                line += f", {comparison['time_saved_seconds']:.2f}s saved"
+            console.print(f"[dim]{line}[/dim]")
+
+
+@app.command()
+def report(
+    ledger: Annotated[Path | None, typer.Option(help="Usage ledger path (default: $VIDEO_QUERY_LEDGER or XDG data dir)")] = None,
+    since: Annotated[str | None, typer.Option(help="First day to include (YYYY-MM-DD)")] = None,
+    until: Annotated[str | None, typer.Option(help="Last day to include (YYYY-MM-DD)")] = None,
+    json_output: Annotated[bool, typer.Option("--json", help="Output as JSON")] = False,
+) -> None:
+    """Aggregate recorded usage: end-to-end latency, throughput and spend by model, mode and day."""
+    ledger_path = ledger or default_ledger_path()
+    if not ledger_path.exists():
+        console.print(f"[red]Error:[/red] No usage ledger at {ledger_path}")
+        raise typer.Exit(1)
+
+    try:
+        with closing(open_ledger(ledger_path)) as conn:
+            summary = summarize_ledger(conn, since, until)
+    except (sqlite3.Error, OSError) as e:
+        console.print(f"[red]Error:[/red] Could not read usage ledger {ledger_path}: {e}")
+        raise typer.Exit(1)
+
+    if json_output:
+        by_model = [{"model": model, "mode": mode, **stats} for (model, mode), stats in summary["by_model"].items()]
+        print(json.dumps({**summary, "by_model": by_model}, indent=2))
+        return
+
+    out = Console()
+    models = Table(title="Usage by model")
+    columns = (
+        "Model", "Mode", "Runs", "p50 e2e (s)", "p95 e2e (s)", "Upload avg (s)", "Out tok/gen s", "In tok/video s",
+        "Tokens in/out", "Cost (USD)",
+    )
+    for column in columns:
+        models.add_column(column, justify="left" if column in ("Model", "Mode") else "right")
+    for (model, mode), stats in summary["by_model"].items():
+        per_video_second = stats["input_tokens_per_video_second"]
+        upload = stats["mean_upload_seconds"]
+        models.add_row(
+            model,
+            mode,
+            f"{stats['runs']:,}",
+            f"{stats['p50_seconds']:.2f}",
+            f"{stats['p95_seconds']:.2f}",
+            f"{upload:.2f}" if upload is not None else "-",
+            f"{stats['output_tokens_per_second']:.1f}",
+            f"{per_video_second:.1f}" if per_video_second is not None else "-",
+            f"{stats['input_tokens']:,} / {stats['output_tokens']:,}",
+            f"${stats['cost_usd']:.4f}",
+        )
+    out.print(models)
+
+    days = Table(title="Spend by day")
+    days.add_column("Day")
+    days.add_column("Runs", justify="right")
+    days.add_column("Cost (USD)", justify="right")
+    for day in summary["by_day"]:
+        days.add_row(day["day"], f"{day['runs']:,}", f"${day['cost_usd']:.4f}")
+    out.print(days)
+
+
+def _default_to_query(argv: list[str]) -> list[str]:
+    """Keep `video_query.py <video> <query>` working by defaulting to the query subcommand."""
+    commands = {"query", "report"}
+    if len(argv) > 1 and argv[1] not in commands and argv[1] not in ("--help", "-h", "--install-completion", "--show-completion"):
+        return [argv[0], "query", *argv[1:]]
+    return argv
 
 
 if __name__ == "__main__":
+    sys.argv = _default_to_query(sys.argv)
     app()
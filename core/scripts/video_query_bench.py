@@ -0,0 +1,229 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = [
+#   "python-dotenv>=1.0",
+#   "typer>=0.9",
+#   "rich>=13.0",
+# ]
+# requires-python = ">=3.12"
+# ///
+"""Benchmark video_query.py offline against the fake backend (CLI overhead and concurrency)."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+VIDEO_QUERY = SCRIPT_DIR / "video_query.py"
+REPO_ROOT = SCRIPT_DIR.parent.parent
+
+# Fake backend with every latency zeroed: wall time is pure CLI overhead
+ZERO_LATENCY = {
+    "poll_interval": 0,
+    "upload_seconds": 0,
+    "processing_seconds": 0,
+    "ttft_seconds": 0,
+    "tokens_per_second": 0,
+}
+
+app = typer.Typer(help="Benchmark video_query.py offline using the fake backend.")
+console = Console(stderr=True)
+
+
+def load_video_query() -> object:
+    """Import video_query.py as a module (for in-process timing)."""
+    spec = importlib.util.spec_from_file_location("video_query", VIDEO_QUERY)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["video_query"] = module  # dataclasses resolve annotations via sys.modules
+    spec.loader.exec_module(module)
+    return module
+
+
+def summarize(values: list[float]) -> dict:
+    """p50/p95/mean/max of a list of durations (seconds)."""
+    ordered = sorted(values)
+    p95_index = max(0, round(0.95 * len(ordered)) - 1)
+    return {
+        "n": len(ordered),
+        "p50": round(statistics.median(ordered), 4),
+        "p95": round(ordered[p95_index], 4),
+        "mean": round(statistics.fmean(ordered), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def run_cli(runner: list[str], video: Path, fake_config: dict, ledger: Path) -> tuple[float, dict]:
+    """Invoke the CLI once with the fake backend. Returns (wall seconds, parsed JSON output)."""
+    cmd = [
+        *runner, str(VIDEO_QUERY), "query", str(video), "benchmark query",
+        "--backend", "fake", "--fake-config", json.dumps(fake_config),
+        "--ledger", str(ledger), "--json",
+    ]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"video_query.py exited with {result.returncode}: {result.stderr.strip()}")
+    return wall, json.loads(result.stdout)
+
+
+def git_revision() -> str | None:
+    """Short git SHA of the agentic-config checkout, if available."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(REPO_ROOT), "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=False,
+        )
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_comparison(current: dict, baseline: dict) -> None:
+    """Print deltas between this run and a previously saved result."""
+    table = Table(title=f"Comparison vs {baseline.get('version')} ({baseline.get('git_sha')})")
+    table.add_column("Metric")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Delta", justify="right")
+
+    def add(metric: str, old: float | None, new: float | None) -> None:
+        if old is None or new is None:
+            return
+        delta = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+        table.add_row(metric, f"{old:.4f}", f"{new:.4f}", delta)
+
+    add("CLI overhead p50 (s)", baseline["overhead"]["cli"]["p50"], current["overhead"]["cli"]["p50"])
+    add("Startup p50 (s)", baseline["overhead"].get("startup_p50"), current["overhead"].get("startup_p50"))
+    old_sweep = {row["concurrency"]: row for row in baseline.get("sweep", [])}
+    for row in current["sweep"]:
+        old = old_sweep.get(row["concurrency"])
+        if old:
+            add(f"videos/min @ {row['concurrency']}", old["videos_per_min"], row["videos_per_min"])
+    Console().print(table)
+
+
+@app.command()
+def main(
+    repeat: Annotated[int, typer.Option(help="Sequential runs for the overhead phase")] = 10,
+    videos: Annotated[int, typer.Option(help="Videos per concurrency level")] = 16,
+    concurrency: Annotated[str, typer.Option(help="Comma-separated concurrency levels")] = "1,2,4,8",
+    fake_config: Annotated[str | None, typer.Option(help="Fake backend profile for the sweep: inline JSON or JSON file")] = None,
+    video_mb: Annotated[float, typer.Option(help="Size of the generated dummy video (MB)")] = 5.0,
+    runner: Annotated[str, typer.Option(help="Command used to run video_query.py (default: this interpreter)")] = "",
+    output: Annotated[Path | None, typer.Option(help="Results file (default: outputs/bench/video_query-<version>-<timestamp>.json)")] = None,
+    compare: Annotated[Path | None, typer.Option(help="Previous results file to compare against")] = None,
+) -> None:
+    """Measure CLI overhead and videos/min against concurrency, then save results."""
+    video_query = load_video_query()
+    runner_cmd = runner.split() if runner else [sys.executable]
+    levels = [int(level) for level in concurrency.split(",") if level.strip()]
+    sweep_config = video_query.load_fake_config(fake_config)
+    version = (REPO_ROOT / "VERSION").read_text().strip() if (REPO_ROOT / "VERSION").exists() else "unknown"
+
+    with tempfile.TemporaryDirectory(prefix="video-query-bench-") as tmp:
+        tmp_dir = Path(tmp)
+        video = tmp_dir / "dummy.mp4"
+        video.write_bytes(b"\0" * int(video_mb * 1_000_000))
+        ledger = tmp_dir / "ledger.sqlite"
+
+        # Phase 1: overhead (zero-latency backend)
+        console.print(f"[blue]Overhead:[/blue] {repeat} sequential CLI runs")
+        zero_config = {**sweep_config, **ZERO_LATENCY}
+        cli_walls = [run_cli(runner_cmd, video, zero_config, ledger)[0] for _ in range(repeat)]
+
+        backend = video_query.FakeBackend(zero_config)
+        in_process = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            video_query.run_query(backend, video, "benchmark query", "gemini-2.5-flash-lite")
+            in_process.append(time.perf_counter() - start)
+
+        overhead = {
+            "cli": summarize(cli_walls),
+            "in_process": summarize(in_process),
+            # Interpreter start + imports + ledger write, i.e. everything outside run_query
+            "startup_p50": round(statistics.median(cli_walls) - statistics.median(in_process), 4),
+        }
+
+        # Phase 2: concurrency sweep (simulated latency profile)
+        sweep = []
+        for level in levels:
+            console.print(f"[blue]Sweep:[/blue] {videos} videos at concurrency {level}")
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                runs = list(pool.map(lambda _: run_cli(runner_cmd, video, sweep_config, ledger), range(videos)))
+            wall = time.perf_counter() - start
+            walls = [run_wall for run_wall, _ in runs]
+            model_times = [result["time_seconds"] for _, result in runs]
+            sweep.append({
+                "concurrency": level,
+                "videos": videos,
+                "wall_seconds": round(wall, 3),
+                "videos_per_min": round(videos / wall * 60, 2),
+                "run_seconds": summarize(walls),
+                "generation_seconds": summarize(model_times),
+            })
+
+    results = {
+        "tool": "video_query",
+        "version": version,
+        "git_sha": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runner": runner_cmd,
+        "video_mb": video_mb,
+        "fake_config": sweep_config,
+        "overhead": overhead,
+        "sweep": sweep,
+    }
+
+    # Report
+    out = Console()
+    table = Table(title="CLI overhead (zero-latency backend)")
+    for column in ("Measure", "p50 (s)", "p95 (s)", "max (s)"):
+        table.add_column(column, justify="left" if column == "Measure" else "right")
+    for name, stats in (("CLI wall", overhead["cli"]), ("run_query in-process", overhead["in_process"])):
+        table.add_row(name, f"{stats['p50']:.4f}", f"{stats['p95']:.4f}", f"{stats['max']:.4f}")
+    out.print(table)
+    out.print(f"Startup + teardown (p50): {overhead['startup_p50']:.4f}s")
+
+    table = Table(title="Throughput vs concurrency")
+    for column in ("Concurrency", "Videos/min", "Run p50 (s)", "Run p95 (s)"):
+        table.add_column(column, justify="right")
+    for row in sweep:
+        table.add_row(
+            str(row["concurrency"]),
+            f"{row['videos_per_min']:.1f}",
+            f"{row['run_seconds']['p50']:.2f}",
+            f"{row['run_seconds']['p95']:.2f}",
+        )
+    out.print(table)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output_path = output or Path("outputs/bench") / f"video_query-{version}-{stamp}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2) + "\n")
+    console.print(f"[green]Saved:[/green] {output_path}")
+
+    if compare:
+        print_comparison(results, json.loads(compare.read_text()))
+
+
+if __name__ == "__main__":
+    app()
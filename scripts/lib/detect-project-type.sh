@@ -1,142 +1,223 @@
 #!/usr/bin/env bash
 # Detects project type based on presence of configuration files
-
-detect_project_type() {
+#
+# Each manifest is read once (pure bash, no grep forks) and every marker is
+# checked in that scan. Results are cached per directory, keyed by the manifest
+# paths, mtimes and sizes, so repeat runs skip re-parsing unchanged projects.
+#
+# Cache file: $AGENTIC_DETECT_CACHE (default: ${XDG_CACHE_HOME:-~/.cache}/agentic/project-type.cache)
+# Set AGENTIC_DETECT_CACHE=off to disable caching.
+
+# Manifests that influence detection (requirements*.txt is globbed separately)
+DETECT_MANIFESTS=(bun.lockb package.json pyproject.toml uv.lock setup.py setup.cfg Cargo.toml go.mod)
+
+# Scan a directory's manifests once and classify it
+# Usage: _detect_scan <dir>
+# Sets: _DETECT_TYPE, _DETECT_TYPE_CHECKER, _DETECT_LINTER
+_detect_scan() {
   local target_path="$1"
+  local package_json="" pyproject="" setup_cfg="" req_content="" req_file
+  local type_checker="" linter=""
 
-  # Bun indicators (check before typescript for specificity)
-  if [[ -f "$target_path/bun.lockb" ]]; then
-    echo "ts-bun"
-    return 0
-  fi
-
-  # TypeScript/Node.js indicators
-  if [[ -f "$target_path/package.json" ]]; then
-    local pkg_content=$(cat "$target_path/package.json" 2>/dev/null || echo "")
-    if echo "$pkg_content" | grep -q "typescript\|@types"; then
-      echo "typescript"
-      return 0
-    fi
-  fi
-
-  # Python indicators (prefer poetry over uv over pip)
-  if [[ -f "$target_path/pyproject.toml" ]]; then
-    local pyproject_content=$(cat "$target_path/pyproject.toml" 2>/dev/null || echo "")
-    if echo "$pyproject_content" | grep -q "\[tool.poetry\]"; then
-      echo "python-poetry"
-      return 0
-    fi
-  fi
-
-  # Python UV indicators (check before falling back to pip)
-  if [[ -f "$target_path/uv.lock" ]]; then
-    echo "python-uv"
-    return 0
-  fi
+  [[ -f "$target_path/package.json" ]] && { IFS= read -r -d '' package_json < "$target_path/package.json" || true; }
+  [[ -f "$target_path/pyproject.toml" ]] && { IFS= read -r -d '' pyproject < "$target_path/pyproject.toml" || true; }
+  [[ -f "$target_path/setup.cfg" ]] && { IFS= read -r -d '' setup_cfg < "$target_path/setup.cfg" || true; }
 
-  # Check pyproject.toml for uv markers
-  if [[ -f "$target_path/pyproject.toml" ]]; then
-    local pyproject_content=$(cat "$target_path/pyproject.toml" 2>/dev/null || echo "")
-    if echo "$pyproject_content" | grep -q "\[tool.uv\]"; then
-      echo "python-uv"
-      return 0
-    fi
-  fi
-
-  if [[ -f "$target_path/requirements.txt" ]] || [[ -f "$target_path/setup.py" ]] || [[ -f "$target_path/setup.cfg" ]]; then
-    echo "python-pip"
-    return 0
+  # Project type (priority: bun > typescript > poetry > uv > pip > rust > go > generic)
+  if [[ -f "$target_path/bun.lockb" ]]; then
+    _DETECT_TYPE="ts-bun"
+  elif [[ "$package_json" == *typescript* || "$package_json" == *@types* ]]; then
+    _DETECT_TYPE="typescript"
+  elif [[ "$pyproject" == *"[tool.poetry]"* ]]; then
+    _DETECT_TYPE="python-poetry"
+  elif [[ -f "$target_path/uv.lock" || "$pyproject" == *"[tool.uv]"* ]]; then
+    _DETECT_TYPE="python-uv"
+  elif [[ -f "$target_path/requirements.txt" || -f "$target_path/setup.py" || -f "$target_path/setup.cfg" ]]; then
+    _DETECT_TYPE="python-pip"
+  elif [[ -f "$target_path/Cargo.toml" ]]; then
+    _DETECT_TYPE="rust"
+  elif [[ -f "$target_path/go.mod" ]]; then
+    _DETECT_TYPE="go"
+  else
+    _DETECT_TYPE="generic"
   fi
 
-  # Rust indicators
-  if [[ -f "$target_path/Cargo.toml" ]]; then
-    echo "rust"
-    return 0
+  # Python tooling (priority: pyproject.toml > setup.cfg > requirements*.txt > defaults)
+  if [[ "$pyproject" == *"[tool.pyright]"* ]]; then
+    type_checker="pyright"
+  elif [[ "$pyproject" == *"[tool.mypy]"* ]]; then
+    type_checker="mypy"
   fi
-
-  # Go indicators
-  if [[ -f "$target_path/go.mod" ]]; then
-    echo "go"
-    return 0
+  if [[ "$pyproject" == *"[tool.ruff]"* ]]; then
+    linter="ruff"
+  elif [[ "$pyproject" == *"[tool.pylint]"* ]]; then
+    linter="pylint"
   fi
 
-  # Default to generic
-  echo "generic"
-  return 0
-}
-
-# Detect Python tooling (type checker and linter) from project config files
-# Returns: TYPE_CHECKER=<pyright|mypy> LINTER=<ruff|pylint>
-# Priority: pyproject.toml > setup.cfg > requirements*.txt > defaults
-detect_python_tooling() {
-  local target_path="$1"
-  local type_checker=""
-  local linter=""
-
-  # Check pyproject.toml for [tool.*] sections
-  if [[ -f "$target_path/pyproject.toml" ]]; then
-    local pyproject_content
-    pyproject_content=$(cat "$target_path/pyproject.toml" 2>/dev/null || echo "")
-
-    # Type checker detection
-    if echo "$pyproject_content" | grep -q '\[tool\.pyright\]'; then
-      type_checker="pyright"
-    elif echo "$pyproject_content" | grep -q '\[tool\.mypy\]'; then
-      type_checker="mypy"
-    fi
-
-    # Linter detection
-    if echo "$pyproject_content" | grep -q '\[tool\.ruff\]'; then
-      linter="ruff"
-    elif echo "$pyproject_content" | grep -q '\[tool\.pylint\]'; then
-      linter="pylint"
-    fi
-  fi
+  [[ -z "$type_checker" && $'\n'"$setup_cfg" == *$'\n[mypy'* ]] && type_checker="mypy"
+  [[ -z "$linter" && $'\n'"$setup_cfg" == *$'\n[pylint'* ]] && linter="pylint"
 
-  # Check setup.cfg if not found in pyproject.toml
-  if [[ -f "$target_path/setup.cfg" ]]; then
-    local setup_cfg_content
-    setup_cfg_content=$(cat "$target_path/setup.cfg" 2>/dev/null || echo "")
+  # Package names must start a line and not be a prefix of a longer name
+  local re_pyright=$'(^|\n)pyright([^a-zA-Z]|$)' re_mypy=$'(^|\n)mypy([^a-zA-Z]|$)'
+  local re_ruff=$'(^|\n)ruff([^a-zA-Z]|$)' re_pylint=$'(^|\n)pylint([^a-zA-Z]|$)'
+  for req_file in "$target_path/requirements"*.txt; do
+    [[ -f "$req_file" ]] || continue
+    [[ -n "$type_checker" && -n "$linter" ]] && break
+    req_content=""
+    IFS= read -r -d '' req_content < "$req_file" || true
 
     if [[ -z "$type_checker" ]]; then
-      if echo "$setup_cfg_content" | grep -q '^\[mypy'; then
+      if [[ "$req_content" =~ $re_pyright ]]; then
+        type_checker="pyright"
+      elif [[ "$req_content" =~ $re_mypy ]]; then
         type_checker="mypy"
       fi
     fi
-
     if [[ -z "$linter" ]]; then
-      if echo "$setup_cfg_content" | grep -q '^\[pylint'; then
+      if [[ "$req_content" =~ $re_ruff ]]; then
+        linter="ruff"
+      elif [[ "$req_content" =~ $re_pylint ]]; then
         linter="pylint"
       fi
     fi
-  fi
+  done
 
-  # Check requirements*.txt for package presence
-  for req_file in "$target_path/requirements"*.txt; do
-    [[ ! -f "$req_file" ]] && continue
-    local req_content
-    req_content=$(cat "$req_file" 2>/dev/null || echo "")
+  _DETECT_TYPE_CHECKER="${type_checker:-pyright}"
+  _DETECT_LINTER="${linter:-ruff}"
+}
 
-    if [[ -z "$type_checker" ]]; then
-      if echo "$req_content" | grep -qE '^pyright[^a-zA-Z]|^pyright$'; then
-        type_checker="pyright"
-      elif echo "$req_content" | grep -qE '^mypy[^a-zA-Z]|^mypy$'; then
-        type_checker="mypy"
+# Print "mtime:size" for each file, one per line (single stat call, GNU or BSD)
+# Usage: _detect_stat <file>...
+_detect_stat() {
+  [[ $# -eq 0 ]] && return 0
+  stat -c '%Y:%s' -- "$@" 2>/dev/null || stat -f '%m:%z' -- "$@" 2>/dev/null
+}
+
+# Detect project type and Python tooling for one or more directories
+# Usage: detect_project_batch <dir>...
+# Sets: _DETECT_RESULTS (one "type|type_checker|linter" per dir, in argument order)
+detect_project_batch() {
+  local dirs=() dir name
+  for dir in "$@"; do
+    [[ "$dir" != /* ]] && dir="$PWD/$dir"
+    dirs+=("${dir%/}")
+  done
+  _DETECT_RESULTS=()
+
+  # Collect present manifests for every directory, then stat them all at once
+  local files=() names=() owners=() idx=0
+  for dir in "${dirs[@]}"; do
+    for name in "${DETECT_MANIFESTS[@]}"; do
+      if [[ -f "$dir/$name" ]]; then
+        files+=("$dir/$name"); names+=("$name"); owners+=("$idx")
       fi
+    done
+    for name in "$dir/requirements"*.txt; do
+      if [[ -f "$name" ]]; then
+        files+=("$name"); names+=("${name##*/}"); owners+=("$idx")
+      fi
+    done
+    ((idx++)) || true
+  done
+
+  local stats=() line
+  while IFS= read -r line; do
+    stats+=("$line")
+  done < <(_detect_stat ${files[@]+"${files[@]}"})
+
+  # Cache key per directory: "-name=mtime:size;..." ("?" if stat failed)
+  local keys=() j
+  for ((idx = 0; idx < ${#dirs[@]}; idx++)); do
+    keys+=("-")
+  done
+  for ((j = 0; j < ${#files[@]}; j++)); do
+    idx="${owners[$j]}"
+    if [[ ${#stats[@]} -eq ${#files[@]} ]]; then
+      keys[$idx]+="${names[$j]}=${stats[$j]};"
+    else
+      keys[$idx]="?"
     fi
+  done
 
-    if [[ -z "$linter" ]]; then
-      if echo "$req_content" | grep -qE '^ruff[^a-zA-Z]|^ruff$'; then
-        linter="ruff"
-      elif echo "$req_content" | grep -qE '^pylint[^a-zA-Z]|^pylint$'; then
-        linter="pylint"
+  # Load cache entries: dir<TAB>key<TAB>type|type_checker|linter
+  local cache_file="${AGENTIC_DETECT_CACHE:-${XDG_CACHE_HOME:-${HOME:-/tmp}/.cache}/agentic/project-type.cache}"
+  local cache_dirs=() cache_keys=() cache_values=() c_dir c_key c_value
+  [[ "$cache_file" == "off" ]] && cache_file=""
+  if [[ -n "$cache_file" && -f "$cache_file" ]]; then
+    while IFS=$'\t' read -r c_dir c_key c_value; do
+      [[ -n "$c_dir" && -n "$c_value" ]] || continue
+      cache_dirs+=("$c_dir"); cache_keys+=("$c_key"); cache_values+=("$c_value")
+    done < "$cache_file"
+  fi
+
+  local dirty=false hit k
+  for ((idx = 0; idx < ${#dirs[@]}; idx++)); do
+    dir="${dirs[$idx]}"
+    hit=""
+    for ((k = 0; k < ${#cache_dirs[@]}; k++)); do
+      [[ "${cache_dirs[$k]}" == "$dir" ]] || continue
+      [[ "${keys[$idx]}" != "?" && "${cache_keys[$k]}" == "${keys[$idx]}" ]] && hit="${cache_values[$k]}"
+      break
+    done
+
+    if [[ -z "$hit" ]]; then
+      _detect_scan "$dir"
+      hit="$_DETECT_TYPE|$_DETECT_TYPE_CHECKER|$_DETECT_LINTER"
+      if [[ "${keys[$idx]}" != "?" ]]; then
+        dirty=true
+        if [[ $k -lt ${#cache_dirs[@]} ]]; then
+          cache_keys[$k]="${keys[$idx]}"; cache_values[$k]="$hit"
+        else
+          cache_dirs+=("$dir"); cache_keys+=("${keys[$idx]}"); cache_values+=("$hit")
+        fi
       fi
     fi
+    _DETECT_RESULTS+=("$hit")
   done
 
-  # Apply defaults for any undetected tooling
-  [[ -z "$type_checker" ]] && type_checker="pyright"
-  [[ -z "$linter" ]] && linter="ruff"
+  # Rewrite cache atomically, dropping entries for directories that no longer exist
+  if [[ "$dirty" == true && -n "$cache_file" ]]; then
+    [[ -d "${cache_file%/*}" ]] || mkdir -p "${cache_file%/*}" 2>/dev/null || return 0
+    {
+      for ((k = 0; k < ${#cache_dirs[@]}; k++)); do
+        if [[ -d "${cache_dirs[$k]}" ]]; then
+          printf '%s\t%s\t%s\n' "${cache_dirs[$k]}" "${cache_keys[$k]}" "${cache_values[$k]}"
+        fi
+      done
+    } > "$cache_file.$$" 2>/dev/null && mv -f "$cache_file.$$" "$cache_file" 2>/dev/null
+    [[ -f "$cache_file.$$" ]] && rm -f "$cache_file.$$"
+  fi
+  return 0
+}
+
+# Detect project types for many directories in one call
+# Usage: detect_project_types <dir>...
+# Output: "<type><TAB><dir>" per directory
+detect_project_types() {
+  detect_project_batch "$@"
+  local idx=0 dir
+  for dir in "$@"; do
+    printf '%s\t%s\n' "${_DETECT_RESULTS[$idx]%%|*}" "$dir"
+    ((idx++)) || true
+  done
+}
+
+# Usage: detect_project_type <dir>
+detect_project_type() {
+  local target_path="$1"
+
+  detect_project_batch "$target_path"
+  echo "${_DETECT_RESULTS[0]%%|*}"
+  return 0
+}
+
+# Detect Python tooling (type checker and linter) from project config files
+# Returns: TYPE_CHECKER=<pyright|mypy> LINTER=<ruff|pylint>
+# Priority: pyproject.toml > setup.cfg > requirements*.txt > defaults
+detect_python_tooling() {
+  local target_path="$1"
 
-  echo "TYPE_CHECKER=$type_checker LINTER=$linter"
+  detect_project_batch "$target_path"
+  local tooling="${_DETECT_RESULTS[0]#*|}"
+  echo "TYPE_CHECKER=${tooling%|*} LINTER=${tooling#*|}"
 }
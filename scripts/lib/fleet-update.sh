@@ -0,0 +1,180 @@
+#!/usr/bin/env bash
+# Fleet update: runs update-config.sh across all registered installations
+# Reads the central registry written by register_installation (version-manager.sh)
+# and updates projects concurrently with a bounded worker pool.
+#
+# Requires: REPO_ROOT, LATEST_VERSION, check_version (version-manager.sh)
+
+# Load shared locking, clock and version comparison helpers
+if ! declare -f _acquire_lock >/dev/null 2>&1; then
+  source "$REPO_ROOT/core/lib/agentic-root.sh"
+fi
+
+# List unique project paths from the installation registry
+# Usage: list_registered_installations [registry_file]
+list_registered_installations() {
+  local registry_file="${1:-$REPO_ROOT/.installations.json}"
+
+  if [[ ! -f "$registry_file" ]]; then
+    echo "ERROR: No installation registry at $registry_file" >&2
+    return 1
+  fi
+  if ! command -v jq &>/dev/null; then
+    echo "ERROR: jq required to read installation registry" >&2
+    return 1
+  fi
+
+  jq -r '[.installations[]?.path] | unique | .[]' "$registry_file"
+}
+
+# Update a single project under its lock and record the outcome
+# Usage: _fleet_update_one <index> <project> <work_dir> [update-config.sh args...]
+# Writes: <work_dir>/result.<index> as "status|from|to|duration_ms"
+_fleet_update_one() {
+  local index="$1"
+  local project="$2"
+  local work_dir="$3"
+  shift 3
+
+  local start status from to
+  start=$(_now_ms)
+  # Same path form update-config.sh resolves, so it recognizes the lock held for it
+  project=$(cd "$project" && pwd) || project="$2"
+  from=$(check_version "$project")
+  to="$from"
+
+  if ! _acquire_lock "$project/.agentic-lock" 30 2>>"$work_dir/log.$index"; then
+    status="locked"
+  else
+    if AGENTIC_UPDATE_LOCK_HELD="$project/.agentic-lock" \
+        bash "$REPO_ROOT/scripts/update-config.sh" "$@" "$project" >>"$work_dir/log.$index" 2>&1; then
+      status="updated"
+    else
+      status="failed"
+    fi
+    _release_lock "$project/.agentic-lock"
+    to=$(check_version "$project")
+  fi
+
+  echo "$status|$from|$to|$(( $(_now_ms) - start ))" > "$work_dir/result.$index"
+}
+
+# Update all registered installations concurrently
+# Usage: update_fleet <jobs> [update-config.sh args...]
+#   Projects already at LATEST_VERSION are skipped unless --force or --nightly is passed
+# Returns: 0 if no project failed, 1 otherwise
+update_fleet() {
+  local jobs="${1:-4}"
+  shift
+  local update_args=("$@")
+  local force_all=false
+  local arg
+  for arg in "${update_args[@]}"; do
+    [[ "$arg" == "--force" || "$arg" == "--nightly" ]] && force_all=true
+  done
+
+  if [[ ! "$jobs" =~ ^[1-9][0-9]*$ ]]; then
+    echo "ERROR: --jobs must be a positive integer: $jobs" >&2
+    return 1
+  fi
+
+  local projects=()
+  local project
+  while IFS= read -r project; do
+    [[ -n "$project" ]] && projects+=("$project")
+  done < <(list_registered_installations) || return 1
+
+  if [[ ${#projects[@]} -eq 0 ]]; then
+    echo "No registered installations found"
+    return 0
+  fi
+
+  echo "Fleet update: ${#projects[@]} registered installation(s), $jobs worker(s)"
+  echo "   Latest version: $LATEST_VERSION"
+
+  # Persist global path once up front so workers only hit the idempotent path
+  persist_agentic_path "$REPO_ROOT" >/dev/null 2>&1 || true
+
+  local work_dir
+  work_dir=$(mktemp -d) || {
+    echo "ERROR: Failed to create work directory" >&2
+    return 1
+  }
+
+  local fleet_start
+  fleet_start=$(_now_ms)
+  local pids=()
+  local idx=0  # Not "i": compare_versions uses a global loop counter
+  for project in "${projects[@]}"; do
+    # Pre-filter without spawning a worker: missing projects and up-to-date versions
+    if [[ ! -f "$project/.agentic-config.json" ]]; then
+      echo "missing|none|none|0" > "$work_dir/result.$idx"
+    elif [[ "$force_all" != true ]]; then
+      local current cmp=0
+      current=$(check_version "$project")
+      compare_versions "$current" "$LATEST_VERSION" || cmp=$?
+      if [[ "$current" != "none" && $cmp -ne 2 ]]; then
+        echo "skipped|$current|$current|0" > "$work_dir/result.$idx"
+      fi
+    fi
+
+    if [[ ! -f "$work_dir/result.$idx" ]]; then
+      # Bounded pool: wait for a free slot (portable, no wait -n)
+      while [[ ${#pids[@]} -ge $jobs ]]; do
+        local alive=() pid
+        for pid in "${pids[@]}"; do
+          if kill -0 "$pid" 2>/dev/null; then
+            alive+=("$pid")
+          else
+            wait "$pid" 2>/dev/null || true
+          fi
+        done
+        pids=("${alive[@]+"${alive[@]}"}")
+        [[ ${#pids[@]} -ge $jobs ]] && sleep 0.1
+      done
+
+      _fleet_update_one "$idx" "$project" "$work_dir" "${update_args[@]+"${update_args[@]}"}" &
+      pids+=("$!")
+    fi
+    ((idx++)) || true
+  done
+
+  local pid
+  for pid in "${pids[@]+"${pids[@]}"}"; do
+    wait "$pid" 2>/dev/null || true
+  done
+  local fleet_ms=$(( $(_now_ms) - fleet_start ))
+
+  # Summary table
+  local updated=0 skipped=0 missing=0 failed=0
+  echo ""
+  printf "%-10s %-17s %10s  %s\n" "STATUS" "VERSION" "DURATION" "PROJECT"
+  idx=0
+  for project in "${projects[@]}"; do
+    local status from to ms
+    IFS='|' read -r status from to ms < "$work_dir/result.$idx"
+    local version="$from"
+    [[ "$from" != "$to" ]] && version="$from -> $to"
+    printf "%-10s %-17s %9.1fs  %s\n" "$status" "$version" "$(( ms / 1000 )).$(( ms % 1000 / 100 ))" "$project"
+    case "$status" in
+      updated) ((updated++)) || true ;;
+      skipped) ((skipped++)) || true ;;
+      missing) ((missing++)) || true ;;
+      *)
+        ((failed++)) || true
+        [[ -f "$work_dir/log.$idx" ]] && echo "           log: $work_dir/log.$idx"
+        ;;
+    esac
+    ((idx++)) || true
+  done
+
+  echo ""
+  echo "Fleet update complete in $(( fleet_ms / 1000 )).$(( fleet_ms % 1000 / 100 ))s: $updated updated, $skipped skipped, $missing missing, $failed failed"
+
+  if [[ $failed -gt 0 ]]; then
+    echo "Logs kept in: $work_dir"
+    return 1
+  fi
+  rm -rf "$work_dir"
+  return 0
+}
@@ -0,0 +1,469 @@
+#!/usr/bin/env bash
+# Install manifest: records what setup/update installed into a project
+#
+# Stored as "manifest" in .agentic-config.json (alongside the symlinks/copied lists):
+#   "manifest": {
+#     "source": "<agentic-config root the entries point to>",
+#     "mode": "symlink|copy",
+#     "links":  { "<relative path>": "<link target>", ... },
+#     "copies": { "<relative path>": "sha256:<hex>" | "dir", ... }
+#   }
+#
+# update-config.sh diffs the expected layout against the manifest and the filesystem
+# (pure bash, no forks; copy mode adds one hashing call) and only touches entries
+# that changed, so an unchanged project is verified without rescanning or rewriting
+# anything. Copies whose content no longer matches the recorded hash were edited
+# locally and are never overwritten or pruned.
+#
+# Requires: REPO_ROOT
+
+# Directories whose entries are fully managed (expected set derived from core/)
+MANIFEST_MANAGED_DIRS=(".claude/commands" ".claude/skills" ".claude/hooks/pretooluse")
+
+# Optional entries created by setup (tracked once present, restored if deleted)
+# Format: "<relative path>|<source relative to REPO_ROOT>"
+MANIFEST_EXTRAS=(
+  "agents|core/agents"
+  ".agent/workflows/spec.md|core/agents/spec-command.md"
+  ".gemini/commands/spec.toml|core/commands/gemini/spec.toml"
+  ".gemini/commands/spec|core/commands/gemini/spec"
+  ".codex/prompts/spec.md|core/commands/codex/spec.md"
+)
+
+# Rendered templates tracked by content hash
+MANIFEST_TEMPLATE_COPIES=("AGENTS.md" ".agent/config.yml")
+
+# Parse .agentic-config.json in one pure-bash pass
+# Usage: manifest_load <target>
+# Sets: MANIFEST_FOUND, MANIFEST_SOURCE, MANIFEST_MODE,
+#       CONFIG_VERSION, CONFIG_INSTALL_MODE, CONFIG_GLOBAL_PATH (top-level fields),
+#       _MANIFEST_LINKS, _MANIFEST_COPIES ("\n<path>\t<value>\n" lookup blobs)
+# Relies on jq's default 2-space layout; anything else reads as "no manifest".
+manifest_load() {
+  local config_file="$1/.agentic-config.json"
+  local line section="" key value
+  local re_entry='^ *"([^"]+)": "([^"]*)",?$'
+
+  MANIFEST_FOUND=false
+  MANIFEST_SOURCE=""
+  MANIFEST_MODE=""
+  CONFIG_VERSION=""
+  CONFIG_INSTALL_MODE=""
+  CONFIG_GLOBAL_PATH=""
+  _MANIFEST_LINKS=$'\n'
+  _MANIFEST_COPIES=$'\n'
+
+  [[ -f "$config_file" ]] || return 1
+
+  while IFS= read -r line || [[ -n "$line" ]]; do
+    case "$line" in
+      '  "manifest": {')
+        MANIFEST_FOUND=true
+        section="manifest"
+        continue
+        ;;
+      '    "links": {'|'    "copies": {')
+        [[ "$section" == manifest ]] && section="${line//[^a-z]/}"
+        continue
+        ;;
+      '    }'|'    },')
+        [[ "$section" == links || "$section" == copies ]] && section="manifest"
+        continue
+        ;;
+      '  }'|'  },')
+        [[ "$section" == manifest ]] && section=""
+        continue
+        ;;
+    esac
+
+    [[ "$line" =~ $re_entry ]] || continue
+    key="${BASH_REMATCH[1]}"
+    value="${BASH_REMATCH[2]}"
+
+    case "$section" in
+      "")
+        # Top-level string fields (2-space indent)
+        [[ "$line" == '  "'* && "$line" != '   '* ]] || continue
+        case "$key" in
+          version) CONFIG_VERSION="$value" ;;
+          install_mode) CONFIG_INSTALL_MODE="$value" ;;
+          agentic_global_path) CONFIG_GLOBAL_PATH="$value" ;;
+        esac
+        ;;
+      manifest)
+        case "$key" in
+          source) MANIFEST_SOURCE="$value" ;;
+          mode) MANIFEST_MODE="$value" ;;
+        esac
+        ;;
+      links) _MANIFEST_LINKS+="$key"$'\t'"$value"$'\n' ;;
+      copies) _MANIFEST_COPIES+="$key"$'\t'"$value"$'\n' ;;
+    esac
+  done < "$config_file"
+
+  return 0
+}
+
+# Look up a recorded link target / copy hash (no subshell)
+# Usage: manifest_link <path>; manifest_copy <path>
+# Sets: MANIFEST_VALUE (empty if untracked); returns 1 if untracked
+_manifest_lookup() {
+  MANIFEST_VALUE=""
+  # Strip from the match to the end (linear); "#*pattern" is quadratic on long blobs
+  local head="${1%%$'\n'"$2"$'\t'*}"
+  [[ "$head" != "$1" ]] || return 1
+  local rest="${1:${#head}+${#2}+2}"
+  MANIFEST_VALUE="${rest%%$'\n'*}"
+}
+
+manifest_link() {
+  _manifest_lookup "$_MANIFEST_LINKS" "$1"
+}
+
+manifest_copy() {
+  _manifest_lookup "$_MANIFEST_COPIES" "$1"
+}
+
+# Build the expected managed entries (commands, skills, hooks)
+# Usage: _manifest_expected <all_commands:true|false> <relative:true|false>
+# Sets: _MF_PATHS, _MF_SOURCES, _MF_TARGETS (link target used in symlink mode)
+_manifest_expected() {
+  local all_commands="$1"
+  local relative="$2"
+  local f name
+
+  _MF_PATHS=()
+  _MF_SOURCES=()
+  _MF_TARGETS=()
+
+  for f in "$REPO_ROOT/core/commands/claude/"*.md; do
+    [[ -f "$f" ]] || continue
+    name="${f##*/}"
+    # agentic-* commands are installed globally (except in self-hosted repos)
+    [[ "$all_commands" != true && "$name" == agentic-* ]] && continue
+    _MF_PATHS+=(".claude/commands/$name")
+    _MF_SOURCES+=("$f")
+    if [[ "$relative" == true ]]; then
+      _MF_TARGETS+=("../../core/commands/claude/$name")
+    else
+      _MF_TARGETS+=("$f")
+    fi
+  done
+
+  for f in "$REPO_ROOT/core/skills/"*/; do
+    [[ -d "$f" ]] || continue
+    f="${f%/}"
+    name="${f##*/}"
+    _MF_PATHS+=(".claude/skills/$name")
+    _MF_SOURCES+=("$f")
+    if [[ "$relative" == true ]]; then
+      _MF_TARGETS+=("../../core/skills/$name")
+    else
+      _MF_TARGETS+=("$f")
+    fi
+  done
+
+  for f in "$REPO_ROOT/core/hooks/pretooluse/"*.py; do
+    [[ -f "$f" ]] || continue
+    name="${f##*/}"
+    _MF_PATHS+=(".claude/hooks/pretooluse/$name")
+    _MF_SOURCES+=("$f")
+    if [[ "$relative" == true ]]; then
+      _MF_TARGETS+=("../../../core/hooks/pretooluse/$name")
+    else
+      _MF_TARGETS+=("$f")
+    fi
+  done
+}
+
+# Diff expected layout against the manifest and the filesystem (pure bash)
+# Usage: manifest_plan <target> <install_mode> <all_commands> <relative>
+# Sets: MANIFEST_CHANGES (count), MANIFEST_CHANGED (list of "<reason>: <path>"),
+#       MANIFEST_MODIFIED (copies edited locally; not counted as changes)
+# A project without a (current) manifest always reports at least one change.
+manifest_plan() {
+  local target="$1"
+  local mode="$2"
+  local all_commands="$3"
+  local relative="$4"
+  local i path dest expected_blob=$'\n'
+  local copy_paths=() copy_stale=()
+
+  MANIFEST_CHANGES=0
+  MANIFEST_CHANGED=()
+  MANIFEST_MODIFIED=()
+  _MANIFEST_MODIFIED_BLOB=$'\n'
+
+  manifest_load "$target"
+  if [[ "$MANIFEST_FOUND" != true || "$MANIFEST_SOURCE" != "$REPO_ROOT" || "$MANIFEST_MODE" != "$mode" ]]; then
+    MANIFEST_CHANGED+=("unrecorded: .agentic-config.json manifest")
+    MANIFEST_CHANGES=1
+    return 0
+  fi
+
+  _manifest_expected "$all_commands" "$relative"
+
+  for ((i = 0; i < ${#_MF_PATHS[@]}; i++)); do
+    path="${_MF_PATHS[$i]}"
+    dest="$target/$path"
+    expected_blob+="$path"$'\n'
+
+    if [[ ! -e "$dest" ]]; then
+      MANIFEST_CHANGED+=("missing: $path")
+    elif [[ "$mode" == "copy" ]]; then
+      if ! manifest_copy "$path"; then
+        MANIFEST_CHANGED+=("unrecorded: $path")
+      elif [[ -f "$dest" && ! -L "$dest" ]]; then
+        copy_paths+=("$path"); copy_stale+=(false)
+      fi
+    elif [[ -L "$dest" ]]; then
+      manifest_link "$path" || true
+      [[ "$MANIFEST_VALUE" == "${_MF_TARGETS[$i]}" ]] || MANIFEST_CHANGED+=("unrecorded: $path")
+    elif [[ "$path" == .claude/skills/* ]]; then
+      # Real skill directory in symlink mode is converted by update
+      MANIFEST_CHANGED+=("convert: $path")
+    fi
+  done
+
+  # Tracked setup extras that were deleted
+  local extra
+  for extra in "${MANIFEST_EXTRAS[@]}"; do
+    path="${extra%%|*}"
+    if manifest_link "$path" || manifest_copy "$path"; then
+      [[ -e "$target/$path" ]] || MANIFEST_CHANGED+=("missing: $path")
+    fi
+  done
+
+  # Stale tracked links (no longer shipped) and dangling links in managed dirs
+  local entry rest="${_MANIFEST_LINKS#$'\n'}"
+  while [[ -n "$rest" ]]; do
+    entry="${rest%%$'\n'*}"
+    rest="${rest#*$'\n'}"
+    path="${entry%%$'\t'*}"
+    case "$path" in
+      .claude/commands/*|.claude/skills/*|.claude/hooks/pretooluse/*)
+        if [[ "$expected_blob" != *$'\n'"$path"$'\n'* && -L "$target/$path" ]]; then
+          MANIFEST_CHANGED+=("stale: $path")
+        fi
+        ;;
+    esac
+  done
+
+  # Tracked copies no longer shipped (pruned below only if unmodified)
+  if [[ "$mode" == "copy" ]]; then
+    rest="${_MANIFEST_COPIES#$'\n'}"
+    while [[ -n "$rest" ]]; do
+      entry="${rest%%$'\n'*}"
+      rest="${rest#*$'\n'}"
+      path="${entry%%$'\t'*}"
+      case "$path" in
+        .claude/commands/*|.claude/skills/*|.claude/hooks/pretooluse/*)
+          if [[ "$expected_blob" != *$'\n'"$path"$'\n'* && -f "$target/$path" && ! -L "$target/$path" ]]; then
+            copy_paths+=("$path"); copy_stale+=(true)
+          fi
+          ;;
+      esac
+    done
+  fi
+
+  # Compare copies against their recorded hashes (one hashing call)
+  if [[ ${#copy_paths[@]} -gt 0 ]]; then
+    local hash_inputs=() line hashes=$'\n'
+    for path in "${copy_paths[@]}"; do
+      hash_inputs+=("$target/$path")
+    done
+    while IFS= read -r line; do
+      hashes+="${line#*  }"$'\t'"${line%% *}"$'\n'
+    done < <(manifest_hash_files "${hash_inputs[@]}")
+
+    for ((i = 0; i < ${#copy_paths[@]}; i++)); do
+      path="${copy_paths[$i]}"
+      manifest_copy "$path" || true
+      local recorded="$MANIFEST_VALUE"
+      _manifest_lookup "$hashes" "$target/$path" || true
+      if [[ "$recorded" != "sha256:$MANIFEST_VALUE" || -z "$MANIFEST_VALUE" ]]; then
+        MANIFEST_MODIFIED+=("$path")
+        _MANIFEST_MODIFIED_BLOB+="$path"$'\n'
+      elif [[ "${copy_stale[$i]}" == true ]]; then
+        MANIFEST_CHANGED+=("stale: $path")
+      fi
+    done
+  fi
+
+  local dir link
+  for dir in "${MANIFEST_MANAGED_DIRS[@]}"; do
+    [[ -d "$target/$dir" ]] || continue
+    for link in "$target/$dir"/*; do
+      if [[ -L "$link" && ! -e "$link" ]]; then
+        MANIFEST_CHANGED+=("orphan: $dir/${link##*/}")
+      fi
+    done
+  done
+
+  MANIFEST_CHANGES=${#MANIFEST_CHANGED[@]}
+  return 0
+}
+
+# Check whether a copy was edited locally (from the last manifest_plan)
+# Usage: manifest_is_modified <path>
+manifest_is_modified() {
+  [[ "${_MANIFEST_MODIFIED_BLOB:-}" == *$'\n'"$1"$'\n'* ]]
+}
+
+# Restore tracked setup extras that were deleted (links or copies)
+# Usage: manifest_restore_extras <target> <install_mode>
+manifest_restore_extras() {
+  local target="$1"
+  local mode="$2"
+  local extra path src restored=0
+
+  for extra in "${MANIFEST_EXTRAS[@]}"; do
+    path="${extra%%|*}"
+    src="$REPO_ROOT/${extra#*|}"
+    manifest_link "$path" || manifest_copy "$path" || continue
+    [[ -e "$target/$path" || ! -e "$src" ]] && continue
+
+    [[ -d "$target/${path%/*}" ]] || mkdir -p "$target/${path%/*}"
+    [[ -L "$target/$path" ]] && rm -f "$target/$path"
+    if [[ "$mode" == "copy" ]]; then
+      cp -R "$src" "$target/$path"
+    else
+      ln -s "$src" "$target/$path"
+    fi
+    echo "  ✓ $path (restored)"
+    ((restored++)) || true
+  done
+
+  [[ $restored -gt 0 ]] || return 0
+}
+
+# Remove tracked links and unmodified copies that are no longer shipped
+# (from the last manifest_plan)
+# Usage: manifest_prune_stale <target>
+manifest_prune_stale() {
+  local target="$1"
+  local change path
+
+  for change in ${MANIFEST_CHANGED[@]+"${MANIFEST_CHANGED[@]}"}; do
+    [[ "$change" == "stale: "* ]] || continue
+    path="${change#stale: }"
+    if [[ -L "$target/$path" || -f "$target/$path" ]]; then
+      rm -f "$target/$path"
+      echo "  Removed stale: $path"
+    fi
+  done
+  return 0
+}
+
+# Print "<hash>  <path>" for each file (single call, GNU or BSD)
+# Usage: manifest_hash_files <file>...
+manifest_hash_files() {
+  [[ $# -eq 0 ]] && return 0
+  if command -v sha256sum >/dev/null 2>&1; then
+    sha256sum -- "$@" 2>/dev/null
+  elif command -v shasum >/dev/null 2>&1; then
+    shasum -a 256 -- "$@" 2>/dev/null
+  fi
+  return 0
+}
+
+# JSON string literal for a path (escapes backslash and double quote)
+_manifest_json_str() {
+  local value="${1//\\/\\\\}"
+  printf '"%s"' "${value//\"/\\\"}"
+}
+
+# Record the current install state into .agentic-config.json
+# Usage: manifest_write <target> <install_mode> <all_commands> <relative>
+# Writes only when the manifest changed. Requires jq (skipped otherwise).
+# Copies keep their recorded hash unless the file now matches its source,
+# so local modifications stay detectable across runs.
+manifest_write() {
+  local target="$1"
+  local mode="$2"
+  local all_commands="$3"
+  local relative="$4"
+  local config_file="$target/.agentic-config.json"
+
+  [[ -f "$config_file" ]] || return 0
+  command -v jq >/dev/null 2>&1 || return 0
+
+  manifest_load "$target"
+  _manifest_expected "$all_commands" "$relative"
+
+  # Candidate entries: managed + extras (present on disk) + rendered templates
+  local paths=() sources=() targets=() i extra path
+  for ((i = 0; i < ${#_MF_PATHS[@]}; i++)); do
+    paths+=("${_MF_PATHS[$i]}"); sources+=("${_MF_SOURCES[$i]}"); targets+=("${_MF_TARGETS[$i]}")
+  done
+  if [[ "$relative" != true ]]; then
+    for extra in "${MANIFEST_EXTRAS[@]}"; do
+      path="${extra%%|*}"
+      paths+=("$path"); sources+=("$REPO_ROOT/${extra#*|}"); targets+=("$REPO_ROOT/${extra#*|}")
+    done
+  fi
+
+  # Hash every copied file and its source in one call
+  local hash_inputs=() line
+  for ((i = 0; i < ${#paths[@]}; i++)); do
+    if [[ -f "$target/${paths[$i]}" && ! -L "$target/${paths[$i]}" ]]; then
+      hash_inputs+=("$target/${paths[$i]}")
+      [[ -f "${sources[$i]}" ]] && hash_inputs+=("${sources[$i]}")
+    fi
+  done
+  for path in "${MANIFEST_TEMPLATE_COPIES[@]}"; do
+    [[ -f "$target/$path" && ! -L "$target/$path" ]] && hash_inputs+=("$target/$path")
+  done
+  local hashes=$'\n'
+  while IFS= read -r line; do
+    hashes+="${line#*  }"$'\t'"${line%% *}"$'\n'
+  done < <(manifest_hash_files ${hash_inputs[@]+"${hash_inputs[@]}"})
+
+  local links_json="" copies_json="" dest local_hash src_hash recorded value
+  for ((i = 0; i < ${#paths[@]}; i++)); do
+    path="${paths[$i]}"
+    dest="$target/$path"
+    if [[ -L "$dest" ]]; then
+      [[ -e "$dest" ]] || continue
+      links_json+="${links_json:+,}$(_manifest_json_str "$path"):$(_manifest_json_str "${targets[$i]}")"
+    elif [[ -d "$dest" ]]; then
+      [[ "$mode" == "copy" ]] && copies_json+="${copies_json:+,}$(_manifest_json_str "$path"):\"dir\""
+    elif [[ -f "$dest" && "$mode" == "copy" ]]; then
+      _manifest_lookup "$hashes" "$dest" || true
+      local_hash="$MANIFEST_VALUE"
+      _manifest_lookup "$hashes" "${sources[$i]}" || true
+      src_hash="$MANIFEST_VALUE"
+      manifest_copy "$path" || true
+      recorded="$MANIFEST_VALUE"
+      if [[ -n "$local_hash" && "$local_hash" == "$src_hash" ]]; then
+        value="sha256:$local_hash"
+      elif [[ -n "$recorded" ]]; then
+        value="$recorded"
+      else
+        value="sha256:${local_hash:-unknown}"
+      fi
+      copies_json+="${copies_json:+,}$(_manifest_json_str "$path"):$(_manifest_json_str "$value")"
+    fi
+  done
+
+  for path in "${MANIFEST_TEMPLATE_COPIES[@]}"; do
+    dest="$target/$path"
+    [[ -f "$dest" && ! -L "$dest" ]] || continue
+    _manifest_lookup "$hashes" "$dest" || MANIFEST_VALUE="unknown"
+    local_hash="$MANIFEST_VALUE"
+    copies_json+="${copies_json:+,}$(_manifest_json_str "$path"):$(_manifest_json_str "sha256:$local_hash")"
+  done
+
+  local manifest_json
+  manifest_json="{\"source\":$(_manifest_json_str "$REPO_ROOT"),\"mode\":$(_manifest_json_str "$mode"),\"links\":{$links_json},\"copies\":{$copies_json}}"
+
+  # Single jq pass: emits nothing when the recorded manifest is already identical
+  local temp_file="$config_file.tmp.$$"
+  if jq --argjson m "$manifest_json" 'if .manifest == $m then empty else .manifest = $m end' \
+      "$config_file" > "$temp_file" 2>/dev/null && [[ -s "$temp_file" ]]; then
+    mv "$temp_file" "$config_file"
+    echo "  ✓ Install manifest updated"
+  fi
+  rm -f "$temp_file" 2>/dev/null
+  return 0
+}
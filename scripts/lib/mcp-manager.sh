@@ -54,6 +54,8 @@ get_mcp_config_path() {
 }
 
 # Check if an MCP server is already configured for a tool
+# Dry-run merge of a placeholder entry: the merge helpers decide presence, so this
+# agrees with what merge_mcp_configs would skip. No template needed, nothing written.
 # Args: $1=server_name, $2=tool, $3=target_path
 # Returns: 0 if configured, 1 if not
 is_mcp_configured() {
@@ -66,21 +68,19 @@ is_mcp_configured() {
   local scope="project"
   [[ "$tool" == "codex" ]] && scope="global"
 
-  config_path=$(get_mcp_config_path "$tool" "$scope" "$target_path")
-
+  config_path=$(get_mcp_config_path "$tool" "$scope" "$target_path") || return 1
   [[ ! -f "$config_path" ]] && return 1
 
+  # Locals shadow the merge state so an in-progress merge_mcp_configs is unaffected
+  local _MCP_SERVERS_JSON="{\"$server_name\": {}}"
+  local _MCP_TOML_LINES="$server_name"$'\t\t'
+  local _MCP_ADDED="" _MCP_PRESENT=""
   if [[ "$tool" == "codex" ]]; then
-    # TOML format: check for [mcp_servers.<name>] section
-    grep -q "^\[mcp_servers\.$server_name\]" "$config_path" 2>/dev/null
+    _merge_toml_mcp "$config_path" true || return 1
   else
-    # JSON format: check for server in mcpServers object
-    if command -v jq &>/dev/null; then
-      jq -e ".mcpServers.\"$server_name\"" "$config_path" &>/dev/null
-    else
-      grep -q "\"$server_name\"" "$config_path" 2>/dev/null
-    fi
+    _merge_json_mcp "$config_path" true 2>/dev/null || return 1
   fi
+  [[ " $_MCP_PRESENT " == *" $server_name "* ]]
 }
 
 # Read server definition from template
@@ -113,155 +113,193 @@ _load_server_template() {
   return 0
 }
 
-# Install MCP server to JSON-based config (Claude, Gemini, Antigravity)
-# Args: $1=server_name, $2=tool, $3=target_path, $4=dry_run
-_install_json_mcp() {
-  local server_name="$1"
-  local tool="$2"
-  local target_path="${3:-.}"
-  local dry_run="${4:-false}"
-
-  local scope="project"
-  [[ "$tool" == "codex" ]] && scope="global"
+# Load every requested server template in a single jq pass
+# Args: server names...
+# Sets: _MCP_SERVERS_JSON (compact object: name -> {command, args, env}),
+#       _MCP_TOML_LINES ("name<TAB>command<TAB>toml args" per server)
+_load_server_templates() {
+  local templates_dir="${REPO_ROOT:-$(dirname "$(dirname "$(dirname "${BASH_SOURCE[0]}")")")}/templates/mcp/servers"
+  local files=() name failed=0
 
-  local config_path
-  config_path=$(get_mcp_config_path "$tool" "$scope" "$target_path")
+  _MCP_SERVERS_JSON=""
+  _MCP_TOML_LINES=""
 
-  # Load server template
-  _load_server_template "$server_name" || return 1
+  # Unknown servers are reported and skipped; the rest are still loaded
+  for name in "$@"; do
+    if [[ ! -f "$templates_dir/$name.json" ]]; then
+      echo "ERROR: No template for server: $name" >&2
+      failed=1
+      continue
+    fi
+    files+=("$templates_dir/$name.json")
+  done
+  [[ ${#files[@]} -eq 0 ]] && return 1
 
-  # Create parent directory if needed
-  local config_dir
-  config_dir=$(dirname "$config_path")
-  if [[ ! -d "$config_dir" && "$config_dir" != "." ]]; then
-    [[ "$dry_run" == true ]] && echo "   Would create: $config_dir" && return 0
-    mkdir -p "$config_dir"
+  if ! command -v jq &>/dev/null; then
+    echo "ERROR: jq required for MCP configuration" >&2
+    return 1
   fi
 
-  # Backup existing config
-  if [[ -f "$config_path" ]]; then
-    local backup_path="$config_path.bak.$(date +%s)"
-    [[ "$dry_run" == true ]] && echo "   Would backup: $config_path -> $backup_path"
-    [[ "$dry_run" != true ]] && cp "$config_path" "$backup_path"
-  fi
+  local out
+  out=$(jq -rn '
+    [inputs | {key: (input_filename | sub("^.*/"; "") | sub("\\.json$"; "")),
+               value: {command, args, env}}]
+    | from_entries
+    | tojson,
+      (to_entries[] | "\(.key)\t\(.value.command)\t\(.value.args // [] | map("\"" + . + "\"") | join(", "))")
+  ' "${files[@]}") || return 1
+
+  _MCP_SERVERS_JSON="${out%%$'\n'*}"
+  _MCP_TOML_LINES="${out#*$'\n'}"
+  return $failed
+}
 
-  if [[ "$dry_run" == true ]]; then
-    echo "   Would add $server_name to $config_path"
-    return 0
-  fi
+# Write content to a file atomically (temp file in the same directory + rename)
+# Args: $1=path, $2=content
+_mcp_atomic_write() {
+  local path="$1"
+  local temp_file="$path.tmp.$$"
 
-  if ! command -v jq &>/dev/null; then
-    echo "ERROR: jq required for JSON MCP configuration" >&2
-    return 1
+  if printf '%s' "$2" > "$temp_file" && mv -f "$temp_file" "$path"; then
+    return 0
   fi
+  rm -f "$temp_file"
+  return 1
+}
 
-  # Build server config JSON
-  local server_config
-  server_config=$(jq -n \
-    --arg cmd "$SERVER_COMMAND" \
-    --argjson args "$SERVER_ARGS" \
-    --argjson env "$SERVER_ENV" \
-    '{command: $cmd, args: $args, env: $env}')
-
-  if [[ ! -f "$config_path" ]]; then
-    # Create new config
-    jq -n --arg name "$server_name" --argjson config "$server_config" \
-      '{mcpServers: {($name): $config}}' > "$config_path"
+# Merge all loaded servers into one JSON config (Claude, Gemini, Antigravity)
+# Single jq pass computes the added/already-present servers and the merged document;
+# existing entries are never overwritten. The file is written once, only if it changed.
+# Args: $1=config_path, $2=dry_run
+# Sets: _MCP_ADDED, _MCP_PRESENT (space-separated server names)
+_merge_json_mcp() {
+  local config_path="$1"
+  local dry_run="${2:-false}"
+  local filter='
+    (.mcpServers // {}) as $cur
+    | [$servers | keys_unsorted[] | select($cur[.] == null)] as $added
+    | ($added | join(" ")),
+      ([$servers | keys_unsorted[] | select($cur[.] != null)] | join(" ")),
+      (if ($added | length) > 0
+       then .mcpServers = ($cur + ($servers | with_entries(select(.key as $k | $added | index($k)))))
+       else empty end)
+  '
+
+  local out
+  if [[ -f "$config_path" ]]; then
+    out=$(jq -r --argjson servers "$_MCP_SERVERS_JSON" "$filter" "$config_path" 2>/dev/null) || {
+      echo "ERROR: Cannot parse $config_path - leaving it unchanged" >&2
+      return 1
+    }
   else
-    # Merge into existing config
-    local temp_file
-    temp_file=$(mktemp)
-    jq --arg name "$server_name" --argjson config "$server_config" \
-      '.mcpServers = (.mcpServers // {}) | .mcpServers[$name] = $config' \
-      "$config_path" > "$temp_file" && mv "$temp_file" "$config_path"
+    out=$(jq -r --argjson servers "$_MCP_SERVERS_JSON" "$filter" <<< '{}') || return 1
   fi
 
-  echo "   Configured $server_name for $tool at $config_path"
-  return 0
-}
+  _MCP_ADDED="${out%%$'\n'*}"
+  local rest="${out#*$'\n'}"
+  _MCP_PRESENT="${rest%%$'\n'*}"
+  [[ -z "$_MCP_ADDED" || "$dry_run" == true ]] && return 0
 
-# Install MCP server to TOML-based config (Codex)
-# Args: $1=server_name, $2=target_path, $3=dry_run
-_install_toml_mcp() {
-  local server_name="$1"
-  local target_path="${2:-.}"
-  local dry_run="${3:-false}"
+  local config_dir="${config_path%/*}"
+  [[ "$config_dir" != "$config_path" && ! -d "$config_dir" ]] && mkdir -p "$config_dir"
+  [[ -f "$config_path" ]] && cp "$config_path" "$config_path.bak.$(date +%s)"
+  _mcp_atomic_write "$config_path" "${rest#*$'\n'}"$'\n'
+}
 
-  local config_path
-  config_path=$(get_mcp_config_path "codex" "global" "$target_path")
+# Merge all loaded servers into the Codex TOML config
+# Sections are detected and appended with string operations (no TOML parser);
+# the file is read once and written once, only if a section was added.
+# Args: $1=config_path, $2=dry_run
+# Sets: _MCP_ADDED, _MCP_PRESENT (space-separated server names)
+_merge_toml_mcp() {
+  local config_path="$1"
+  local dry_run="${2:-false}"
+  local content="" sections="" name command args_toml
+
+  _MCP_ADDED=""
+  _MCP_PRESENT=""
+  [[ -f "$config_path" ]] && { IFS= read -r -d '' content < "$config_path" || true; }
+
+  while IFS=$'\t' read -r name command args_toml; do
+    [[ -z "$name" ]] && continue
+    if [[ $'\n'"$content" == *$'\n'"[mcp_servers.$name]"* ]]; then
+      _MCP_PRESENT+="${_MCP_PRESENT:+ }$name"
+    else
+      _MCP_ADDED+="${_MCP_ADDED:+ }$name"
+      sections+=$'\n'"[mcp_servers.$name]"$'\n'"command = \"$command\""$'\n'"args = [$args_toml]"$'\n\n'
+    fi
+  done <<< "$_MCP_TOML_LINES"
 
-  # Load server template
-  _load_server_template "$server_name" || return 1
+  [[ -z "$_MCP_ADDED" || "$dry_run" == true ]] && return 0
 
-  # Create parent directory if needed
-  local config_dir
-  config_dir=$(dirname "$config_path")
-  if [[ ! -d "$config_dir" ]]; then
-    [[ "$dry_run" == true ]] && echo "   Would create: $config_dir" && return 0
-    mkdir -p "$config_dir"
-  fi
+  [[ -d "${config_path%/*}" ]] || mkdir -p "${config_path%/*}"
+  [[ -f "$config_path" ]] && cp "$config_path" "$config_path.bak.$(date +%s)"
+  _mcp_atomic_write "$config_path" "$content$sections"
+}
 
-  # Backup existing config
-  if [[ -f "$config_path" ]]; then
-    local backup_path="$config_path.bak.$(date +%s)"
-    [[ "$dry_run" == true ]] && echo "   Would backup: $config_path -> $backup_path"
-    [[ "$dry_run" != true ]] && cp "$config_path" "$backup_path"
-  fi
+# Merge MCP servers into every selected tool config in one pass per file
+# Args: $1=servers (comma-separated), $2=tools (comma-separated or "all"), $3=target_path, $4=dry_run
+# Sets: MCP_CHANGED (array of "tool:server" entries actually added)
+# Returns: 1 if any template or config could not be processed
+merge_mcp_configs() {
+  local servers="$1"
+  local tools="$2"
+  local target_path="${3:-.}"
+  local dry_run="${4:-false}"
 
-  if [[ "$dry_run" == true ]]; then
-    echo "   Would add $server_name to $config_path"
-    return 0
-  fi
+  MCP_CHANGED=()
 
-  # Build TOML section using string operations (no TOML parser)
-  # Convert JSON args array to TOML array format
-  local args_toml
-  if command -v jq &>/dev/null; then
-    # Use jq to format args as TOML array
-    args_toml=$(echo "$SERVER_ARGS" | jq -r 'map("\"" + . + "\"") | join(", ")')
+  local server_list tool_list
+  IFS=',' read -ra server_list <<< "$servers"
+  if [[ "$tools" == "all" ]]; then
+    tool_list=("claude" "gemini" "codex" "antigravity")
   else
-    echo "ERROR: jq required for TOML MCP configuration" >&2
-    return 1
+    IFS=',' read -ra tool_list <<< "$tools"
   fi
 
-  local toml_section
-  toml_section="
-[mcp_servers.$server_name]
-command = \"$SERVER_COMMAND\"
-args = [$args_toml]
-"
+  local tool scope config_path seen=$'\n' failed=0 name files_written=0
+  _load_server_templates "${server_list[@]}" || failed=1
+  [[ -n "$_MCP_SERVERS_JSON" ]] || return 1
 
-  if [[ ! -f "$config_path" ]]; then
-    # Create new config
-    echo "$toml_section" > "$config_path"
-  else
-    # Append to existing config
-    echo "$toml_section" >> "$config_path"
-  fi
+  for tool in "${tool_list[@]}"; do
+    scope="project"
+    [[ "$tool" == "codex" ]] && scope="global"
+    config_path=$(get_mcp_config_path "$tool" "$scope" "$target_path") || { failed=1; continue; }
 
-  echo "   Configured $server_name for codex at $config_path"
-  return 0
+    # Each config file is loaded and written at most once
+    [[ "$seen" == *$'\n'"$config_path"$'\n'* ]] && continue
+    seen+="$config_path"$'\n'
+
+    if [[ "$tool" == "codex" ]]; then
+      _merge_toml_mcp "$config_path" "$dry_run" || { failed=1; continue; }
+    else
+      _merge_json_mcp "$config_path" "$dry_run" || { failed=1; continue; }
+    fi
+
+    for name in $_MCP_PRESENT; do
+      echo "   Skipping $name for $tool (already configured)"
+    done
+    for name in $_MCP_ADDED; do
+      if [[ "$dry_run" == true ]]; then
+        echo "   Would add $name for $tool to $config_path"
+      else
+        echo "   Configured $name for $tool at $config_path"
+      fi
+      MCP_CHANGED+=("$tool:$name")
+    done
+    [[ -n "$_MCP_ADDED" && "$dry_run" != true ]] && ((files_written++)) || true
+  done
+
+  if [[ "$dry_run" != true ]]; then
+    echo "   ${#MCP_CHANGED[@]} server entry(ies) added, $files_written config file(s) written"
+  fi
+  return $failed
 }
 
 # Install MCP server for a specific tool
 # Args: $1=server_name, $2=tool, $3=target_path, $4=dry_run
 install_mcp_server() {
-  local server_name="$1"
-  local tool="$2"
-  local target_path="${3:-.}"
-  local dry_run="${4:-false}"
-
-  # Check if already configured
-  if is_mcp_configured "$server_name" "$tool" "$target_path"; then
-    echo "   Skipping $server_name for $tool (already configured)"
-    return 0
-  fi
-
-  if [[ "$tool" == "codex" ]]; then
-    _install_toml_mcp "$server_name" "$target_path" "$dry_run"
-  else
-    _install_json_mcp "$server_name" "$tool" "$target_path" "$dry_run"
-  fi
+  merge_mcp_configs "$1" "$2" "${3:-.}" "${4:-false}"
 }
 
 # Run post-install steps for an MCP server
@@ -346,22 +384,15 @@ install_mcp_for_tools() {
   local server_list
   IFS=',' read -ra server_list <<< "$servers"
 
-  # Determine tool list
-  local tool_list
-  if [[ "$tools" == "all" ]]; then
-    tool_list=("claude" "gemini" "codex" "antigravity")
-  else
-    IFS=',' read -ra tool_list <<< "$tools"
-  fi
-
   echo "Installing MCP servers: ${server_list[*]}"
   [[ "$dry_run" == true ]] && echo "   (DRY RUN - no changes will be made)"
 
+  # All servers are merged into each tool config in a single read-modify-write
+  merge_mcp_configs "$servers" "$tools" "$target_path" "$dry_run" || \
+    echo "   WARNING: Some MCP configs could not be updated" >&2
+
   for server in "${server_list[@]}"; do
     echo "   Processing $server..."
-    for tool in "${tool_list[@]}"; do
-      install_mcp_server "$server" "$tool" "$target_path" "$dry_run"
-    done
     run_mcp_post_install "$server" "$target_path" "$dry_run"
   done
 
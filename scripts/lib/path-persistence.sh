@@ -25,6 +25,13 @@ persist_to_dotpath() {
     }
   fi
 
+  # Skip the write when already current (keeps no-op updates write-free)
+  if [[ -f "$dotpath_file" ]]; then
+    local current=""
+    IFS= read -r current < "$dotpath_file" || true
+    [[ "$current" == "$install_path" ]] && return 0
+  fi
+
   # Write absolute path
   echo "$install_path" > "$dotpath_file" || {
     echo "WARNING: Could not write to $dotpath_file" >&2
@@ -56,8 +63,15 @@ persist_to_shell_profile() {
       ;;
   esac
 
+  # Fast path: marker and current export already present (pure bash, no forks)
+  local content=""
+  [[ -f "$profile" ]] && { IFS= read -r -d '' content < "$profile" || true; }
+  if [[ "$content" == *"$AGENTIC_PROFILE_MARKER"$'\n'"export AGENTIC_CONFIG_PATH=\"$install_path\""* ]]; then
+    return 0
+  fi
+
   # Check if already present (idempotent)
-  if grep -q "$AGENTIC_PROFILE_MARKER" "$profile" 2>/dev/null; then
+  if [[ "$content" == *"$AGENTIC_PROFILE_MARKER"* ]]; then
     # Update existing entry if path changed
     local current_path
     current_path=$(grep "export AGENTIC_CONFIG_PATH=" "$profile" 2>/dev/null | sed 's/.*="\([^"]*\)".*/\1/')
@@ -100,10 +114,19 @@ persist_to_xdg_config() {
   local config_file="$xdg_dir/config"
 
   # Create directory if needed
-  mkdir -p "$xdg_dir" || {
-    echo "WARNING: Could not create $xdg_dir" >&2
-    return 1
-  }
+  if [[ ! -d "$xdg_dir" ]]; then
+    mkdir -p "$xdg_dir" || {
+      echo "WARNING: Could not create $xdg_dir" >&2
+      return 1
+    }
+  fi
+
+  # Skip the write when already current
+  if [[ -f "$config_file" ]]; then
+    local current=""
+    IFS= read -r -d '' current < "$config_file" || true
+    [[ "$current" == "path=$install_path"$'\n' ]] && return 0
+  fi
 
   # Write config file
   echo "path=$install_path" > "$config_file" || {
@@ -1,36 +1,172 @@
 #!/usr/bin/env bash
 # Processes template files with variable substitution
+#
+# Rendering is single-pass and pure bash: every {{VAR}} placeholder is resolved
+# in one scan of the template, with no sed/subshell per variable. Outputs that
+# are byte-identical to the existing file are not rewritten (mtime preserved).
+#
+# Set TEMPLATE_STRICT=true to fail (and skip writing) on unresolved placeholders.
 
-# Process a template file with optional variable substitution
-# Usage: process_template <template_file> <output_file> [VAR1=value1 VAR2=value2 ...]
-process_template() {
+# Parse VAR=value arguments into the lookup arrays
+# Usage: _template_parse_vars [VAR1=value1 VAR2=value2 ...]
+_template_parse_vars() {
+  _TEMPLATE_NAMES=()
+  _TEMPLATE_VALUES=()
+  local arg
+  for arg in "$@"; do
+    if [[ "$arg" =~ ^([A-Z_][A-Z0-9_]*)=(.*)$ ]]; then
+      _TEMPLATE_NAMES+=("${BASH_REMATCH[1]}")
+      _TEMPLATE_VALUES+=("${BASH_REMATCH[2]}")
+    fi
+  done
+}
+
+# Render a template file in a single pass using the parsed variables
+# Usage: _template_render_file <template_file>
+# Sets: _TEMPLATE_OUTPUT (rendered content), _TEMPLATE_UNRESOLVED (placeholder names)
+_template_render_file() {
+  local template_file="$1"
+  local rest="" out="" name j found
+
+  _TEMPLATE_OUTPUT=""
+  _TEMPLATE_UNRESOLVED=()
+
+  # read -d '' keeps the content byte-exact (including trailing newlines)
+  IFS= read -r -d '' rest < "$template_file" || true
+
+  while [[ "$rest" == *"{{"* ]]; do
+    out+="${rest%%"{{"*}"
+    rest="${rest#*"{{"}"
+    name="${rest%%"}}"*}"
+
+    # Only {{UPPER_CASE}} is a placeholder; anything else (e.g. ${{ expr }}) is literal
+    if [[ "$rest" != *"}}"* || ! "$name" =~ ^[A-Z_][A-Z0-9_]*$ ]]; then
+      out+="{{"
+      continue
+    fi
+    rest="${rest#*"}}"}"
+
+    found=false
+    for ((j = 0; j < ${#_TEMPLATE_NAMES[@]}; j++)); do
+      if [[ "${_TEMPLATE_NAMES[$j]}" == "$name" ]]; then
+        out+="${_TEMPLATE_VALUES[$j]}"
+        found=true
+        break
+      fi
+    done
+    if [[ "$found" != true ]]; then
+      out+="{{${name}}}"
+      _TEMPLATE_UNRESOLVED+=("$name")
+    fi
+  done
+
+  _TEMPLATE_OUTPUT="$out$rest"
+}
+
+# Render a template and write it unless the output is already up to date
+# Usage: _template_write <template_file> <output_file>
+# Sets: TEMPLATE_CHANGED (true if the output file was written)
+_template_write() {
   local template_file="$1"
   local output_file="$2"
-  shift 2
+
+  TEMPLATE_CHANGED=false
 
   if [[ ! -f "$template_file" ]]; then
     echo "ERROR: Template not found: $template_file" >&2
     return 1
   fi
 
-  # Start with template content
-  local content
-  content=$(cat "$template_file")
+  _template_render_file "$template_file"
 
-  # Process each VAR=value argument
-  for arg in "$@"; do
-    if [[ "$arg" =~ ^([A-Z_][A-Z0-9_]*)=(.*)$ ]]; then
-      local var_name="${BASH_REMATCH[1]}"
-      local var_value="${BASH_REMATCH[2]}"
-      # Replace {{VAR_NAME}} with value (escape special chars for sed)
-      local escaped_value
-      escaped_value=$(printf '%s\n' "$var_value" | sed 's/[&/\|]/\\&/g')
-      content=$(echo "$content" | sed "s|{{${var_name}}}|${escaped_value}|g")
+  if [[ ${#_TEMPLATE_UNRESOLVED[@]} -gt 0 ]]; then
+    echo "WARNING: Unresolved placeholder(s) in $template_file: ${_TEMPLATE_UNRESOLVED[*]}" >&2
+    if [[ "${TEMPLATE_STRICT:-false}" == true ]]; then
+      return 1
     fi
-  done
+  fi
 
-  # Write to output file
-  echo "$content" > "$output_file"
+  # Skip the write when content is byte-identical (keeps mtime stable)
+  if [[ -f "$output_file" ]]; then
+    local existing=""
+    IFS= read -r -d '' existing < "$output_file" || true
+    [[ "$existing" == "$_TEMPLATE_OUTPUT" ]] && return 0
+  fi
 
+  printf '%s' "$_TEMPLATE_OUTPUT" > "$output_file" || return 1
+  TEMPLATE_CHANGED=true
   return 0
 }
+
+# Render a template file to stdout
+# Usage: render_template <template_file> [VAR1=value1 VAR2=value2 ...]
+render_template() {
+  local template_file="$1"
+  shift
+
+  if [[ ! -f "$template_file" ]]; then
+    echo "ERROR: Template not found: $template_file" >&2
+    return 1
+  fi
+
+  _template_parse_vars "$@"
+  _template_render_file "$template_file"
+
+  if [[ ${#_TEMPLATE_UNRESOLVED[@]} -gt 0 ]]; then
+    echo "WARNING: Unresolved placeholder(s) in $template_file: ${_TEMPLATE_UNRESOLVED[*]}" >&2
+    [[ "${TEMPLATE_STRICT:-false}" == true ]] && return 1
+  fi
+
+  printf '%s' "$_TEMPLATE_OUTPUT"
+}
+
+# Process a template file with optional variable substitution
+# Usage: process_template <template_file> <output_file> [VAR1=value1 VAR2=value2 ...]
+# Sets: TEMPLATE_CHANGED (false if the output was already up to date)
+process_template() {
+  local template_file="$1"
+  local output_file="$2"
+  shift 2
+
+  _template_parse_vars "$@"
+  _template_write "$template_file" "$output_file"
+}
+
+# Render every *.template file under a directory into a target directory
+# Usage: render_template_set <template_dir> <target_dir> [VAR1=value1 VAR2=value2 ...]
+#   <template_dir>/.agent/config.yml.template -> <target_dir>/.agent/config.yml
+# Sets: TEMPLATE_WRITTEN, TEMPLATE_UNCHANGED (file counts)
+# Returns: 1 if any template failed to render or write
+render_template_set() {
+  local template_dir="$1"
+  local target_dir="$2"
+  shift 2
+
+  TEMPLATE_WRITTEN=0
+  TEMPLATE_UNCHANGED=0
+
+  if [[ ! -d "$template_dir" ]]; then
+    echo "ERROR: Template directory not found: $template_dir" >&2
+    return 1
+  fi
+
+  # Variables are parsed once for the whole set
+  _template_parse_vars "$@"
+
+  local template_file rel_path output_file failed=0
+  while IFS= read -r template_file; do
+    rel_path="${template_file#"$template_dir"/}"
+    output_file="$target_dir/${rel_path%.template}"
+    [[ -d "${output_file%/*}" ]] || mkdir -p "${output_file%/*}"
+
+    if ! _template_write "$template_file" "$output_file"; then
+      ((failed++)) || true
+    elif [[ "$TEMPLATE_CHANGED" == true ]]; then
+      ((TEMPLATE_WRITTEN++)) || true
+    else
+      ((TEMPLATE_UNCHANGED++)) || true
+    fi
+  done < <(find "$template_dir" -type f -name '*.template' | sort)
+
+  [[ $failed -eq 0 ]]
+}
@@ -143,8 +143,8 @@ reconcile_config() {
     echo "  + Added install_mode: symlink"
   fi
 
-  # agentic_global_path: path to global installation
-  if ! jq -e '.agentic_global_path' "$temp_file" &>/dev/null; then
+  # agentic_global_path: path to global installation (empty counts as missing)
+  if ! jq -e '.agentic_global_path | select(. != "")' "$temp_file" &>/dev/null; then
     jq --arg path "$agentic_global_path" '.agentic_global_path = $path' "$temp_file" > "${temp_file}.new" && mv "${temp_file}.new" "$temp_file"
     changes_made=true
     echo "  + Added agentic_global_path: $agentic_global_path"
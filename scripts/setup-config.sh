@@ -6,7 +6,7 @@ set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(dirname "$SCRIPT_DIR")"
-VERSION=$(cat "$REPO_ROOT/VERSION")
+IFS= read -r VERSION < "$REPO_ROOT/VERSION" || true
 
 # Source utilities
 source "$SCRIPT_DIR/lib/detect-project-type.sh"
@@ -14,13 +14,15 @@ source "$SCRIPT_DIR/lib/template-processor.sh"
 source "$SCRIPT_DIR/lib/version-manager.sh"
 source "$SCRIPT_DIR/lib/path-persistence.sh"
 source "$SCRIPT_DIR/lib/mcp-manager.sh"
+source "$SCRIPT_DIR/lib/install-manifest.sh"
 
 # Dynamically discover all available commands from core directory
 discover_available_commands() {
   local cmds=()
   for f in "$REPO_ROOT/core/commands/claude/"*.md; do
     [[ ! -f "$f" ]] && continue
-    local name=$(basename "$f" .md)
+    local name="${f##*/}"
+    name="${name%.md}"
     # Skip agentic-* commands (globally installed)
     [[ "$name" == agentic-* ]] && continue
     cmds+=("$name")
@@ -33,8 +35,8 @@ discover_available_skills() {
   local skills=()
   for d in "$REPO_ROOT/core/skills/"*/; do
     [[ ! -d "$d" ]] && continue
-    local name=$(basename "$d")
-    skills+=("$name")
+    local name="${d%/}"
+    skills+=("${name##*/}")
   done
   echo "${skills[@]}"
 }
@@ -434,9 +436,8 @@ fi
 # Install templates
 echo "Installing config templates ($PROJECT_TYPE)..."
 if [[ "$DRY_RUN" != true ]]; then
-  process_template "$TEMPLATE_DIR/.agent/config.yml.template" "$TARGET_PATH/.agent/config.yml"
-
   # Pass tooling variables for python-pip template
+  template_vars=()
   if [[ "$PROJECT_TYPE" == "python-pip" ]]; then
     # Build LINTER_CMD and LINTER_AFTER_EDIT based on linter type
     linter_cmd=""
@@ -448,11 +449,12 @@ if [[ "$DRY_RUN" != true ]]; then
       linter_cmd="pylint <path>"
       linter_after_edit="pylint"
     fi
-    process_template "$TEMPLATE_DIR/AGENTS.md.template" "$TARGET_PATH/AGENTS.md" \
-      "TYPE_CHECKER=$TYPE_CHECKER" "LINTER=$LINTER" "LINTER_CMD=$linter_cmd" "LINTER_AFTER_EDIT=$linter_after_edit"
-  else
-    process_template "$TEMPLATE_DIR/AGENTS.md.template" "$TARGET_PATH/AGENTS.md"
+    template_vars=("TYPE_CHECKER=$TYPE_CHECKER" "LINTER=$LINTER" "LINTER_CMD=$linter_cmd" "LINTER_AFTER_EDIT=$linter_after_edit")
   fi
+
+  # Render AGENTS.md and .agent/config.yml in one pass over the template set
+  render_template_set "$TEMPLATE_DIR" "$TARGET_PATH" ${template_vars[@]+"${template_vars[@]}"}
+  echo "   $TEMPLATE_WRITTEN written, $TEMPLATE_UNCHANGED unchanged"
 fi
 
 # Create local symlinks
@@ -599,6 +601,12 @@ if [[ "$NO_REGISTRY" != true && "$DRY_RUN" != true ]]; then
   else
     register_installation "$TARGET_PATH" "$PROJECT_TYPE" "$VERSION" "symlink"
   fi
+  # Record installed links/copies so update-config.sh can diff instead of rescanning
+  if [[ "$COPY_MODE" == true ]]; then
+    manifest_write "$TARGET_PATH" "copy" false false
+  else
+    manifest_write "$TARGET_PATH" "symlink" false false
+  fi
 fi
 
 # Persist AGENTIC_CONFIG_PATH to all locations
@@ -5,19 +5,22 @@ set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(dirname "$SCRIPT_DIR")"
-LATEST_VERSION=$(cat "$REPO_ROOT/VERSION")
+IFS= read -r LATEST_VERSION < "$REPO_ROOT/VERSION" || true
 
 # Source utilities
 source "$SCRIPT_DIR/lib/version-manager.sh"
 source "$SCRIPT_DIR/lib/path-persistence.sh"
 source "$SCRIPT_DIR/lib/mcp-manager.sh"
+source "$SCRIPT_DIR/lib/install-manifest.sh"
+source "$REPO_ROOT/core/lib/agentic-root.sh"
 
 # Dynamically discover all available commands from core directory
 discover_available_commands() {
   local cmds=()
   for f in "$REPO_ROOT/core/commands/claude/"*.md; do
     [[ ! -f "$f" ]] && continue
-    local name=$(basename "$f" .md)
+    local name="${f##*/}"
+    name="${name%.md}"
     # Skip agentic-* commands (globally installed)
     [[ "$name" == agentic-* ]] && continue
     cmds+=("$name")
@@ -30,7 +33,8 @@ discover_all_commands() {
   local cmds=()
   for f in "$REPO_ROOT/core/commands/claude/"*.md; do
     [[ ! -f "$f" ]] && continue
-    cmds+=("$(basename "$f" .md)")
+    local name="${f##*/}"
+    cmds+=("${name%.md}")
   done
   echo "${cmds[@]}"
 }
@@ -67,7 +71,8 @@ cleanup_invalid_nested_symlinks() {
   # Remove self-referential symlinks in skills
   for skill_dir in "$target/core/skills/"*/; do
     [[ ! -d "$skill_dir" ]] && continue
-    local skill_name=$(basename "$skill_dir")
+    local skill_name="${skill_dir%/}"
+    skill_name="${skill_name##*/}"
     local invalid_link="${skill_dir}${skill_name}"
     if [[ -L "$invalid_link" ]]; then
       rm -f "$invalid_link"
@@ -95,6 +100,7 @@ sync_self_hosted_commands() {
   local missing=()
 
   echo "Self-hosted repo detected - syncing ALL command symlinks..."
+  [[ -d "$target/.claude/commands" ]] || mkdir -p "$target/.claude/commands"
 
   for cmd in "${all_cmds[@]}"; do
     local src="$REPO_ROOT/core/commands/claude/$cmd.md"
@@ -147,7 +153,7 @@ sync_self_hosted_hooks() {
 
   for hook_file in "$REPO_ROOT/core/hooks/pretooluse/"*.py; do
     [[ ! -f "$hook_file" ]] && continue
-    local hook=$(basename "$hook_file")
+    local hook="${hook_file##*/}"
     local dest="$target/.claude/hooks/pretooluse/$hook"
 
     if [[ ! -L "$dest" ]]; then
@@ -165,7 +171,9 @@ sync_self_hosted_hooks() {
     fi
   done
 
-  [[ $synced -eq 0 ]] && echo "  (all hooks already symlinked)"
+  if [[ $synced -eq 0 ]]; then
+    echo "  (all hooks already symlinked)"
+  fi
 }
 
 # Skills: all directories in core/skills/
@@ -173,8 +181,8 @@ discover_available_skills() {
   local skills=()
   for d in "$REPO_ROOT/core/skills/"*/; do
     [[ ! -d "$d" ]] && continue
-    local name=$(basename "$d")
-    skills+=("$name")
+    local name="${d%/}"
+    skills+=("${name##*/}")
   done
   echo "${skills[@]}"
 }
@@ -188,10 +196,13 @@ FORCE=false
 NIGHTLY=false
 MCP_SERVERS=""
 TOOLS="all"
+FLEET=false
+JOBS=4
 
 usage() {
   cat <<EOF
 Usage: update-config.sh [OPTIONS] [target_path]
+       update-config.sh --all [--jobs N] [--force|--nightly]
 
 Update agentic configuration to latest version from central repository.
 
@@ -201,6 +212,8 @@ Options:
   --mcp <servers>        MCP servers to install (comma-separated, e.g., playwright)
   --tools <claude,gemini,codex,all>
                          Which AI tool configs to use for MCP (default: all)
+  --all                  Update every installation in the central registry (fleet mode)
+  --jobs <N>             Concurrent projects in fleet mode (default: 4)
   -h, --help             Show this help message
 
 Notes:
@@ -208,10 +221,12 @@ Notes:
   - Copied files (.agent/config.yml, AGENTS.md) require manual review
   - If target_path not specified, uses current directory
   - Nightly mode updates config schema to latest even when version matches
+  - Fleet mode skips projects already at the latest version (unless --force/--nightly)
 EOF
 }
 
-# Parse arguments
+# Parse arguments (kept for re-running under the project lock)
+ORIGINAL_ARGS=("$@")
 TARGET_PATH="."
 while [[ $# -gt 0 ]]; do
   case $1 in
@@ -231,6 +246,14 @@ while [[ $# -gt 0 ]]; do
       TOOLS="$2"
       shift 2
       ;;
+    --all)
+      FLEET=true
+      shift
+      ;;
+    --jobs)
+      JOBS="$2"
+      shift 2
+      ;;
     -h|--help)
       usage
       exit 0
@@ -247,6 +270,20 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+# Fleet mode: update all registered installations concurrently
+if [[ "$FLEET" == true ]]; then
+  if [[ -n "$MCP_SERVERS" ]]; then
+    # Codex MCP config is global - concurrent workers would race on it
+    echo "ERROR: --mcp is not supported with --all (run per project)" >&2
+    exit 1
+  fi
+  source "$SCRIPT_DIR/lib/fleet-update.sh"
+  FLEET_ARGS=()
+  [[ "$FORCE" == true ]] && FLEET_ARGS+=("--force")
+  [[ "$NIGHTLY" == true ]] && FLEET_ARGS+=("--nightly")
+  update_fleet "$JOBS" "${FLEET_ARGS[@]+"${FLEET_ARGS[@]}"}" && exit 0 || exit 1
+fi
+
 # Function to clean up orphaned symlinks
 # Returns count via stdout (no other output to stdout)
 cleanup_orphan_symlinks() {
@@ -259,7 +296,7 @@ cleanup_orphan_symlinks() {
       if [[ -L "$link" && ! -e "$link" ]]; then
         rm "$link"
         # Progress to stderr so it doesn't interfere with count capture
-        echo "  Removed orphan: $(basename "$link")" >&2
+        echo "  Removed orphan: ${link##*/}" >&2
         ((removed++)) || true
       fi
     done
@@ -267,6 +304,47 @@ cleanup_orphan_symlinks() {
   echo "$removed"
 }
 
+# Compare two files byte-for-byte without forking (small text assets)
+files_identical() {
+  local a="" b=""
+  [[ -f "$1" && -f "$2" ]] || return 1
+  IFS= read -r -d '' a < "$1" || true
+  IFS= read -r -d '' b < "$2" || true
+  [[ "$a" == "$b" ]]
+}
+
+# Take the per-project lock (shared with fleet workers) before the first write
+# A no-op update never calls this, so it stays write-free. If another update holds
+# the lock, wait for it and re-run from the top so the plan reflects its result.
+PROJECT_LOCKED=false
+lock_project() {
+  [[ "$PROJECT_LOCKED" == true ]] && return 0
+  local lockdir="$TARGET_PATH/.agentic-lock"
+
+  # Fleet worker (or our waiting parent) already holds it on our behalf
+  if [[ "${AGENTIC_UPDATE_LOCK_HELD:-}" == "$lockdir" ]]; then
+    PROJECT_LOCKED=true
+    return 0
+  fi
+
+  if mkdir "$lockdir" 2>/dev/null; then
+    PROJECT_LOCKED=true
+    trap '_release_lock "$TARGET_PATH/.agentic-lock"' EXIT
+    return 0
+  fi
+
+  echo "Waiting for another update of $TARGET_PATH..."
+  if ! _acquire_lock "$lockdir" 30; then
+    echo "   Remove $lockdir if no other update is running" >&2
+    exit 1
+  fi
+  local rc=0
+  AGENTIC_UPDATE_LOCK_HELD="$lockdir" \
+    bash "$SCRIPT_DIR/update-config.sh" ${ORIGINAL_ARGS[@]+"${ORIGINAL_ARGS[@]}"} || rc=$?
+  _release_lock "$lockdir"
+  exit $rc
+}
+
 # Function to migrate customizations to PROJECT_AGENTS.md
 migrate_to_project_agents() {
   local target="$1"
@@ -317,8 +395,10 @@ if [[ ! -f "$TARGET_PATH/.agentic-config.json" ]]; then
   exit 1
 fi
 
-CURRENT_VERSION=$(check_version "$TARGET_PATH")
-INSTALL_MODE=$(get_install_mode "$TARGET_PATH")
+# Single pure-bash pass over .agentic-config.json (falls back to jq if unparsed)
+manifest_load "$TARGET_PATH" || true
+CURRENT_VERSION="${CONFIG_VERSION:-$(check_version "$TARGET_PATH")}"
+INSTALL_MODE="${CONFIG_INSTALL_MODE:-$(get_install_mode "$TARGET_PATH")}"
 
 # Validate INSTALL_MODE
 if [[ "$INSTALL_MODE" != "symlink" && "$INSTALL_MODE" != "copy" ]]; then
@@ -333,10 +413,22 @@ echo "   Current version: $CURRENT_VERSION"
 echo "   Latest version:  $LATEST_VERSION"
 echo "   Install mode:    $INSTALL_MODE"
 
-# Fix Codex symlink if needed (run even if versions match)
-if [[ -L "$TARGET_PATH/.codex/prompts/spec.md" ]]; then
+# Check if target IS the repo root (self-hosted mode for relative symlinks)
+IS_SELF_HOSTED=false
+if [[ "$TARGET_PATH" == "$REPO_ROOT" ]]; then
+  IS_SELF_HOSTED=true
+fi
+SELF_HOSTED_REPO=false
+if is_self_hosted "$TARGET_PATH"; then
+  SELF_HOSTED_REPO=true
+fi
+
+# Fix Codex symlink if needed (run even if versions match; skipped once recorded)
+manifest_link ".codex/prompts/spec.md" || true
+if [[ -L "$TARGET_PATH/.codex/prompts/spec.md" && "$MANIFEST_VALUE" != "$REPO_ROOT/core/commands/codex/spec.md" ]]; then
   CURRENT_TARGET=$(readlink "$TARGET_PATH/.codex/prompts/spec.md")
   if [[ "$CURRENT_TARGET" == *"spec-command.md" ]]; then
+    lock_project
     echo "Fixing Codex spec symlink..."
     if [[ "$INSTALL_MODE" == "copy" ]]; then
       rm -f "$TARGET_PATH/.codex/prompts/spec.md"
@@ -348,17 +440,29 @@ if [[ -L "$TARGET_PATH/.codex/prompts/spec.md" ]]; then
   fi
 fi
 
-# CRITICAL: Self-hosted repo sync (always run to catch new commands)
-if is_self_hosted "$TARGET_PATH"; then
+# Diff expected commands/skills/hooks against the install manifest (no writes)
+manifest_plan "$TARGET_PATH" "$INSTALL_MODE" "$SELF_HOSTED_REPO" "$IS_SELF_HOSTED"
+for modified in ${MANIFEST_MODIFIED[@]+"${MANIFEST_MODIFIED[@]}"}; do
+  echo "WARNING: $modified was modified locally - leaving it unchanged (delete it to restore the shipped version)" >&2
+done
+
+# CRITICAL: Self-hosted repo sync (catches new commands; skipped when manifest is current)
+if [[ "$SELF_HOSTED_REPO" == true ]]; then
+  lock_project
   # Clean up any invalid nested symlinks first
   cleanup_invalid_nested_symlinks "$TARGET_PATH"
-  sync_self_hosted_commands "$TARGET_PATH"
-  sync_self_hosted_hooks "$TARGET_PATH"
+  if [[ $MANIFEST_CHANGES -eq 0 ]]; then
+    echo "Self-hosted repo detected - all symlinks match install manifest"
+  else
+    sync_self_hosted_commands "$TARGET_PATH"
+    sync_self_hosted_hooks "$TARGET_PATH"
+  fi
 fi
 
 # Handle version match - but still check for missing assets/orphans
 if [[ "$CURRENT_VERSION" == "$LATEST_VERSION" ]]; then
   if [[ "$NIGHTLY" == true ]]; then
+    lock_project
     echo "Nightly mode: reconciling config and rebuilding symlinks..."
     echo ""
     echo "Reconciling configuration..."
@@ -369,45 +473,22 @@ if [[ "$CURRENT_VERSION" == "$LATEST_VERSION" ]]; then
     # Continue to template check section (don't exit)
   else
     echo "Already up to date!"
-    # Still check for missing commands/skills and clean orphans
+    # Still check for missing commands/skills/hooks and orphans via the manifest diff
     # This handles cases where user manually deleted files
     NEED_MAINTENANCE=false
+    if [[ $MANIFEST_CHANGES -gt 0 ]]; then
+      NEED_MAINTENANCE=true
+    fi
 
-    # Check for missing commands
-    for cmd in "${AVAILABLE_CMDS[@]}"; do
-      if [[ -f "$REPO_ROOT/core/commands/claude/$cmd.md" ]] && [[ ! -e "$TARGET_PATH/.claude/commands/$cmd.md" ]]; then
-        NEED_MAINTENANCE=true
-        break
-      fi
-    done
-
-    # Check for missing skills
+    # Check if config needs reconciliation (missing fields)
     if [[ "$NEED_MAINTENANCE" == false ]]; then
-      for skill in "${AVAILABLE_SKILLS[@]}"; do
-        if [[ -d "$REPO_ROOT/core/skills/$skill" ]] && [[ ! -e "$TARGET_PATH/.claude/skills/$skill" ]]; then
+      if [[ -n "$CONFIG_VERSION" ]]; then
+        [[ -z "$CONFIG_GLOBAL_PATH" ]] && NEED_MAINTENANCE=true
+      elif command -v jq >/dev/null 2>&1; then
+        config="$TARGET_PATH/.agentic-config.json"
+        if [[ ! $(jq -r '.agentic_global_path // empty' "$config") ]]; then
           NEED_MAINTENANCE=true
-          break
         fi
-      done
-    fi
-
-    # Check for orphan symlinks
-    if [[ "$NEED_MAINTENANCE" == false ]]; then
-      if [[ -d "$TARGET_PATH/.claude/commands" ]]; then
-        for link in "$TARGET_PATH/.claude/commands"/*; do
-          if [[ -L "$link" && ! -e "$link" ]]; then
-            NEED_MAINTENANCE=true
-            break
-          fi
-        done
-      fi
-    fi
-
-    # Check if config needs reconciliation (missing fields)
-    if [[ "$NEED_MAINTENANCE" == false ]] && command -v jq >/dev/null 2>&1; then
-      config="$TARGET_PATH/.agentic-config.json"
-      if [[ ! $(jq -r '.agentic_global_path // empty' "$config") ]]; then
-        NEED_MAINTENANCE=true
       fi
     fi
 
@@ -422,12 +503,18 @@ if [[ "$CURRENT_VERSION" == "$LATEST_VERSION" ]]; then
       exit 0
     else
       echo "Performing maintenance (restoring missing assets, cleaning orphans)..."
+      for change in ${MANIFEST_CHANGED[@]+"${MANIFEST_CHANGED[@]}"}; do
+        echo "   $change"
+      done
       echo ""
       # Continue to maintenance section below
     fi
   fi
 fi
 
+# Everything below writes to the project
+lock_project
+
 # Get project type from config
 if command -v jq &>/dev/null; then
   PROJECT_TYPE=$(jq -r '.project_type' "$TARGET_PATH/.agentic-config.json")
@@ -594,10 +681,12 @@ if [[ "$INSTALL_MODE" == "copy" && "$CURRENT_VERSION" != "$LATEST_VERSION" ]]; t
     fi
   fi
 
-  # Copy all commands
+  # Copy all commands (skip files already identical to the source or edited locally)
   for cmd_file in "$REPO_ROOT/core/commands/claude/"*.md; do
-    cmd=$(basename "$cmd_file")
+    cmd="${cmd_file##*/}"
     if [[ -f "$TARGET_PATH/.claude/commands/$cmd" && ! -L "$TARGET_PATH/.claude/commands/$cmd" ]]; then
+      files_identical "$cmd_file" "$TARGET_PATH/.claude/commands/$cmd" && continue
+      manifest_is_modified ".claude/commands/$cmd" && continue
       cp "$cmd_file" "$TARGET_PATH/.claude/commands/$cmd"
       REPLACED_ITEMS+=(".claude/commands/$cmd")
     fi
@@ -605,7 +694,8 @@ if [[ "$INSTALL_MODE" == "copy" && "$CURRENT_VERSION" != "$LATEST_VERSION" ]]; t
 
   # Copy all skills
   for skill_dir in "$REPO_ROOT/core/skills/"*/; do
-    skill=$(basename "$skill_dir")
+    skill="${skill_dir%/}"
+    skill="${skill##*/}"
     if [[ -d "$TARGET_PATH/.claude/skills/$skill" && ! -L "$TARGET_PATH/.claude/skills/$skill" ]]; then
       # Verify backup exists before destructive operation
       if [[ -d "$COPY_BACKUP_DIR/.claude/skills/$skill" ]]; then
@@ -632,12 +722,6 @@ if [[ "$INSTALL_MODE" == "copy" && "$CURRENT_VERSION" != "$LATEST_VERSION" ]]; t
   echo "   Backup location: $COPY_BACKUP_DIR"
 fi
 
-# Check if target IS the repo root (self-hosted mode for relative symlinks)
-IS_SELF_HOSTED=false
-if [[ "$(cd "$TARGET_PATH" && pwd)" == "$REPO_ROOT" ]]; then
-  IS_SELF_HOSTED=true
-fi
-
 # Install all commands from core (respect install_mode)
 echo ""
 echo "Installing commands..."
@@ -719,7 +803,7 @@ mkdir -p "$TARGET_PATH/.claude/hooks/pretooluse"
 HOOKS_INSTALLED=0
 for hook_file in "$REPO_ROOT/core/hooks/pretooluse/"*.py; do
   [[ ! -f "$hook_file" ]] && continue
-  hook=$(basename "$hook_file")
+  hook="${hook_file##*/}"
   if [[ ! -e "$TARGET_PATH/.claude/hooks/pretooluse/$hook" ]]; then
     if [[ "$INSTALL_MODE" == "copy" ]]; then
       cp "$hook_file" "$TARGET_PATH/.claude/hooks/pretooluse/$hook"
@@ -742,10 +826,10 @@ done
 echo "Verifying hook registration in settings.json..."
 SETTINGS_FILE="$TARGET_PATH/.claude/settings.json"
 
-# Backup SETTINGS_FILE before modify (if it exists)
-if [[ -f "$SETTINGS_FILE" ]]; then
+# Backup SETTINGS_FILE before modify (only when it is about to change)
+backup_settings_file() {
   cp "$SETTINGS_FILE" "$SETTINGS_FILE.bak.$(date +%s)" 2>/dev/null || true
-fi
+}
 
 HOOK_CONFIG="{
   \"hooks\": {
@@ -777,6 +861,7 @@ elif command -v jq &>/dev/null; then
 
   if [[ -z "$CURRENT_COMMAND" ]]; then
     # No dry-run-guard hook found - add it
+    backup_settings_file
     jq --argjson hook "$HOOK_CONFIG" '
       .hooks = (.hooks // {}) |
       .hooks.PreToolUse = ((.hooks.PreToolUse // []) + $hook.hooks.PreToolUse)
@@ -785,6 +870,7 @@ elif command -v jq &>/dev/null; then
     HOOK_REGISTERED=true
   elif [[ "$CURRENT_COMMAND" != "$EXPECTED_COMMAND" ]]; then
     # Hook exists but command differs - replace it
+    backup_settings_file
     jq --arg expected "$EXPECTED_COMMAND" '
       .hooks.PreToolUse = [.hooks.PreToolUse[] |
         if (.hooks | any(.command | contains("dry-run-guard"))) then
@@ -825,6 +911,15 @@ if [[ "${ORPHANS:-0}" -gt 0 ]]; then
   echo "  Cleaned $ORPHANS orphan skill symlink(s)"
 fi
 
+ORPHANS=$(cleanup_orphan_symlinks "$TARGET_PATH" ".claude/hooks/pretooluse")
+if [[ "${ORPHANS:-0}" -gt 0 ]]; then
+  echo "  Cleaned $ORPHANS orphan hook symlink(s)"
+fi
+
+# Apply the rest of the manifest diff: stale links and deleted setup extras
+manifest_prune_stale "$TARGET_PATH"
+manifest_restore_extras "$TARGET_PATH" "$INSTALL_MODE"
+
 # Reconcile config and update version (only after all operations complete)
 # Run when: version mismatch, force mode, nightly mode, or maintenance detected missing fields
 if [[ "$CURRENT_VERSION" != "$LATEST_VERSION" ]]; then
@@ -841,6 +936,9 @@ elif [[ "${NEED_MAINTENANCE:-false}" == true ]]; then
   reconcile_config "$TARGET_PATH" "$CURRENT_VERSION"
 fi
 
+# Record what is installed so the next run can diff instead of rescanning
+manifest_write "$TARGET_PATH" "$INSTALL_MODE" "$SELF_HOSTED_REPO" "$IS_SELF_HOSTED"
+
 # Refresh path persistence (ensure all locations are up to date)
 echo "Refreshing path persistence..."
 
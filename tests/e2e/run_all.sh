@@ -1,23 +1,84 @@
 #!/usr/bin/env bash
 # E2E Test Suite Runner
-# Runs all E2E tests and generates comprehensive report
+# Runs all E2E tests in parallel, each job isolated, and generates a timing report
 
 set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
 
-# Colors
-RED='\033[0;31m'
-GREEN='\033[0;32m'
-YELLOW='\033[0;33m'
-BLUE='\033[0;34m'
-NC='\033[0m'
+source "$SCRIPT_DIR/test_utils.sh"
 
-# Test results tracking
-TOTAL_PASS=0
-TOTAL_FAIL=0
-SUITE_RESULTS=()
+# Suites in run order ("script|name"); restricted shell first - catches bootstrap issues early
+SUITES=(
+  "test_restricted_shell.sh|Restricted Shell Compatibility"
+  "test_install.sh|install.sh Tests"
+  "test_setup.sh|/agentic setup Tests"
+  "test_update.sh|/agentic update Tests"
+  "test_migrate.sh|/agentic migrate Tests"
+  "test_external_specs.sh|External Specs Tests"
+)
+
+# Defaults
+JOBS=4
+SPLIT_CASES=false
+VERBOSE=false
+SLOWEST=10
+TIMING_FILE=""
+
+usage() {
+  cat <<EOF
+Usage: run_all.sh [OPTIONS]
+
+Options:
+  --jobs <N>            Run up to N jobs in parallel (default: $JOBS; 1 = serial)
+  --cases               Run each test case as its own job (finer-grained parallelism)
+  --slowest <N>         Number of slowest cases to report (default: $SLOWEST)
+  --timing-file <path>  Timing report path (default: outputs/e2e/timing-<timestamp>.json)
+  --verbose             Print output of every job, not only failed ones
+  -h, --help            Show this help
+
+Every job gets a private HOME, TMPDIR and agentic-config checkout (AGENTIC_CONFIG_PATH).
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case $1 in
+    --jobs)
+      if [[ -z "${2:-}" || ! "$2" =~ ^[1-9][0-9]*$ ]]; then
+        echo -e "${RED}ERROR: --jobs requires a positive integer${NC}" >&2
+        exit 1
+      fi
+      JOBS="$2"
+      shift 2
+      ;;
+    --cases)
+      SPLIT_CASES=true
+      shift
+      ;;
+    --slowest)
+      SLOWEST="${2:?--slowest requires a number}"
+      shift 2
+      ;;
+    --timing-file)
+      TIMING_FILE="${2:?--timing-file requires a path}"
+      shift 2
+      ;;
+    --verbose)
+      VERBOSE=true
+      shift
+      ;;
+    -h|--help)
+      usage
+      exit 0
+      ;;
+    *)
+      echo -e "${RED}ERROR: Unknown option: $1${NC}" >&2
+      usage >&2
+      exit 1
+      ;;
+  esac
+done
 
 # Banner
 echo -e "${BLUE}========================================${NC}"
@@ -50,72 +111,170 @@ if [[ ! -f "$REPO_ROOT/VERSION" ]]; then
 fi
 echo -e "${GREEN}✓${NC} Repository structure valid"
 
+WORK_DIR=$(mktemp -d "${TMPDIR:-/tmp}/agentic-e2e.XXXXXX")
+
+# Build the job list: one job per suite, or one per case with --cases
+JOB_SUITES=()
+JOB_CASES=()
+suite_idx=0
+for suite in "${SUITES[@]}"; do
+  script="${suite%%|*}"
+  if [[ "$SPLIT_CASES" == true ]]; then
+    while IFS= read -r case_name; do
+      [[ "$case_name" =~ ^test_[A-Za-z0-9_]+$ ]] || continue
+      JOB_SUITES+=("$suite_idx")
+      JOB_CASES+=("$case_name")
+    done < <(cd "$WORK_DIR" && E2E_LIST_CASES=true HOME="$WORK_DIR" bash "$SCRIPT_DIR/$script" 2>/dev/null)
+  else
+    JOB_SUITES+=("$suite_idx")
+    JOB_CASES+=("")
+  fi
+  ((suite_idx++)) || true
+done
+
 echo ""
-echo "==> Running Test Suites"
+echo "==> Running ${#SUITES[@]} suites as ${#JOB_SUITES[@]} job(s), $JOBS in parallel"
 echo ""
 
-# Run test suite helper
-run_test_suite() {
-  local test_script="$1"
-  local suite_name="$2"
+# Run one job in a private environment
+# Usage: run_job <job_index>
+# Writes: job.<index>/{log,timing.tsv,exit,wall_ms}
+run_job() {
+  local job="$1"
+  local job_dir="$WORK_DIR/job.$job"
+  local script="${SUITES[${JOB_SUITES[$job]}]%%|*}"
+  local checkout="$job_dir/agentic-config"
+  local start exit_code=0
 
-  echo -e "${BLUE}==> Running: $suite_name${NC}"
-  echo ""
+  mkdir -p "$job_dir/home" "$job_dir/tmp"
+  : > "$job_dir/timing.tsv"
+  start=$(_now_ms)
+  (
+    # Private checkout: suites resolve REPO_ROOT and the installation from it
+    cp -R "$REPO_ROOT" "$checkout"
+    cd "$checkout"
+    HOME="$job_dir/home" \
+    TMPDIR="$job_dir/tmp" \
+    XDG_CONFIG_HOME="$job_dir/home/.config" \
+    XDG_CACHE_HOME="$job_dir/home/.cache" \
+    AGENTIC_CONFIG_PATH="$checkout" \
+    E2E_CASES="${JOB_CASES[$job]}" \
+    E2E_TIMING_FILE="$job_dir/timing.tsv" \
+    bash "$checkout/tests/e2e/$script"
+  ) > "$job_dir/log" 2>&1 || exit_code=$?
+  echo "$exit_code" > "$job_dir/exit"
+  echo "$(( $(_now_ms) - start ))" > "$job_dir/wall_ms"
+}
 
-  local exit_code=0
-  if bash "$test_script"; then
-    exit_code=0
-    SUITE_RESULTS+=("${GREEN}PASS${NC}|$suite_name")
-  else
-    exit_code=$?
-    SUITE_RESULTS+=("${RED}FAIL${NC}|$suite_name|Exit code: $exit_code")
-  fi
+# Bounded worker pool
+RUN_START=$(_now_ms)
+pids=()
+for ((job = 0; job < ${#JOB_SUITES[@]}; job++)); do
+  while [[ ${#pids[@]} -ge $JOBS ]]; do
+    alive=()
+    for pid in "${pids[@]}"; do
+      if kill -0 "$pid" 2>/dev/null; then
+        alive+=("$pid")
+      else
+        wait "$pid" 2>/dev/null || true
+      fi
+    done
+    pids=("${alive[@]+"${alive[@]}"}")
+    [[ ${#pids[@]} -ge $JOBS ]] && sleep 0.1
+  done
 
-  echo ""
-  return $exit_code
-}
+  run_job "$job" &
+  pids+=("$!")
+done
+for pid in "${pids[@]+"${pids[@]}"}"; do
+  wait "$pid" 2>/dev/null || true
+done
+RUN_MS=$(( $(_now_ms) - RUN_START ))
 
-# Track overall pass/fail
-SUITES_PASSED=0
-SUITES_FAILED=0
+# Collect results per suite and per case
+# cases.tsv: suite_idx<TAB>case<TAB>duration_ms<TAB>passed<TAB>failed<TAB>status
+SUITE_STATUS=()
+SUITE_PASSED=()
+SUITE_FAILED=()
+SUITE_MS=()
+for ((s = 0; s < ${#SUITES[@]}; s++)); do
+  SUITE_STATUS+=("PASS"); SUITE_PASSED+=(0); SUITE_FAILED+=(0); SUITE_MS+=(0)
+done
+: > "$WORK_DIR/cases.tsv"
 
-# Run all test suites
-# Restricted shell tests FIRST - catches bootstrap issues before other tests
-if run_test_suite "$SCRIPT_DIR/test_restricted_shell.sh" "Restricted Shell Compatibility"; then
-  ((SUITES_PASSED++)) || true
-else
-  ((SUITES_FAILED++)) || true
-fi
+for ((job = 0; job < ${#JOB_SUITES[@]}; job++)); do
+  job_dir="$WORK_DIR/job.$job"
+  s="${JOB_SUITES[$job]}"
+  exit_code=$(< "$job_dir/exit")
+  wall_ms=$(< "$job_dir/wall_ms")
+  SUITE_MS[$s]=$(( SUITE_MS[$s] + wall_ms ))
 
-if run_test_suite "$SCRIPT_DIR/test_install.sh" "install.sh Tests"; then
-  ((SUITES_PASSED++)) || true
-else
-  ((SUITES_FAILED++)) || true
-fi
+  seen_case=false
+  while IFS=$'\t' read -r case_name ms passed failed; do
+    [[ -n "$case_name" ]] || continue
+    seen_case=true
+    status="PASS"
+    [[ $failed -gt 0 ]] && status="FAIL"
+    SUITE_PASSED[$s]=$(( SUITE_PASSED[$s] + passed ))
+    SUITE_FAILED[$s]=$(( SUITE_FAILED[$s] + failed ))
+    printf '%s\t%s\t%s\t%s\t%s\t%s\n' "$s" "$case_name" "$ms" "$passed" "$failed" "$status" >> "$WORK_DIR/cases.tsv"
+  done < "$job_dir/timing.tsv"
 
-if run_test_suite "$SCRIPT_DIR/test_setup.sh" "/agentic setup Tests"; then
-  ((SUITES_PASSED++)) || true
-else
-  ((SUITES_FAILED++)) || true
-fi
+  # A case that aborted its script never recorded timing
+  if [[ "$exit_code" != 0 && -n "${JOB_CASES[$job]}" && "$seen_case" == false ]]; then
+    printf '%s\t%s\t%s\t0\t0\tERROR\n' "$s" "${JOB_CASES[$job]}" "$wall_ms" >> "$WORK_DIR/cases.tsv"
+  fi
 
-if run_test_suite "$SCRIPT_DIR/test_update.sh" "/agentic update Tests"; then
-  ((SUITES_PASSED++)) || true
-else
-  ((SUITES_FAILED++)) || true
-fi
+  if [[ "$exit_code" != 0 ]]; then
+    SUITE_STATUS[$s]="FAIL"
+  fi
 
-if run_test_suite "$SCRIPT_DIR/test_migrate.sh" "/agentic migrate Tests"; then
-  ((SUITES_PASSED++)) || true
-else
-  ((SUITES_FAILED++)) || true
-fi
+  if [[ "$exit_code" != 0 || "$VERBOSE" == true ]]; then
+    label="${SUITES[$s]#*|}"
+    [[ -n "${JOB_CASES[$job]}" ]] && label+=" :: ${JOB_CASES[$job]}"
+    echo -e "${BLUE}==> Output: $label (exit $exit_code)${NC}"
+    cat "$job_dir/log"
+    echo ""
+  fi
+done
 
-if run_test_suite "$SCRIPT_DIR/test_external_specs.sh" "External Specs Tests"; then
-  ((SUITES_PASSED++)) || true
-else
-  ((SUITES_FAILED++)) || true
+# Machine-readable timing report
+json_str() {
+  local value="${1//\\/\\\\}"
+  printf '"%s"' "${value//\"/\\\"}"
+}
+
+if [[ -z "$TIMING_FILE" ]]; then
+  TIMING_FILE="$REPO_ROOT/outputs/e2e/timing-$(date -u +%Y%m%dT%H%M%SZ).json"
 fi
+mkdir -p "$(dirname "$TIMING_FILE")"
+{
+  echo "{"
+  echo "  \"timestamp\": $(json_str "$(date -u +%Y-%m-%dT%H:%M:%SZ)"),"
+  echo "  \"version\": $(json_str "$(< "$REPO_ROOT/VERSION")"),"
+  echo "  \"git_sha\": $(json_str "$(git -C "$REPO_ROOT" rev-parse --short HEAD 2>/dev/null || echo unknown)"),"
+  echo "  \"jobs\": $JOBS,"
+  echo "  \"mode\": \"$([[ "$SPLIT_CASES" == true ]] && echo case || echo suite)\","
+  echo "  \"wall_ms\": $RUN_MS,"
+  echo "  \"suites\": ["
+  for ((s = 0; s < ${#SUITES[@]}; s++)); do
+    sep=","
+    [[ $s -eq $(( ${#SUITES[@]} - 1 )) ]] && sep=""
+    echo "    {\"script\": $(json_str "${SUITES[$s]%%|*}"), \"name\": $(json_str "${SUITES[$s]#*|}"), \"status\": \"${SUITE_STATUS[$s]}\", \"duration_ms\": ${SUITE_MS[$s]}, \"passed\": ${SUITE_PASSED[$s]}, \"failed\": ${SUITE_FAILED[$s]}}$sep"
+  done
+  echo "  ],"
+  echo "  \"cases\": ["
+  first=true
+  while IFS=$'\t' read -r s case_name ms passed failed status; do
+    [[ "$first" == true ]] || echo ","
+    first=false
+    printf '    {"suite": %s, "case": %s, "status": "%s", "duration_ms": %s, "passed": %s, "failed": %s}' \
+      "$(json_str "${SUITES[$s]%%|*}")" "$(json_str "$case_name")" "$status" "$ms" "$passed" "$failed"
+  done < "$WORK_DIR/cases.tsv"
+  [[ "$first" == true ]] || echo ""
+  echo "  ]"
+  echo "}"
+} > "$TIMING_FILE"
 
 # Final Summary
 echo ""
@@ -124,29 +283,48 @@ echo -e "${BLUE}E2E Test Suite Summary${NC}"
 echo -e "${BLUE}========================================${NC}"
 echo ""
 
+SUITES_PASSED=0
+SUITES_FAILED=0
 echo "Suite Results:"
-for result in "${SUITE_RESULTS[@]}"; do
-  IFS='|' read -r status name info <<< "$result"
-  if [[ -n "$info" ]]; then
-    echo -e "  $status $name ($info)"
+for ((s = 0; s < ${#SUITES[@]}; s++)); do
+  ms="${SUITE_MS[$s]}"
+  if [[ "${SUITE_STATUS[$s]}" == "PASS" ]]; then
+    status="${GREEN}PASS${NC}"
+    ((SUITES_PASSED++)) || true
   else
-    echo -e "  $status $name"
+    status="${RED}FAIL${NC}"
+    ((SUITES_FAILED++)) || true
   fi
+  printf "  %b %-32s %4s passed %3s failed %7s.%01ds\n" "$status" "${SUITES[$s]#*|}" \
+    "${SUITE_PASSED[$s]}" "${SUITE_FAILED[$s]}" "$(( ms / 1000 ))" "$(( ms % 1000 / 100 ))"
 done
 
+if [[ -s "$WORK_DIR/cases.tsv" && $SLOWEST -gt 0 ]]; then
+  echo ""
+  echo "Slowest cases:"
+  while IFS=$'\t' read -r s case_name ms passed failed status; do
+    printf "  %7s.%01ds  %-6s %s :: %s\n" "$(( ms / 1000 ))" "$(( ms % 1000 / 100 ))" "$status" \
+      "${SUITES[$s]%%|*}" "$case_name"
+  done < <(sort -t$'\t' -k3,3nr "$WORK_DIR/cases.tsv" | head -n "$SLOWEST")
+fi
+
 echo ""
 echo "Overall:"
 echo -e "  Suites Passed: ${GREEN}$SUITES_PASSED${NC}"
 echo -e "  Suites Failed: ${RED}$SUITES_FAILED${NC}"
+echo "  Wall time: $(( RUN_MS / 1000 )).$(( RUN_MS % 1000 / 100 ))s ($JOBS job(s))"
+echo "  Timing report: $TIMING_FILE"
 
 echo ""
 echo -e "${BLUE}========================================${NC}"
 
-# Exit with failure if any suite failed
+# Exit with failure if any suite failed (logs kept for inspection)
 if [[ $SUITES_FAILED -gt 0 ]]; then
+  echo "Job logs kept in: $WORK_DIR"
   echo -e "${RED}E2E tests FAILED${NC}"
   exit 1
 else
+  rm -rf "$WORK_DIR"
   echo -e "${GREEN}All E2E tests PASSED${NC}"
   exit 0
 fi
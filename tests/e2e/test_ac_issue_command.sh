@@ -130,15 +130,16 @@ test_issue_symlink_valid() {
 }
 
 # Run all tests
-test_issue_command_exists
-test_issue_frontmatter_valid
-test_issue_target_repo
-test_issue_auth_verification
-test_issue_preview_confirmation
-test_issue_sanitization
-test_issue_input_modes
-test_issue_environment_collection
-test_issue_error_handling
-test_issue_symlink_valid
+run_tests \
+  test_issue_command_exists \
+  test_issue_frontmatter_valid \
+  test_issue_target_repo \
+  test_issue_auth_verification \
+  test_issue_preview_confirmation \
+  test_issue_sanitization \
+  test_issue_input_modes \
+  test_issue_environment_collection \
+  test_issue_error_handling \
+  test_issue_symlink_valid
 
 print_test_summary "/ac-issue Command E2E Tests"
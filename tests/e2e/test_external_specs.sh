@@ -867,23 +867,174 @@ EOF
 }
 
 # Run all tests
-test_git_url_validation
-test_path_traversal_rejection
-test_safe_env_parsing
-test_config_priority
-test_compare_versions
 # TODO: Fix dry-run tests - bootstrap issue when sourcing from temp dir
-# test_dry_run_init
-# test_dry_run_commit
-test_ext_specs_init
-test_ext_specs_commit_rollback
-test_empty_local_path_default
-test_agentic_root_fallback
-test_logic_inversion_fix
-test_config_state_leak_fix
-test_partial_clone_cleanup_fix
-test_concurrent_operations_with_flock
-test_project_root_failure
-test_temp_file_cleanup
+# (test_dry_run_init, test_dry_run_commit)
+# Test: Spec index incremental update and queries
+test_spec_index() {
+  echo "=== test_spec_index ==="
+  setup_test_env
+
+  local project="$TEST_ROOT/si-project"
+  local specs="$project/specs"
+  local index="$TEST_AGENTIC/core/lib/spec-index.sh"
+  mkdir -p "$specs/2025/11/feat/alpha" "$specs/2025/12/feat/alpha" "$specs/2025/12/fix/beta"
+  printf '# Human Section\n## Plan\nDo the thing\n' > "$specs/2025/11/feat/alpha/001-first.md"
+  printf '## Research\nFindings\n' > "$specs/2025/12/feat/alpha/002-second.md"
+  printf -- '---\ntitle: Beta Fix\nowner: me\n---\n## Plan\n<!-- todo -->\n' > "$specs/2025/12/fix/beta/001-beta.md"
+  cd "$project"
+  git init -q && git add -A && git -c user.email=t@t -c user.name=t commit -qm init
+
+  local output
+  output=$(bash "$index" update --dir "$specs")
+  assert_eq "Indexed 3 spec(s) in $specs (3 changed)" "$output" "Initial build indexes all specs"
+
+  output=$(bash "$index" update --dir "$specs")
+  assert_eq "Indexed 3 spec(s) in $specs (0 changed)" "$output" "No-op update changes nothing"
+
+  output=$(bash "$index" query --dir "$specs" --slug alpha --latest)
+  assert_eq "$specs/2025/12/feat/alpha/002-second.md"$'\t'"RESEARCH"$'\t'"second" "$output" "Latest alpha spec returned"
+
+  output=$(bash "$index" query --dir "$specs" --meta owner=me)
+  assert_eq "$specs/2025/12/fix/beta/001-beta.md"$'\t'"CREATE"$'\t'"Beta Fix" "$output" "Frontmatter title and meta indexed"
+
+  output=$(bash "$index" query --dir "$specs" --until 2025-11)
+  assert_eq "$specs/2025/11/feat/alpha/001-first.md"$'\t'"PLAN"$'\t'"first" "$output" "Date range query"
+
+  output=$(bash "$index" next-nnn --dir "$specs" --slug alpha)
+  assert_eq "003" "$output" "Next NNN for slug"
+
+  # Uncommitted edit is picked up incrementally
+  printf '## Implement\nDone\n' >> "$specs/2025/12/fix/beta/001-beta.md"
+  output=$(bash "$index" update --dir "$specs")
+  assert_eq "Indexed 3 spec(s) in $specs (1 changed)" "$output" "Dirty edit re-indexed"
+  output=$(bash "$index" query --dir "$specs" --stage IMPLEMENT)
+  assert_eq "$specs/2025/12/fix/beta/001-beta.md"$'\t'"IMPLEMENT"$'\t'"Beta Fix" "$output" "Stage query reflects edit"
+
+  # Deleted spec is dropped
+  rm "$specs/2025/11/feat/alpha/001-first.md"
+  output=$(bash "$index" update --dir "$specs")
+  assert_eq "Indexed 2 spec(s) in $specs (1 changed)" "$output" "Deleted spec removed"
+
+  assert_command_failure "bash '$index' query --dir '$specs' --slug missing" "Query with no matches fails"
+
+  cleanup_test_env
+}
+
+# Test: Batched spec commits coalesce stage commits into one
+test_spec_commit_queue() {
+  echo "=== test_spec_commit_queue ==="
+  setup_test_env
+
+  local project="$TEST_ROOT/queue-project"
+  local spec="$project/specs/2025/12/feat/queue/001-queue.md"
+  mkdir -p "${spec%/*}"
+  cd "$project"
+  git init -q
+  git -c user.email=t@t -c user.name=t commit -q --allow-empty -m init
+  printf 'spec_commit_window: 3600\n' > "$project/.agentic-config.conf.yml"
+
+  local lib="$TEST_AGENTIC/core/lib/spec-resolver.sh"
+  local git_env="GIT_AUTHOR_NAME=t GIT_AUTHOR_EMAIL=t@t GIT_COMMITTER_NAME=t GIT_COMMITTER_EMAIL=t@t"
+  local output
+  output=$(env -u _AGENTIC_ROOT $git_env bash -c "
+    source '$lib'
+    echo create > '$spec'; commit_spec_changes '$spec' CREATE 001 queue
+    echo plan >> '$spec'; commit_spec_changes '$spec' PLAN 001 queue
+  " 2>&1)
+  assert_file_contains "$(git rev-parse --git-path agentic-spec-queue)" "PLAN" "Stage commits queued"
+  assert_eq "1" "$(git rev-list --count HEAD)" "No commit while window open"
+
+  output=$(env -u _AGENTIC_ROOT $git_env bash -c "source '$lib'; flush_spec_commits" 2>&1)
+  assert_eq "spec(001): CREATE, PLAN - queue" "$(git log -1 --format=%s)" "Queued stages coalesced into one commit"
+  assert_eq "2" "$(git rev-list --count HEAD)" "Single commit for batch"
+
+  if [[ ! -f "$(git rev-parse --git-path agentic-spec-queue)" ]]; then
+    echo -e "${GREEN}PASS${NC}: Queue cleared after flush"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Queue not cleared after flush"
+    ((FAIL_COUNT++)) || true
+  fi
+
+  # --now flushes pending entries together with the current one
+  output=$(env -u _AGENTIC_ROOT $git_env bash -c "
+    source '$lib'
+    echo impl >> '$spec'; commit_spec_changes '$spec' IMPLEMENT 001 queue
+    echo review >> '$spec'; commit_spec_changes '$spec' REVIEW 001 queue --now
+  " 2>&1)
+  assert_eq "spec(001): IMPLEMENT, REVIEW - queue" "$(git log -1 --format=%s)" "--now flushes queue immediately"
+
+  # Window disabled: every stage commits immediately
+  output=$(env -u _AGENTIC_ROOT $git_env SPEC_COMMIT_WINDOW=0 bash -c "
+    source '$lib'
+    echo doc >> '$spec'; commit_spec_changes '$spec' DOCUMENT 001 queue
+  " 2>&1)
+  assert_eq "spec(001): DOCUMENT - queue" "$(git log -1 --format=%s)" "Window 0 commits immediately"
+
+  cleanup_test_env
+}
+
+# Test: Parsed config is cached per session and re-parsed on edits
+test_config_cache() {
+  echo "=== test_config_cache ==="
+  setup_test_env
+
+  local project_dir="$TEST_ROOT/test-project"
+  mkdir -p "$project_dir"
+  cd "$project_dir"
+  git init -q
+
+  cat > "$project_dir/.agentic-config.conf.yml" <<EOF
+ext_specs_repo_url: yaml-url
+ext_specs_local_path: 'yaml-path'
+spec_commit_window: 60
+EOF
+  echo "EXT_SPECS_REPO_URL=aaa" > "$project_dir/.env"
+
+  source "$TEST_AGENTIC/core/lib/config-loader.sh"
+  unset EXT_SPECS_REPO_URL EXT_SPECS_LOCAL_PATH SPEC_COMMIT_WINDOW
+
+  load_agentic_config
+  assert_eq "aaa|yaml-path|60" "$EXT_SPECS_REPO_URL|$EXT_SPECS_LOCAL_PATH|$SPEC_COMMIT_WINDOW" "All keys parsed in one pass"
+
+  load_agentic_config
+  assert_eq "aaa" "$EXT_SPECS_REPO_URL" "Cached load returns same values"
+
+  # Same-size edit within the same second must not serve stale values
+  echo "EXT_SPECS_REPO_URL=bbb" > "$project_dir/.env"
+  load_agentic_config
+  assert_eq "bbb" "$EXT_SPECS_REPO_URL" "Edited .env re-parsed"
+
+  rm "$project_dir/.env"
+  load_agentic_config
+  assert_eq "yaml-url" "$EXT_SPECS_REPO_URL" "Removed .env falls back to YAML"
+
+  export EXT_SPECS_REPO_URL="env-var-url"
+  load_agentic_config
+  assert_eq "env-var-url" "$EXT_SPECS_REPO_URL" "ENV still overrides cached config"
+
+  unset EXT_SPECS_REPO_URL EXT_SPECS_LOCAL_PATH SPEC_COMMIT_WINDOW
+  cleanup_test_env
+}
+
+run_tests \
+  test_git_url_validation \
+  test_path_traversal_rejection \
+  test_safe_env_parsing \
+  test_config_priority \
+  test_config_cache \
+  test_compare_versions \
+  test_spec_index \
+  test_spec_commit_queue \
+  test_ext_specs_init \
+  test_ext_specs_commit_rollback \
+  test_empty_local_path_default \
+  test_agentic_root_fallback \
+  test_logic_inversion_fix \
+  test_config_state_leak_fix \
+  test_partial_clone_cleanup_fix \
+  test_concurrent_operations_with_flock \
+  test_project_root_failure \
+  test_temp_file_cleanup
 
 print_test_summary "External Specs E2E Tests"
@@ -220,14 +220,15 @@ test_xdg_config_persistence() {
 }
 
 # Run all tests
-test_fresh_install
-test_custom_path_install
-test_path_persistence_dotpath
-test_path_persistence_shell
-test_update_existing
-test_dry_run
-test_nightly_mode
-test_self_hosted_reconciliation
-test_xdg_config_persistence
+run_tests \
+  test_fresh_install \
+  test_custom_path_install \
+  test_path_persistence_dotpath \
+  test_path_persistence_shell \
+  test_update_existing \
+  test_dry_run \
+  test_nightly_mode \
+  test_self_hosted_reconciliation \
+  test_xdg_config_persistence
 
 print_test_summary "install.sh E2E Tests"
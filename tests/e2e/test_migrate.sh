@@ -290,17 +290,18 @@ test_migrate_path_persistence() {
 }
 
 # Run all tests
-test_migrate_manual_installation
-test_migrate_backup_creation
-test_migrate_preserve_agents_content
-test_migrate_backup_agents
-test_migrate_dry_run
-test_migrate_install_commands
-test_migrate_install_hooks
-test_migrate_global_path_recording
-test_migrate_installation_mode
-test_migrate_preserve_custom_commands
-test_migrate_no_agent_dir
-test_migrate_path_persistence
+run_tests \
+  test_migrate_manual_installation \
+  test_migrate_backup_creation \
+  test_migrate_preserve_agents_content \
+  test_migrate_backup_agents \
+  test_migrate_dry_run \
+  test_migrate_install_commands \
+  test_migrate_install_hooks \
+  test_migrate_global_path_recording \
+  test_migrate_installation_mode \
+  test_migrate_preserve_custom_commands \
+  test_migrate_no_agent_dir \
+  test_migrate_path_persistence
 
 print_test_summary "/agentic migrate E2E Tests"
@@ -43,6 +43,7 @@ CRITICAL_FILES=(
   "core/lib/spec-resolver.sh"
   "core/lib/agentic-root.sh"
   "core/lib/config-loader.sh"
+  "core/lib/spec-index.sh"
   # Commands with bootstrap pattern - must use pure bash for path discovery
   "core/commands/claude/branch.md"
   # NOTE: o_spec.md and po_spec.md have complex resume logic using grep/cut
@@ -271,8 +272,8 @@ EOF
   fi
 }
 
-# Main test runner
-main() {
+# Static analysis of every critical file
+test_static_analysis() {
   echo "=== Static Analysis: External Command Usage ==="
   echo ""
 
@@ -284,10 +285,14 @@ main() {
     test_pure_bash_patterns "$file"
     echo ""
   done
+}
 
-  echo "=== Integration: Bootstrap Execution ==="
-  test_bootstrap_works
-  test_bootstrap_with_config_json
+# Main test runner
+main() {
+  run_tests \
+    test_static_analysis \
+    test_bootstrap_works \
+    test_bootstrap_with_config_json
 
   print_test_summary "Restricted Shell Compatibility"
 }
@@ -48,6 +48,73 @@ test_setup_project_type_detection() {
   cleanup_test_env
 }
 
+# Test: Template placeholders are rendered and unchanged outputs are not rewritten
+test_setup_template_rendering() {
+  echo "=== test_setup_template_rendering ==="
+  setup_test_env
+
+  local project_dir="$TEST_ROOT/pip-project"
+  create_test_project "$project_dir" "python-pip"
+
+  # Run setup
+  "$TEST_AGENTIC/scripts/setup-config.sh" "$project_dir"
+
+  assert_file_exists "$project_dir/AGENTS.md" "AGENTS.md rendered"
+  if grep -q '{{[A-Z_]*}}' "$project_dir/AGENTS.md"; then
+    echo -e "${RED}FAIL${NC}: AGENTS.md has unresolved placeholders"
+    ((FAIL_COUNT++)) || true
+  else
+    echo -e "${GREEN}PASS${NC}: All placeholders resolved"
+    ((PASS_COUNT++)) || true
+  fi
+
+  # Render the set twice: the second pass must not rewrite identical outputs
+  source "$TEST_AGENTIC/scripts/lib/template-processor.sh"
+  local vars=("TYPE_CHECKER=mypy" "LINTER=ruff" "LINTER_CMD=ruff check" "LINTER_AFTER_EDIT=ruff check --fix")
+  render_template_set "$TEST_AGENTIC/templates/python-pip" "$TEST_ROOT/rendered" "${vars[@]}"
+  assert_eq "2" "$TEMPLATE_WRITTEN" "Template set renders both files in one call"
+  touch -t 200001010000 "$TEST_ROOT/rendered/AGENTS.md" "$TEST_ROOT/rendered/.agent/config.yml" "$TEST_ROOT/mtime-ref"
+  render_template_set "$TEST_AGENTIC/templates/python-pip" "$TEST_ROOT/rendered" "${vars[@]}"
+  assert_eq "0" "$TEMPLATE_WRITTEN" "Unchanged outputs are skipped"
+  assert_eq "2" "$TEMPLATE_UNCHANGED" "Unchanged outputs are counted"
+  if [[ "$TEST_ROOT/rendered/AGENTS.md" -nt "$TEST_ROOT/mtime-ref" ]]; then
+    echo -e "${RED}FAIL${NC}: Unchanged output mtime was touched"
+    ((FAIL_COUNT++)) || true
+  else
+    echo -e "${GREEN}PASS${NC}: Unchanged output mtime preserved"
+    ((PASS_COUNT++)) || true
+  fi
+
+  cleanup_test_env
+}
+
+# Test: Batch detection covers many directories and the cache follows manifest changes
+test_setup_detection_cache() {
+  echo "=== test_setup_detection_cache ==="
+  setup_test_env
+
+  source "$TEST_AGENTIC/scripts/lib/detect-project-type.sh"
+  create_test_project "$TEST_ROOT/mono/api" "python-poetry"
+  mkdir -p "$TEST_ROOT/mono/web" "$TEST_ROOT/mono/docs"
+  echo '{"name": "web", "devDependencies": {"typescript": "5"}}' > "$TEST_ROOT/mono/web/package.json"
+
+  local output
+  output=$(detect_project_types "$TEST_ROOT/mono/api" "$TEST_ROOT/mono/web" "$TEST_ROOT/mono/docs")
+  assert_eq "python-poetry typescript generic" "$(echo $(cut -f1 <<< "$output"))" "Batch detection returns one type per directory"
+  assert_file_contains "$XDG_CACHE_HOME/agentic/project-type.cache" "$TEST_ROOT/mono/web" "Detection results cached"
+
+  # Changing a manifest invalidates that directory's cache entry
+  echo '{"name": "web", "dependencies": {"react": "18"}}' > "$TEST_ROOT/mono/web/package.json"
+  touch -t 203001010000 "$TEST_ROOT/mono/web/package.json"
+  assert_eq "generic" "$(detect_project_type "$TEST_ROOT/mono/web")" "Modified manifest re-detected"
+
+  # A new manifest changes the key as well
+  touch "$TEST_ROOT/mono/docs/Cargo.toml"
+  assert_eq "rust" "$(detect_project_type "$TEST_ROOT/mono/docs")" "New manifest re-detected"
+
+  cleanup_test_env
+}
+
 # Test: Setup with explicit project type
 test_setup_explicit_type() {
   echo "=== test_setup_explicit_type ==="
@@ -267,18 +334,108 @@ test_setup_selective_tools() {
   cleanup_test_env
 }
 
+# Test: MCP merge is idempotent, preserves user servers and writes each config once
+test_setup_mcp_merge() {
+  echo "=== test_setup_mcp_merge ==="
+  setup_test_env
+
+  local project_dir="$TEST_ROOT/test-project"
+  create_test_project "$project_dir" "generic"
+
+  # Templates resolve from the test installation; add a second server to batch
+  local REPO_ROOT="$TEST_AGENTIC"
+  cat > "$TEST_AGENTIC/templates/mcp/servers/echo.json" <<'EOF'
+{"name": "echo", "command": "echo-mcp", "args": ["--stdio"], "env": {}}
+EOF
+  source "$TEST_AGENTIC/scripts/lib/mcp-manager.sh"
+
+  # Count writes per config file
+  local writes_log="$TEST_ROOT/mcp-writes.log"
+  eval "$(declare -f _mcp_atomic_write | sed '1s/_mcp_atomic_write/_mcp_atomic_write_real/')"
+  _mcp_atomic_write() { echo "$1" >> "$writes_log"; _mcp_atomic_write_real "$@"; }
+
+  # Servers added by hand before the merge
+  local claude_cfg="$project_dir/.mcp.json"
+  local codex_cfg="$HOME/.codex/config.toml"
+  mkdir -p "$HOME/.codex"
+  echo '{"mcpServers": {"mine": {"command": "my-server", "args": []}}, "keep": true}' > "$claude_cfg"
+  printf '[mcp_servers.mine]\ncommand = "my-server"\nargs = []\n' > "$codex_cfg"
+
+  merge_mcp_configs "playwright,echo" "all" "$project_dir" false > /dev/null
+  assert_eq "8" "${#MCP_CHANGED[@]}" "First merge adds both servers to all four tool configs"
+  local cfg
+  for cfg in "$claude_cfg" "$codex_cfg" "$project_dir/.gemini/settings.json" "$project_dir/.antigravity/mcp.json"; do
+    assert_eq "1" "$(grep -cxF "$cfg" "$writes_log")" "Written exactly once: ${cfg#"$TEST_ROOT"/}"
+  done
+  assert_eq "my-server" "$(jq -r '.mcpServers.mine.command' "$claude_cfg")" "Hand-added JSON server preserved"
+  assert_eq "true" "$(jq -r '.keep' "$claude_cfg")" "Unrelated JSON keys preserved"
+  assert_eq "npx echo-mcp" "$(jq -r '[.mcpServers.playwright.command, .mcpServers.echo.command] | join(" ")' "$claude_cfg")" "Both servers merged into JSON config"
+  assert_file_contains "$codex_cfg" '^\[mcp_servers\.mine\]' "Hand-added TOML server preserved"
+  assert_file_contains "$codex_cfg" '^\[mcp_servers\.echo\]' "Server merged into TOML config"
+
+  # is_mcp_configured agrees with the merge, including hand-added servers
+  assert_command_success "is_mcp_configured echo claude '$project_dir'" "is_mcp_configured finds merged JSON server"
+  assert_command_success "is_mcp_configured mine codex '$project_dir'" "is_mcp_configured finds hand-added TOML server"
+  assert_command_failure "is_mcp_configured absent gemini '$project_dir'" "is_mcp_configured reports unconfigured server"
+
+  # Second merge: no changes, no writes, byte-identical files
+  cp "$claude_cfg" "$TEST_ROOT/claude.before"
+  cp "$codex_cfg" "$TEST_ROOT/codex.before"
+  : > "$writes_log"
+  merge_mcp_configs "playwright,echo" "all" "$project_dir" false > /dev/null
+  assert_eq "0" "${#MCP_CHANGED[@]}" "Second merge reports no changes"
+  assert_eq "0" "$(grep -c . "$writes_log" || true)" "Second merge writes nothing"
+  if cmp -s "$claude_cfg" "$TEST_ROOT/claude.before" && cmp -s "$codex_cfg" "$TEST_ROOT/codex.before"; then
+    echo -e "${GREEN}PASS${NC}: Configs byte-identical after second merge"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Configs changed on second merge"
+    ((FAIL_COUNT++)) || true
+  fi
+
+  # Failed merges leave the original file intact: unparsable JSON, then a failed write
+  local broken_dir="$TEST_ROOT/broken"
+  mkdir -p "$broken_dir"
+  echo '{"mcpServers": {' > "$broken_dir/.mcp.json"
+  cp "$broken_dir/.mcp.json" "$TEST_ROOT/broken.before"
+  local rc=0
+  merge_mcp_configs "playwright" "claude" "$broken_dir" false > /dev/null 2>&1 || rc=$?
+  assert_eq "1" "$rc" "Merge into unparsable config fails"
+  if cmp -s "$broken_dir/.mcp.json" "$TEST_ROOT/broken.before"; then
+    echo -e "${GREEN}PASS${NC}: Unparsable config left intact"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Unparsable config was modified"
+    ((FAIL_COUNT++)) || true
+  fi
+
+  echo '{"mcpServers": {}}' > "$broken_dir/.mcp.json"
+  mkdir "$broken_dir/.mcp.json.tmp.$$"  # temp file path taken: the write cannot happen
+  rc=0
+  merge_mcp_configs "playwright" "claude" "$broken_dir" false > /dev/null 2>&1 || rc=$?
+  assert_eq "1" "$rc" "Merge with failed write fails"
+  assert_eq '{"mcpServers": {}}' "$(< "$broken_dir/.mcp.json")" "Original config intact after failed write"
+  assert_eq "0" "${#MCP_CHANGED[@]}" "Failed write reports no changes"
+
+  cleanup_test_env
+}
+
 # Run all tests
-test_setup_new_project
-test_setup_project_type_detection
-test_setup_explicit_type
-test_setup_agents_md
-test_setup_dry_run
-test_setup_gitignore_creation
-test_setup_git_init
-test_setup_preserve_agents_md
-test_setup_copy_mode
-test_setup_global_path_recording
-test_setup_hooks_installation
-test_setup_selective_tools
+run_tests \
+  test_setup_new_project \
+  test_setup_project_type_detection \
+  test_setup_detection_cache \
+  test_setup_explicit_type \
+  test_setup_template_rendering \
+  test_setup_agents_md \
+  test_setup_dry_run \
+  test_setup_gitignore_creation \
+  test_setup_git_init \
+  test_setup_preserve_agents_md \
+  test_setup_copy_mode \
+  test_setup_global_path_recording \
+  test_setup_hooks_installation \
+  test_setup_selective_tools \
+  test_setup_mcp_merge
 
 print_test_summary "/agentic setup E2E Tests"
@@ -284,6 +284,97 @@ test_update_path_persistence() {
   cleanup_test_env
 }
 
+# Test: No-op update diffs against the install manifest and writes nothing
+test_update_noop_manifest() {
+  echo "=== test_update_noop_manifest ==="
+  setup_test_env
+
+  if ! command -v jq >/dev/null 2>&1; then
+    echo -e "${YELLOW}SKIP${NC}: install manifest requires jq"
+    cleanup_test_env
+    return 0
+  fi
+
+  local project_dir="$TEST_ROOT/test-project"
+  create_test_project "$project_dir" "generic"
+
+  # Setup records the manifest
+  "$TEST_AGENTIC/scripts/setup-config.sh" "$project_dir" >/dev/null
+  local config="$project_dir/.agentic-config.json"
+  assert_json_field "$config" '.manifest.links[".claude/commands/orc.md"]' \
+    "$TEST_AGENTIC/core/commands/claude/orc.md" "Manifest records command link target"
+  assert_json_field "$config" ".manifest.source" "$TEST_AGENTIC" "Manifest records source root"
+
+  # Unchanged project: no file under the project or HOME is rewritten
+  "$TEST_AGENTIC/scripts/update-config.sh" "$project_dir" >/dev/null
+  local ref="$TEST_ROOT/ref"
+  touch "$ref"
+  sleep 1
+  local output
+  output=$("$TEST_AGENTIC/scripts/update-config.sh" "$project_dir" 2>&1)
+  assert_eq "" "$(find "$project_dir" "$HOME" -newer "$ref" 2>/dev/null)" "No-op update made zero writes"
+
+  if echo "$output" | grep -q "Performing maintenance"; then
+    echo -e "${RED}FAIL${NC}: No-op update skipped maintenance"
+    ((FAIL_COUNT++)) || true
+  else
+    echo -e "${GREEN}PASS${NC}: No-op update skipped maintenance"
+    ((PASS_COUNT++)) || true
+  fi
+
+  # Only the changed entry is touched: a deleted tracked link is restored
+  rm -f "$project_dir/.agent/workflows/spec.md"
+  "$TEST_AGENTIC/scripts/update-config.sh" "$project_dir" >/dev/null
+  assert_symlink_valid "$project_dir/.agent/workflows/spec.md" "Deleted tracked link restored from manifest"
+
+  # Copy mode: copies edited locally (hash differs from the manifest) are left alone
+  local copy_dir="$TEST_ROOT/copy-project"
+  create_test_project "$copy_dir" "generic"
+  "$TEST_AGENTIC/scripts/setup-config.sh" --copy "$copy_dir" >/dev/null
+  local commands="$copy_dir/.claude/commands"
+  echo "local edit" >> "$commands/orc.md"
+  echo "local edit" >> "$commands/branch.md"
+  cp "$commands/orc.md" "$TEST_ROOT/orc.edited"
+
+  touch "$ref"
+  sleep 1
+  output=$("$TEST_AGENTIC/scripts/update-config.sh" "$copy_dir" 2>&1)
+  assert_eq "" "$(find "$copy_dir" -newer "$ref" 2>/dev/null)" "No-op copy-mode update with edited copy made zero writes"
+  if echo "$output" | grep -q "WARNING: .claude/commands/orc.md was modified locally"; then
+    echo -e "${GREEN}PASS${NC}: Edited copy reported as modified"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Edited copy not reported as modified"
+    ((FAIL_COUNT++)) || true
+  fi
+
+  # Version update: pristine copies are refreshed or pruned, edited ones are kept
+  echo "shipped change" >> "$TEST_AGENTIC/core/commands/claude/orc.md"
+  echo "shipped change" >> "$TEST_AGENTIC/core/commands/claude/adr.md"
+  rm -f "$TEST_AGENTIC/core/commands/claude/browser.md" "$TEST_AGENTIC/core/commands/claude/branch.md"
+  jq '.version = "0.0.1"' "$copy_dir/.agentic-config.json" > "$TEST_ROOT/config.tmp" && mv "$TEST_ROOT/config.tmp" "$copy_dir/.agentic-config.json"
+  "$TEST_AGENTIC/scripts/update-config.sh" "$copy_dir" >/dev/null 2>&1
+
+  if cmp -s "$commands/orc.md" "$TEST_ROOT/orc.edited"; then
+    echo -e "${GREEN}PASS${NC}: Edited copy not overwritten on update"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Edited copy was overwritten on update"
+    ((FAIL_COUNT++)) || true
+  fi
+  assert_file_contains "$commands/adr.md" "shipped change" "Pristine copy refreshed on update"
+  if [[ ! -e "$commands/browser.md" ]]; then
+    echo -e "${GREEN}PASS${NC}: Pristine copy no longer shipped was pruned"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Pristine copy no longer shipped was kept"
+    ((FAIL_COUNT++)) || true
+  fi
+  assert_file_contains "$commands/branch.md" "local edit" "Edited copy no longer shipped was kept"
+
+  cleanup_test_env
+}
+
 # Test: Self-hosted update audits command symlinks
 test_self_hosted_symlink_audit() {
   echo "=== test_self_hosted_symlink_audit ==="
@@ -317,17 +408,111 @@ EOF
   cleanup_test_env
 }
 
+# Test: Fleet mode updates all registered installations concurrently
+test_update_fleet() {
+  echo "=== test_update_fleet ==="
+  setup_test_env
+
+  if ! command -v jq >/dev/null 2>&1; then
+    echo -e "${YELLOW}SKIP${NC}: fleet update requires jq"
+    cleanup_test_env
+    return 0
+  fi
+
+  # Register three projects, then make two of them outdated and remove the third
+  local name
+  for name in proj-a proj-b proj-c; do
+    create_test_project "$TEST_ROOT/$name" "generic"
+    "$TEST_AGENTIC/scripts/setup-config.sh" "$TEST_ROOT/$name" >/dev/null
+  done
+  for name in proj-a proj-b; do
+    local config="$TEST_ROOT/$name/.agentic-config.json"
+    jq '.version = "0.0.1"' "$config" > "$config.tmp" && mv "$config.tmp" "$config"
+  done
+  local up_to_date="$TEST_ROOT/proj-up-to-date"
+  create_test_project "$up_to_date" "generic"
+  "$TEST_AGENTIC/scripts/setup-config.sh" "$up_to_date" >/dev/null
+  rm -rf "$TEST_ROOT/proj-c"
+
+  local output
+  output=$("$TEST_AGENTIC/scripts/update-config.sh" --all --jobs 2 2>&1) || true
+
+  local expected
+  expected=$(cat "$TEST_AGENTIC/VERSION")
+  assert_json_field "$TEST_ROOT/proj-a/.agentic-config.json" ".version" "$expected" "Fleet updated proj-a"
+  assert_json_field "$TEST_ROOT/proj-b/.agentic-config.json" ".version" "$expected" "Fleet updated proj-b"
+
+  if echo "$output" | grep -q "^skipped .*proj-up-to-date"; then
+    echo -e "${GREEN}PASS${NC}: Up-to-date project skipped"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Up-to-date project skipped"
+    ((FAIL_COUNT++)) || true
+  fi
+
+  if echo "$output" | grep -q "^missing .*proj-c"; then
+    echo -e "${GREEN}PASS${NC}: Removed project reported as missing"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Removed project reported as missing"
+    ((FAIL_COUNT++)) || true
+  fi
+
+  assert_command_failure "[[ -d '$TEST_ROOT/proj-a/.agentic-lock' ]]" "Project lock released"
+
+  cleanup_test_env
+}
+
+test_update_project_lock() {
+  echo "=== test_update_project_lock ==="
+  setup_test_env
+
+  local dest="$TEST_ROOT/project"
+  create_test_project "$dest" "generic"
+  "$TEST_AGENTIC/scripts/setup-config.sh" "$dest" >/dev/null
+  local config="$dest/.agentic-config.json"
+  jq '.version = "0.0.1"' "$config" > "$config.tmp" && mv "$config.tmp" "$config"
+
+  # Simulate a concurrent (fleet) update holding the project lock for ~2s
+  mkdir "$dest/.agentic-lock"
+  (sleep 2; rmdir "$dest/.agentic-lock") &
+  local holder=$!
+
+  local start elapsed rc=0
+  start=$(_now_ms)
+  "$TEST_AGENTIC/scripts/update-config.sh" "$dest" >/dev/null 2>&1 || rc=$?
+  elapsed=$(( $(_now_ms) - start ))
+  wait "$holder" 2>/dev/null || true
+
+  assert_eq "0" "$rc" "Single-project update succeeds once the lock is free"
+  if [[ $elapsed -ge 1000 ]]; then
+    echo -e "${GREEN}PASS${NC}: Single-project update waited for the project lock"
+    ((PASS_COUNT++)) || true
+  else
+    echo -e "${RED}FAIL${NC}: Single-project update waited for the project lock (${elapsed}ms)"
+    ((FAIL_COUNT++)) || true
+  fi
+  assert_json_field "$config" ".version" "$(cat "$TEST_AGENTIC/VERSION")" "Update applied after waiting"
+  assert_command_failure "[[ -d '$dest/.agentic-lock' ]]" "Project lock released after update"
+
+  cleanup_test_env
+}
+
 # Run all tests
-test_update_version_bump
-test_update_missing_commands
-test_update_missing_skills
-test_update_clean_orphans
-test_update_preserve_agents_md
-test_update_force_refresh
-test_update_reconcile_config
-test_update_nightly_rebuild
-test_update_copy_mode_backup
-test_update_path_persistence
-test_self_hosted_symlink_audit
+run_tests \
+  test_update_version_bump \
+  test_update_missing_commands \
+  test_update_missing_skills \
+  test_update_clean_orphans \
+  test_update_preserve_agents_md \
+  test_update_force_refresh \
+  test_update_reconcile_config \
+  test_update_nightly_rebuild \
+  test_update_copy_mode_backup \
+  test_update_path_persistence \
+  test_update_noop_manifest \
+  test_self_hosted_symlink_audit \
+  test_update_fleet \
+  test_update_project_lock
 
 print_test_summary "/agentic update E2E Tests"
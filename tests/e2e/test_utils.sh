@@ -2,6 +2,9 @@
 # E2E Test Utilities
 # Shared functions for E2E tests
 
+# Shared millisecond clock (_now_ms)
+source "$REPO_ROOT/core/lib/agentic-root.sh"
+
 # Colors
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -19,6 +22,7 @@ setup_test_env() {
   TEST_ROOT=$(mktemp -d)
   export HOME="$TEST_ROOT/home"
   export XDG_CONFIG_HOME="$HOME/.config"
+  export XDG_CACHE_HOME="$HOME/.cache"
   mkdir -p "$HOME"
 
   # Setup test agentic-config installation
@@ -235,6 +239,35 @@ mock_git_clone() {
   cp -R "$TEST_AGENTIC" "$target_dir"
 }
 
+# Run test case functions with optional selection and per-case timing
+# Usage: run_tests <test_function>...
+#   E2E_LIST_CASES=true   Print case names and exit (used by run_all.sh --cases)
+#   E2E_CASES=a,b         Run only the named cases
+#   E2E_TIMING_FILE=path  Append "case<TAB>duration_ms<TAB>passed<TAB>failed" per case
+run_tests() {
+  if [[ "${E2E_LIST_CASES:-false}" == true ]]; then
+    printf '%s\n' "$@"
+    exit 0
+  fi
+
+  local case_name start pass_before fail_before
+  for case_name in "$@"; do
+    if [[ -n "${E2E_CASES:-}" && ",$E2E_CASES," != *",$case_name,"* ]]; then
+      continue
+    fi
+
+    start=$(_now_ms)
+    pass_before=$PASS_COUNT
+    fail_before=$FAIL_COUNT
+    "$case_name"
+
+    if [[ -n "${E2E_TIMING_FILE:-}" ]]; then
+      printf '%s\t%s\t%s\t%s\n' "$case_name" "$(( $(_now_ms) - start ))" \
+        "$(( PASS_COUNT - pass_before ))" "$(( FAIL_COUNT - fail_before ))" >> "$E2E_TIMING_FILE"
+    fi
+  done
+}
+
 # Test result summary
 print_test_summary() {
   local test_name="$1"
@@ -7,11 +7,14 @@ Tests all scenarios:
 - Block Write/Edit/NotebookEdit when dry-run enabled
 - Allow session status file exception
 - Block/allow Bash commands based on pattern analysis
+- Labeled command corpus classified in-process
 - Exception handling and fail-open behavior
 """
 
+import importlib.util
 import json
 import subprocess
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -344,6 +347,44 @@ def test_allow_bash_safe_commands() -> TestResult:
     return result
 
 
+def test_corpus_classification() -> TestResult:
+    """Test the Bash classifier in-process against the labeled corpus.
+
+    Entries marked "known" are misclassifications the classifier still makes;
+    they must stay wrong until the marker is removed, so fixes and regressions
+    both show up here.
+    """
+    result = TestResult("Classify labeled Bash corpus (known misses only)")
+
+    try:
+        repo_root = get_repo_root()
+        spec = importlib.util.spec_from_file_location("dry_run_guard", repo_root / "core/hooks/pretooluse/dry-run-guard.py")
+        guard = importlib.util.module_from_spec(spec)
+        sys.modules["dry_run_guard"] = guard
+        spec.loader.exec_module(guard)
+
+        corpus = repo_root / "tests/fixtures/dry_run_guard_corpus.jsonl"
+        entries = [json.loads(line) for line in corpus.read_text().splitlines() if line.strip()]
+        assert entries, f"Empty corpus: {corpus}"
+
+        problems = []
+        for entry in entries:
+            decision = "block" if guard.is_bash_write_command(entry["command"]) else "allow"
+            miss = "false_allow" if entry["expect"] == "block" else "false_block"
+            if decision != entry["expect"] and entry.get("known") != miss:
+                problems.append(f"{entry['id']}: {miss.replace('_', ' ')}")
+            elif decision == entry["expect"] and "known" in entry:
+                problems.append(f"{entry['id']}: now correct, drop its 'known' marker")
+
+        assert not problems, "; ".join(problems)
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
 def test_allow_read_only_tools() -> TestResult:
     """Test that read-only tools are always allowed."""
     result = TestResult("Allow read-only tools (Read, Grep, Glob)")
@@ -482,6 +523,7 @@ def main() -> None:
         test_allow_session_status_exception,
         test_block_bash_write_commands,
         test_allow_bash_safe_commands,
+        test_corpus_classification,
         test_allow_read_only_tools,
         test_fail_open_on_invalid_json,
         test_fail_open_on_malformed_status_file,
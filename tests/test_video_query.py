@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Offline tests for video_query.py using the fake backend.
+
+Tests all scenarios:
+- Fake backend query returns usage, cost and timing as JSON
+- Streaming mode prints response text
+- Usage ledger records runs and report aggregates them
+- Unwritable ledger warns without failing the query
+- Corrupt ledger report fails with a clear error
+- Gemini backend constructs against a stubbed google-genai
+- Fake backend processing failures surface as errors
+- Missing video fails before any backend call
+- Unwritable frame cache fails with a clear error
+- Perceptual hashing dedupes near-identical frames
+- Frame parsing, sampling and cache hits work without ffmpeg
+- Frame mode samples, caches and reports savings (requires ffmpeg)
+"""
+
+import importlib.util
+import json
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import types
+from pathlib import Path
+from unittest import mock
+
+# Fake backend with no simulated latency
+FAST_FAKE = {
+    "seed": 7,
+    "poll_interval": 0,
+    "upload_seconds": 0,
+    "processing_seconds": 0,
+    "ttft_seconds": 0,
+    "tokens_per_second": 0,
+    "output_tokens": 40,
+}
+
+
+class TestResult:
+    """Test result with pass/fail status."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.passed = False
+        self.error: str | None = None
+
+    def mark_pass(self) -> None:
+        self.passed = True
+
+    def mark_fail(self, error: str) -> None:
+        self.passed = False
+        self.error = error
+
+    def __str__(self) -> str:
+        status = "PASS" if self.passed else "FAIL"
+        msg = f"  {status}: {self.name}"
+        if self.error:
+            msg += f"\n    Error: {self.error}"
+        return msg
+
+
+def get_repo_root() -> Path:
+    """Get repository root directory."""
+    return Path(__file__).parent.parent
+
+
+def run_video_query(*args: str, fake_config: dict | None = None, env: dict | None = None) -> subprocess.CompletedProcess:
+    """Execute video_query.py with the fake backend."""
+    script = get_repo_root() / "core/scripts/video_query.py"
+    config = json.dumps(fake_config if fake_config is not None else FAST_FAKE)
+    return subprocess.run(
+        [sys.executable, str(script), *args],
+        capture_output=True,
+        text=True,
+        env={"PATH": "/usr/bin:/bin", "VIDEO_QUERY_BACKEND": "fake", "VIDEO_QUERY_FAKE_CONFIG": config, **(env or {})},
+    )
+
+
+def load_video_query() -> object:
+    """Import video_query.py as a module for in-process checks."""
+    spec = importlib.util.spec_from_file_location("video_query", get_repo_root() / "core/scripts/video_query.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["video_query"] = module  # dataclasses resolve annotations via sys.modules
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_video(tmp_dir: Path, size: int = 500_000) -> Path:
+    """Create a dummy video file (the fake backend never decodes it)."""
+    video = tmp_dir / "clip.mp4"
+    video.write_bytes(b"\0" * size)
+    return video
+
+
+def test_fake_query_json() -> TestResult:
+    """Test that a fake backend query returns the standard JSON output."""
+    result = TestResult("Fake backend query returns JSON usage and cost")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = make_video(Path(tmp))
+            proc = run_video_query(str(video), "what happens?", "--json", "--ledger", f"{tmp}/ledger.sqlite")
+            assert proc.returncode == 0, f"Exit code {proc.returncode}: {proc.stderr}"
+
+            output = json.loads(proc.stdout)
+            assert output["usage"]["output_tokens"] == 40, f"Unexpected usage: {output['usage']}"
+            # 500 KB at 250 KB/s = 2 video seconds at 263 tokens/s, plus the query words
+            assert output["usage"]["input_tokens"] == 2 * 263 + 2, f"Unexpected usage: {output['usage']}"
+            assert output["cost"]["total_cost_usd"] > 0, "Expected non-zero cost"
+            assert output["response"].startswith("tok0"), f"Unexpected response: {output['response'][:40]}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_fake_query_stream() -> TestResult:
+    """Test that streaming mode prints the full response."""
+    result = TestResult("Streaming mode prints response text")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = make_video(Path(tmp))
+            proc = run_video_query(str(video), "describe", "--stream", "--no-ledger")
+            assert proc.returncode == 0, f"Exit code {proc.returncode}: {proc.stderr}"
+            assert "tok0" in proc.stdout and "tok39" in proc.stdout, f"Incomplete stream: {proc.stdout[:80]}"
+            assert "Tokens:" in proc.stderr, "Expected usage summary on stderr"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_ledger_report() -> TestResult:
+    """Test that runs are recorded and aggregated by the report subcommand."""
+    result = TestResult("Usage ledger records runs and report aggregates them")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = make_video(Path(tmp))
+            ledger = f"{tmp}/ledger.sqlite"
+            for model in ("gemini-2.5-flash-lite", "gemini-2.5-flash", "gemini-2.5-flash"):
+                proc = run_video_query(str(video), "q", "--model", model, "--json", "--ledger", ledger)
+                assert proc.returncode == 0, f"Exit code {proc.returncode}: {proc.stderr}"
+
+            # Mixed-mode runs with known latencies: video and frames must not be pooled
+            with sqlite3.connect(ledger) as conn:
+                runs = [
+                    ("video", 5.0, 10.0), ("video", 5.0, 20.0), ("video", 5.0, 30.0),
+                    ("frames", None, 1.0), ("frames", None, 2.0), ("frames", None, 3.0),
+                ]
+                for mode, upload, elapsed in runs:
+                    conn.execute(
+                        "INSERT INTO runs (ts, day, model, video_path, video_seconds, input_tokens, output_tokens,"
+                        " cost_usd, upload_seconds, elapsed_seconds, mode) VALUES ('2026-01-01T00:00:00', '2026-01-01',"
+                        " 'gemini-2.0-flash', 'clip.mp4', 10.0, 1000, 100, 0.001, ?, ?, ?)",
+                        (upload, elapsed, mode),
+                    )
+
+            proc = run_video_query("report", "--ledger", ledger, "--json")
+            assert proc.returncode == 0, f"Report exit code {proc.returncode}: {proc.stderr}"
+            summary = json.loads(proc.stdout)
+
+            by_model = {(row["model"], row["mode"]): row for row in summary["by_model"]}
+            assert by_model[("gemini-2.5-flash", "video")]["runs"] == 2, f"Unexpected runs: {by_model}"
+            assert by_model[("gemini-2.5-flash-lite", "video")]["runs"] == 1, f"Unexpected runs: {by_model}"
+            assert by_model[("gemini-2.5-flash", "video")]["input_tokens_per_video_second"] is not None, "Missing tokens/video second"
+            assert "p95_seconds" in by_model[("gemini-2.5-flash", "video")], "Missing latency percentiles"
+
+            video, frames = by_model[("gemini-2.0-flash", "video")], by_model[("gemini-2.0-flash", "frames")]
+            # Percentiles are end to end: video includes its upload time
+            assert (video["p50_seconds"], video["p95_seconds"]) == (25.0, 35.0), f"Unexpected video latency: {video}"
+            assert video["mean_upload_seconds"] == 5.0 and frames["mean_upload_seconds"] is None, "Unexpected upload time"
+            assert (frames["p50_seconds"], frames["p95_seconds"]) == (2.0, 3.0), f"Unexpected frames latency: {frames}"
+            assert video["output_tokens_per_second"] == 5.0 and frames["output_tokens_per_second"] == 50.0, "Throughput pooled across modes"
+            assert frames["input_tokens_per_video_second"] is None, "Frame runs must not report tokens per video second"
+            assert sum(day["runs"] for day in summary["by_day"]) == 9, f"Unexpected days: {summary['by_day']}"
+
+            proc = run_video_query("report", "--ledger", ledger, env={"COLUMNS": "200"})
+            assert proc.returncode == 0 and "frames" in proc.stdout, f"Missing Mode column: {proc.stdout}"
+            assert "p50 e2e" in proc.stdout, f"Latency column not labelled end to end: {proc.stdout}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_unwritable_ledger() -> TestResult:
+    """Test that a ledger that cannot be created does not fail the query."""
+    result = TestResult("Unwritable ledger warns without failing the query")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = make_video(Path(tmp))
+            # Parent "directory" is a regular file, so mkdir raises
+            blocker = Path(tmp) / "blocker"
+            blocker.write_text("")
+            proc = run_video_query(str(video), "q", "--json", "--ledger", str(blocker / "ledger.sqlite"))
+            assert proc.returncode == 0, f"Exit code {proc.returncode}: {proc.stderr}"
+            assert json.loads(proc.stdout)["response"], "Response not printed"
+            assert "Could not record usage" in proc.stderr, f"Missing ledger warning: {proc.stderr}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_corrupt_ledger_report() -> TestResult:
+    """Test that report fails cleanly on a ledger that is not a database."""
+    result = TestResult("Corrupt ledger report fails with a clear error")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            ledger = Path(tmp) / "ledger.sqlite"
+            ledger.write_bytes(b"not a sqlite database" * 100)
+            proc = run_video_query("report", "--ledger", str(ledger))
+            assert proc.returncode == 1, f"Expected exit 1, got {proc.returncode}"
+            assert "Could not read usage ledger" in proc.stderr, f"Unexpected stderr: {proc.stderr}"
+            assert "Traceback" not in proc.stderr, f"Unexpected traceback: {proc.stderr}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_gemini_backend_construction() -> TestResult:
+    """Test that the gemini backend imports google-genai lazily and builds a client."""
+    result = TestResult("Gemini backend constructs against a stubbed google-genai")
+
+    try:
+        vq = load_video_query()
+        clients = []
+        genai = types.ModuleType("google.genai")
+        genai.Client = lambda api_key: clients.append(api_key) or types.SimpleNamespace(api_key=api_key)
+        google = types.ModuleType("google")
+        google.genai = genai
+
+        with mock.patch.dict(sys.modules, {"google": google, "google.genai": genai}), \
+                mock.patch.dict("os.environ", {"GEMINI_API_KEY": "test-key"}):
+            backend = vq.make_backend("gemini")
+
+        assert isinstance(backend, vq.GeminiBackend), f"Unexpected backend: {backend!r}"
+        assert clients == ["test-key"], f"Client not built with API key: {clients}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_fake_processing_failure() -> TestResult:
+    """Test that simulated processing failures exit non-zero."""
+    result = TestResult("Fake processing failure surfaces as error")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = make_video(Path(tmp))
+            proc = run_video_query(str(video), "q", "--no-ledger", fake_config={**FAST_FAKE, "failure_rate": 1.0})
+            assert proc.returncode == 1, f"Expected exit 1, got {proc.returncode}"
+            assert "Video processing failed: FAILED" in proc.stderr, f"Unexpected stderr: {proc.stderr}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_missing_video() -> TestResult:
+    """Test that a missing video fails with a clear error."""
+    result = TestResult("Missing video fails with clear error")
+
+    try:
+        proc = run_video_query("/nonexistent/clip.mp4", "q", "--no-ledger")
+        assert proc.returncode == 1, f"Expected exit 1, got {proc.returncode}"
+        assert "Video not found" in proc.stderr, f"Unexpected stderr: {proc.stderr}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_unwritable_frame_cache() -> TestResult:
+    """Test that a frame cache that cannot be created fails with a clear error."""
+    result = TestResult("Unwritable frame cache fails with a clear error")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = make_video(Path(tmp))
+            # Cache "directory" under a regular file, so mkdir raises; the ffmpeg
+            # placeholder only satisfies the PATH lookup and is never run
+            blocker = Path(tmp) / "blocker"
+            blocker.write_text("")
+            bin_dir = Path(tmp) / "bin"
+            bin_dir.mkdir()
+            (bin_dir / "ffmpeg").write_text("#!/bin/sh\nexit 1\n")
+            (bin_dir / "ffmpeg").chmod(0o755)
+            proc = run_video_query(
+                str(video), "q", "--mode", "frames", "--no-ledger", "--frame-cache", str(blocker / "frames"),
+                env={"PATH": f"{bin_dir}:/usr/bin:/bin"},
+            )
+            assert proc.returncode == 1, f"Expected exit 1, got {proc.returncode}"
+            assert "Error:" in proc.stderr and "Traceback" not in proc.stderr, f"Unexpected stderr: {proc.stderr}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_phash_dedupe() -> TestResult:
+    """Test that perceptual hashes collapse near-identical frames only."""
+    result = TestResult("Perceptual hashing dedupes near-identical frames")
+
+    try:
+        vq = load_video_query()
+        gradient = bytes((x * 8 + y * 2) % 256 for y in range(32) for x in range(32))
+        noisy = bytes(min(255, b + i % 3) for i, b in enumerate(gradient))
+        inverted = bytes(255 - b for b in gradient)
+
+        near = (vq.phash(gradient) ^ vq.phash(noisy)).bit_count()
+        far = (vq.phash(gradient) ^ vq.phash(inverted)).bit_count()
+        assert near <= 6 < far, f"Unexpected distances: near={near} far={far}"
+
+        frames = [
+            vq.Frame(Path(f"{i}.jpg"), float(i), 640, 360, vq.phash(img))
+            for i, img in enumerate([gradient, noisy, inverted, inverted, gradient])
+        ]
+        kept = vq.dedupe_frames(frames, 6)
+        assert [f.timestamp for f in kept] == [0.0, 2.0, 4.0], f"Unexpected kept frames: {kept}"
+        assert [f.timestamp for f in vq.thin_frames(frames, 3)] == [0.0, 2.0, 4.0], "Thinning must keep first and last"
+        assert vq.image_tokens(384, 216) == 258 and vq.image_tokens(1280, 720) == 2 * 258, "Unexpected image tokens"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_frame_pipeline_offline() -> TestResult:
+    """Test ffmpeg output parsing, sampling and the frame cache without the ffmpeg binary."""
+    result = TestResult("Frame parsing, sampling and cache hit work without ffmpeg")
+
+    try:
+        vq = load_video_query()
+        gradient = bytes((x * 8 + y * 2) % 256 for y in range(32) for x in range(32))
+        noisy = bytes(min(255, b + i % 3) for i, b in enumerate(gradient))
+        inverted = bytes(255 - b for b in gradient)
+        images = [gradient, noisy, inverted, inverted, gradient]
+
+        # Synthetic showinfo log and raw 32x32 grayscale hash stream, as one ffmpeg pass writes them
+        stderr = "  Duration: 00:01:05.50, start: 0.000000, bitrate: 1 kb/s\n" + "".join(
+            f"[Parsed_showinfo_2 @ 0x1] n:   {i} pts:  {i * 20} pts_time:{i * 2}  duration:1 fmt:yuv420p s:768x432 i:P\n"
+            for i in range(len(images))
+        )
+        frames, video_seconds = vq._parse_extraction(stderr, b"".join(images), Path("work"))
+        assert video_seconds == 65.5, f"Unexpected duration: {video_seconds}"
+        assert [f.timestamp for f in frames] == [0.0, 2.0, 4.0, 6.0, 8.0], f"Unexpected timestamps: {frames}"
+        assert frames[0].path == Path("work/00001.jpg") and (frames[0].width, frames[0].height) == (768, 432)
+        assert frames[0].phash == vq.phash(gradient) and frames[3].phash == vq.phash(inverted), "Hash slices misaligned"
+
+        sampling = vq.FrameSampling(max_frames=2)
+        kept = vq.thin_frames(vq.dedupe_frames(frames, sampling.dedupe_distance), sampling.max_frames)
+        assert [f.timestamp for f in kept] == [0.0, 8.0], f"Unexpected kept frames: {kept}"
+
+        # Variable frame rate option follows the installed ffmpeg version
+        for version, flag in [("ffmpeg version 4.4.2-0ubuntu0.22.04.1", "-vsync"), ("ffmpeg version 7.0.2-static", "-fps_mode"),
+                              ("ffmpeg version N-113000-g1234abcd", "-fps_mode")]:
+            with mock.patch.object(vq.subprocess, "run", return_value=types.SimpleNamespace(stdout=version)):
+                assert vq.ffmpeg_vfr_flag("ffmpeg") == flag, f"Unexpected flag for {version}"
+
+        try:
+            vq._parse_extraction(stderr, b"".join(images[:-1]), Path("work"))
+            raise AssertionError("Truncated hash stream accepted")
+        except vq.VideoQueryError:
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            video = make_video(Path(tmp))
+            cache_root = Path(tmp) / "frames"
+            cache_dir = cache_root / f"{vq.file_sha256(video)[:16]}-{sampling.cache_key()}"
+            cache_dir.mkdir(parents=True)
+            (cache_dir / "frames.json").write_text(json.dumps({
+                "video_seconds": video_seconds,
+                "extracted": len(frames),
+                "frames": [
+                    {"file": f.path.name, "timestamp": f.timestamp, "width": f.width, "height": f.height, "phash": f"{f.phash:016x}"}
+                    for f in kept
+                ],
+            }))
+
+            # A cache hit never looks for ffmpeg
+            with mock.patch.object(vq.shutil, "which", return_value=None):
+                frame_set = vq.extract_frames(video, sampling, cache_root)
+            assert frame_set.cached and frame_set.extracted == 5, f"Expected cache hit: {frame_set}"
+            assert [(f.path, f.phash) for f in frame_set.frames] == [(cache_dir / f.path.name, f.phash) for f in kept]
+
+            # Different sampling settings miss the cache and need ffmpeg
+            try:
+                with mock.patch.object(vq.shutil, "which", return_value=None):
+                    vq.extract_frames(video, vq.FrameSampling(max_frames=3), cache_root)
+                raise AssertionError("Cache hit for different sampling settings")
+            except vq.VideoQueryError as e:
+                assert "ffmpeg not found" in str(e.detail), f"Unexpected error: {e.detail}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def test_frames_mode() -> TestResult:
+    """Test frame sampling end to end: dedupe, cache hit and savings report."""
+    result = TestResult("Frame mode samples, caches and reports savings")
+
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        result.name += " (skipped: ffmpeg not found)"
+        result.mark_pass()
+        return result
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Red, blue, red: three scenes of 2s each
+            video = Path(tmp) / "scenes.mp4"
+            subprocess.run(
+                [
+                    ffmpeg, "-loglevel", "error", "-f", "lavfi", "-i", "color=red:s=640x360:d=2",
+                    "-f", "lavfi", "-i", "color=blue:s=640x360:d=2", "-f", "lavfi", "-i", "color=red:s=640x360:d=2",
+                    "-filter_complex", "[0][1][2]concat=n=3:v=1:a=0,format=yuv420p", "-r", "10", str(video),
+                ],
+                check=True,
+            )
+            env = {"PATH": f"{Path(ffmpeg).parent}:/usr/bin:/bin", "VIDEO_QUERY_FRAME_CACHE": f"{tmp}/frames"}
+            args = (str(video), "what changes?", "--mode", "frames", "--json", "--no-ledger")
+
+            proc = run_video_query(*args, "--sample", "interval", "--interval", "1", env=env)
+            assert proc.returncode == 0, f"Exit code {proc.returncode}: {proc.stderr}"
+            output = json.loads(proc.stdout)
+            frames = output["frames"]
+            # One sample per second, collapsed to one frame per scene
+            assert frames["extracted"] >= 6 and frames["kept"] == 3, f"Unexpected frames: {frames}"
+            assert frames["cached"] is False, "First run should extract"
+            # 3 single-tile frames plus their labels and the query words
+            assert output["usage"]["input_tokens"] == 3 * (258 + 3) + 2, f"Unexpected usage: {output['usage']}"
+            comparison = output["comparison"]
+            assert comparison["source"] == "estimate" and comparison["input_tokens_saved"] > 0, f"Unexpected comparison: {comparison}"
+
+            # Cache hit needs no ffmpeg
+            proc = run_video_query(*args, "--sample", "interval", "--interval", "1", env={**env, "PATH": "/usr/bin:/bin"})
+            assert proc.returncode == 0, f"Cached run exit code {proc.returncode}: {proc.stderr}"
+            assert json.loads(proc.stdout)["frames"]["cached"] is True, "Second run should hit the frame cache"
+
+            proc = run_video_query(*args, "--compare", env=env)
+            assert proc.returncode == 0, f"Compare exit code {proc.returncode}: {proc.stderr}"
+            comparison = json.loads(proc.stdout)["comparison"]
+            assert comparison["source"] == "measured" and comparison["video_time_seconds"] is not None, f"Unexpected comparison: {comparison}"
+
+        result.mark_pass()
+    except Exception as e:
+        result.mark_fail(str(e))
+
+    return result
+
+
+def main() -> None:
+    """Run all tests and report results."""
+    print("Running video_query.py offline tests...\n")
+
+    tests = [
+        test_fake_query_json,
+        test_fake_query_stream,
+        test_ledger_report,
+        test_unwritable_ledger,
+        test_corrupt_ledger_report,
+        test_gemini_backend_construction,
+        test_fake_processing_failure,
+        test_missing_video,
+        test_unwritable_frame_cache,
+        test_phash_dedupe,
+        test_frame_pipeline_offline,
+        test_frames_mode,
+    ]
+
+    results = []
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        test_result = test_func()
+        results.append(test_result)
+
+        if test_result.passed:
+            passed += 1
+        else:
+            failed += 1
+
+        print(test_result)
+
+    print(f"\n{'='*60}")
+    print(f"Test Results: {passed} passed, {failed} failed out of {len(results)} total")
+    print(f"{'='*60}")
+
+    if failed > 0:
+        print("\nFAILED TESTS:")
+        for test_result in results:
+            if not test_result.passed:
+                print(f"  - {test_result.name}")
+                if test_result.error:
+                    print(f"    {test_result.error}")
+        exit(1)
+    else:
+        print("\nAll tests passed!")
+        exit(0)
+
+
+if __name__ == "__main__":
+    main()